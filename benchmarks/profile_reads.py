@@ -0,0 +1,111 @@
+"""Compare the ORM and the raw asyncpg paths of the hot profile/settings reads.
+
+Needs a database with at least one profile and the usual DB_* settings::
+
+    python benchmarks/profile_reads.py --iterations 5000
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any, Awaitable, Callable
+from uuid import UUID
+
+from sqlalchemy import select
+
+from yukinoise_users.infrastructure.database.connection import (
+    dispose_engines,
+    get_session_factory,
+)
+from yukinoise_users.infrastructure.database.fast_reads import FastReads
+from yukinoise_users.infrastructure.database.models.profiles_model import ProfileORM
+from yukinoise_users.infrastructure.database.repositories import (
+    ProfilesRepository,
+    UserSettingsRepository,
+)
+from yukinoise_users.infrastructure.mapping.orm_to_domain import (
+    profile_orm_to_domain,
+    settings_orm_to_domain,
+)
+
+
+async def measure(
+    name: str, call: Callable[[], Awaitable[Any]], iterations: int
+) -> None:
+    for _ in range(min(100, iterations)):
+        await call()
+    timings = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        await call()
+        timings.append((time.perf_counter() - started) * 1_000_000)
+    timings.sort()
+    print(
+        f"{name:<32} mean {statistics.fmean(timings):8.1f}us  "
+        f"p50 {timings[len(timings) // 2]:8.1f}us  "
+        f"p99 {timings[int(len(timings) * 0.99)]:8.1f}us"
+    )
+
+
+async def main(iterations: int) -> None:
+    async with get_session_factory()() as session:
+        row = (
+            await session.execute(
+                select(ProfileORM.user_id, ProfileORM.display_name)
+                .where(ProfileORM.deleted_at.is_(None))
+                .limit(1)
+            )
+        ).first()
+        if row is None:
+            raise SystemExit("No profile to read, create one first")
+        user_id: UUID = row.user_id
+        display_name: str = row.display_name
+
+        profiles = ProfilesRepository(session)
+        user_settings = UserSettingsRepository(session)
+        fast_reads = FastReads(session)
+
+        # the identity map is cleared before every ORM read so rows are
+        # hydrated each time, as in a fresh unit of work
+        async def orm_profile_by_id() -> Any:
+            session.expunge_all()
+            return profile_orm_to_domain(await profiles.get_by_user_id(user_id))
+
+        async def orm_profile_by_name() -> Any:
+            session.expunge_all()
+            return profile_orm_to_domain(
+                await profiles.get_by_display_name(display_name)
+            )
+
+        async def orm_settings_by_id() -> Any:
+            session.expunge_all()
+            return settings_orm_to_domain(await user_settings.get_by_user_id(user_id))
+
+        benchmarks: list[tuple[str, Callable[[], Awaitable[Any]]]] = [
+            ("orm profile by user_id", orm_profile_by_id),
+            (
+                "asyncpg profile by user_id",
+                lambda: fast_reads.get_profile_by_user_id(user_id),
+            ),
+            ("orm profile by display_name", orm_profile_by_name),
+            (
+                "asyncpg profile by display_name",
+                lambda: fast_reads.get_profile_by_display_name(display_name),
+            ),
+            ("orm settings by user_id", orm_settings_by_id),
+            (
+                "asyncpg settings by user_id",
+                lambda: fast_reads.get_settings_by_user_id(user_id),
+            ),
+        ]
+        for name, call in benchmarks:
+            await measure(name, call, iterations)
+
+    await dispose_engines()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=2000)
+    asyncio.run(main(parser.parse_args().iterations))
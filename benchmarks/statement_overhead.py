@@ -0,0 +1,124 @@
+"""Per-call statement overhead of the profile and settings hot paths.
+
+Before every execution SQLAlchemy needs the statement and its cache key to
+find the compiled form in the cache. This compares building the construct
+on every call, as the repositories used to, with the prebuilt statements
+they now reuse. No database is needed::
+
+    python benchmarks/statement_overhead.py --iterations 20000
+"""
+
+import argparse
+import timeit
+from typing import Any, Callable
+from uuid import uuid4
+
+from sqlalchemy import select, update
+
+from yukinoise_users.infrastructure.database.models.profiles_model import ProfileORM
+from yukinoise_users.infrastructure.database.models.user_settings_model import (
+    UserSettingsORM,
+)
+from yukinoise_users.infrastructure.database.repositories import (
+    profiles_repo,
+    user_settings_repo,
+)
+from yukinoise_users.infrastructure.database.repositories.base_repo import (
+    bind_values,
+)
+
+USER_ID = uuid4()
+
+
+def rebuilt_profile_by_user_id() -> Any:
+    return select(ProfileORM).where(
+        ProfileORM.user_id == USER_ID,
+        ProfileORM.deleted_at.is_(None),
+    )
+
+
+def rebuilt_profile_by_display_name() -> Any:
+    return select(ProfileORM).where(
+        ProfileORM.display_name == "someone",
+        ProfileORM.deleted_at.is_(None),
+    )
+
+
+def rebuilt_increment_followers() -> Any:
+    return (
+        update(ProfileORM)
+        .where(ProfileORM.user_id == USER_ID)
+        .values({"followers_count": ProfileORM.followers_count + 1})
+    )
+
+
+def rebuilt_update_profile() -> Any:
+    return update(ProfileORM).where(ProfileORM.user_id == USER_ID).values(bio="bio")
+
+
+def rebuilt_settings_by_user_id() -> Any:
+    return select(UserSettingsORM).where(UserSettingsORM.user_id == USER_ID)
+
+
+def rebuilt_update_settings() -> Any:
+    return (
+        update(UserSettingsORM)
+        .where(UserSettingsORM.user_id == USER_ID)
+        .values(dark_mode=True)
+    )
+
+
+def prebuilt_update_profile() -> Any:
+    return bind_values(profiles_repo._UPDATE_BY_USER_ID, {"bio": "bio"})[0]
+
+
+def prebuilt_update_settings() -> Any:
+    return bind_values(user_settings_repo._UPDATE_BY_USER_ID, {"dark_mode": True})[0]
+
+
+CASES: list[tuple[str, Callable[[], Any], Callable[[], Any]]] = [
+    (
+        "profile get_by_user_id",
+        rebuilt_profile_by_user_id,
+        lambda: profiles_repo._SELECT_BY_USER_ID,
+    ),
+    (
+        "profile get_by_display_name",
+        rebuilt_profile_by_display_name,
+        lambda: profiles_repo._SELECT_BY_DISPLAY_NAME,
+    ),
+    (
+        "profile increment_followers",
+        rebuilt_increment_followers,
+        lambda: profiles_repo._ADD_TO_COUNTER["followers_count"],
+    ),
+    ("profile update_profile", rebuilt_update_profile, prebuilt_update_profile),
+    (
+        "settings get_by_user_id",
+        rebuilt_settings_by_user_id,
+        lambda: user_settings_repo._SELECT_BY_USER_ID,
+    ),
+    ("settings update_settings", rebuilt_update_settings, prebuilt_update_settings),
+]
+
+
+def per_call_us(build: Callable[[], Any], iterations: int) -> float:
+    def call() -> None:
+        build()._generate_cache_key()
+
+    call()
+    return timeit.timeit(call, number=iterations) / iterations * 1_000_000
+
+
+def main(iterations: int) -> None:
+    print(f"{'statement':<30} {'rebuilt':>10} {'prebuilt':>10} {'speedup':>8}")
+    for name, rebuilt, prebuilt in CASES:
+        before = per_call_us(rebuilt, iterations)
+        after = per_call_us(prebuilt, iterations)
+        print(f"{name:<30} {before:8.2f}us {after:8.2f}us {before / after:7.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=20000)
+    main(parser.parse_args().iterations)
@@ -1,9 +1,7 @@
 import asyncio
 from logging.config import fileConfig
 
-from sqlalchemy import pool
 from sqlalchemy.engine import Connection
-from sqlalchemy.ext.asyncio import async_engine_from_config
 
 from alembic import context
 
@@ -40,6 +38,8 @@ try:
     from yukinoise_users.infrastructure.database.models.user_settings_model import UserSettingsORM  # noqa: F401
     from infrastructure.database.models.user_audit_logs_model import UserAuditLogORM  # noqa: F401
     from yukinoise_users.infrastructure.database.models.outbox_event_model import OutboxEventORM  # noqa: F401
+    from yukinoise_users.infrastructure.database.models.processed_event_model import ProcessedEventORM  # noqa: F401
+    from yukinoise_users.infrastructure.database.models.profile_counter_shard_model import ProfileCounterShardORM  # noqa: F401
 
     target_metadata = Base.metadata
 except Exception as exc:
@@ -100,10 +100,15 @@ async def run_async_migrations() -> None:
             "Database URL not configured. Set the DATABASE_URL environment variable or set 'sqlalchemy.url' in alembic.ini"
         )
 
-    connectable = async_engine_from_config(
-        config.get_section(config.config_ini_section, {}),
-        prefix="sqlalchemy.",
-        poolclass=pool.NullPool,
+    from yukinoise_users.infrastructure.database.connection import (
+        ENGINE_PROFILES,
+        MIGRATIONS_ROLE,
+        create_engine_for_profile,
+    )
+
+    connectable = create_engine_for_profile(
+        ENGINE_PROFILES[MIGRATIONS_ROLE],
+        url=config.get_main_option("sqlalchemy.url"),
     )
 
     async with connectable.connect() as connection:
@@ -0,0 +1,44 @@
+"""Notify on outbox insert
+
+Revision ID: 2db26d2f7e30
+Revises: 6d88d405ccdd
+Create Date: 2026-01-11 09:02:47.113920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '2db26d2f7e30'
+down_revision: Union[str, Sequence[str], None] = '6d88d405ccdd'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Statement-level trigger: one NOTIFY per INSERT, delivered on commit
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION users.notify_outbox_events() RETURNS trigger AS $$
+        BEGIN
+            PERFORM pg_notify('users_outbox_events', '');
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER outbox_events_notify
+        AFTER INSERT ON users.outbox_events
+        FOR EACH STATEMENT EXECUTE FUNCTION users.notify_outbox_events()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS outbox_events_notify ON users.outbox_events")
+    op.execute("DROP FUNCTION IF EXISTS users.notify_outbox_events()")
@@ -0,0 +1,36 @@
+"""Add processed events
+
+Revision ID: 41308c7649de
+Revises: 8acc30e6e5a2
+Create Date: 2026-01-16 18:05:51.264087
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '41308c7649de'
+down_revision: Union[str, Sequence[str], None] = '8acc30e6e5a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'processed_events',
+        sa.Column('event_id', sa.String(), nullable=False),
+        sa.Column('event_type', sa.String(), nullable=False),
+        sa.Column('processed_at', sa.Integer(), server_default=sa.text('EXTRACT(epoch FROM now())'), nullable=False),
+        sa.PrimaryKeyConstraint('event_id'),
+        schema='users',
+    )
+    op.create_index('idx_processed_events_processed_at', 'processed_events', ['processed_at'], unique=False, schema='users')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_processed_events_processed_at', table_name='processed_events', schema='users')
+    op.drop_table('processed_events', schema='users')
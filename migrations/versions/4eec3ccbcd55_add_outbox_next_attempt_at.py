@@ -0,0 +1,28 @@
+"""Add outbox next_attempt_at
+
+Revision ID: 4eec3ccbcd55
+Revises: 2db26d2f7e30
+Create Date: 2026-01-12 16:40:05.871342
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '4eec3ccbcd55'
+down_revision: Union[str, Sequence[str], None] = '2db26d2f7e30'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # NULL means "due now"; failed publishes push it forward with backoff
+    op.add_column('outbox_events', sa.Column('next_attempt_at', sa.Integer(), nullable=True), schema='users')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('outbox_events', 'next_attempt_at', schema='users')
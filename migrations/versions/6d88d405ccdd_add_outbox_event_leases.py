@@ -0,0 +1,30 @@
+"""Add outbox event leases
+
+Revision ID: 6d88d405ccdd
+Revises: de6b3a34fef6
+Create Date: 2026-01-10 12:14:32.418203
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '6d88d405ccdd'
+down_revision: Union[str, Sequence[str], None] = 'de6b3a34fef6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Lease columns let several outbox processors claim disjoint batches
+    op.add_column('outbox_events', sa.Column('locked_by', sa.String(), nullable=True), schema='users')
+    op.add_column('outbox_events', sa.Column('locked_until', sa.Integer(), nullable=True), schema='users')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('outbox_events', 'locked_until', schema='users')
+    op.drop_column('outbox_events', 'locked_by', schema='users')
@@ -0,0 +1,42 @@
+"""Key processed events by consumer
+
+Revision ID: 7c5e2d91b0f4
+Revises: a41c7e9d03b5
+Create Date: 2026-01-27 10:42:18.905316
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '7c5e2d91b0f4'
+down_revision: Union[str, Sequence[str], None] = 'a41c7e9d03b5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Rows recorded before this revision belong to no consumer and age out
+    # through the usual cleanup
+    op.add_column('processed_events', sa.Column('consumer', sa.String(), server_default='', nullable=False), schema='users')
+    op.alter_column('processed_events', 'consumer', server_default=None, schema='users')
+    op.drop_constraint('processed_events_pkey', 'processed_events', type_='primary', schema='users')
+    op.create_primary_key('processed_events_pkey', 'processed_events', ['consumer', 'event_id'], schema='users')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('processed_events_pkey', 'processed_events', type_='primary', schema='users')
+    # keep a single row per event id so the old primary key can be restored
+    op.execute(
+        """
+        DELETE FROM users.processed_events AS a
+        USING users.processed_events AS b
+        WHERE a.event_id = b.event_id AND a.consumer > b.consumer
+        """
+    )
+    op.create_primary_key('processed_events_pkey', 'processed_events', ['event_id'], schema='users')
+    op.drop_column('processed_events', 'consumer', schema='users')
@@ -0,0 +1,194 @@
+"""Partition outbox events by day
+
+Revision ID: 8acc30e6e5a2
+Revises: 4eec3ccbcd55
+Create Date: 2026-01-14 11:27:19.530617
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '8acc30e6e5a2'
+down_revision: Union[str, Sequence[str], None] = '4eec3ccbcd55'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+OUTBOX_COLUMNS = (
+    "id, event_type, created_at, payload, updated_at, status, retry_count, "
+    "error, locked_by, locked_until, next_attempt_at"
+)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute("ALTER TABLE users.outbox_events RENAME TO outbox_events_legacy")
+    op.execute("DROP TRIGGER IF EXISTS outbox_events_notify ON users.outbox_events_legacy")
+    op.execute("ALTER TABLE users.outbox_events_legacy RENAME CONSTRAINT outbox_events_pkey TO outbox_events_legacy_pkey")
+
+    # The partition key has to be part of the primary key
+    op.execute(
+        """
+        CREATE TABLE users.outbox_events (
+            id UUID NOT NULL,
+            event_type VARCHAR NOT NULL,
+            created_at INTEGER DEFAULT EXTRACT(epoch FROM now()) NOT NULL,
+            payload JSONB NOT NULL,
+            updated_at INTEGER,
+            status outboxstatus DEFAULT 'pending' NOT NULL,
+            retry_count INTEGER DEFAULT 0 NOT NULL,
+            error VARCHAR,
+            locked_by VARCHAR,
+            locked_until INTEGER,
+            next_attempt_at INTEGER,
+            CONSTRAINT outbox_events_pkey PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.execute("CREATE TABLE users.outbox_events_default PARTITION OF users.outbox_events DEFAULT")
+    op.execute(
+        "CREATE INDEX idx_outbox_events_pending ON users.outbox_events (created_at) "
+        "WHERE status = 'pending'"
+    )
+
+    # Daily partitions are named outbox_events_pYYYYMMDD and cover [day, day + 1) in UTC
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION users.create_outbox_partition(partition_day DATE) RETURNS BOOLEAN AS $$
+        DECLARE
+            partition_name TEXT := 'outbox_events_p' || to_char(partition_day, 'YYYYMMDD');
+        BEGIN
+            IF to_regclass('users.' || partition_name) IS NOT NULL THEN
+                RETURN FALSE;
+            END IF;
+            EXECUTE format(
+                'CREATE TABLE users.%I PARTITION OF users.outbox_events FOR VALUES FROM (%s) TO (%s)',
+                partition_name,
+                EXTRACT(epoch FROM partition_day::timestamp)::integer,
+                EXTRACT(epoch FROM (partition_day + 1)::timestamp)::integer
+            );
+            RETURN TRUE;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION users.ensure_outbox_partitions(days_ahead INTEGER) RETURNS INTEGER AS $$
+        DECLARE
+            today DATE := (now() AT TIME ZONE 'UTC')::date;
+            created INTEGER := 0;
+        BEGIN
+            PERFORM pg_advisory_xact_lock(hashtext('users.outbox_events.partitions'));
+            FOR i IN 0..days_ahead LOOP
+                IF users.create_outbox_partition(today + i) THEN
+                    created := created + 1;
+                END IF;
+            END LOOP;
+            RETURN created;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    # Partitions that still hold pending rows are kept until they drain
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION users.drop_outbox_partitions(cutoff INTEGER) RETURNS INTEGER AS $$
+        DECLARE
+            part RECORD;
+            upper_bound INTEGER;
+            has_pending BOOLEAN;
+            dropped INTEGER := 0;
+        BEGIN
+            PERFORM pg_advisory_xact_lock(hashtext('users.outbox_events.partitions'));
+            FOR part IN
+                SELECT c.relname
+                FROM pg_inherits i
+                JOIN pg_class c ON c.oid = i.inhrelid
+                WHERE i.inhparent = 'users.outbox_events'::regclass
+                  AND c.relname ~ '^outbox_events_p[0-9]{8}$'
+            LOOP
+                upper_bound := EXTRACT(
+                    epoch FROM (to_date(substring(part.relname FROM 16), 'YYYYMMDD') + 1)::timestamp
+                )::integer;
+                CONTINUE WHEN upper_bound > cutoff;
+
+                EXECUTE format(
+                    'SELECT EXISTS (SELECT 1 FROM users.%I WHERE status = ''pending'')',
+                    part.relname
+                ) INTO has_pending;
+                CONTINUE WHEN has_pending;
+
+                EXECUTE format('DROP TABLE users.%I', part.relname);
+                dropped := dropped + 1;
+            END LOOP;
+            RETURN dropped;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+    op.execute(
+        """
+        SELECT users.create_outbox_partition(partition_day)
+        FROM (
+            SELECT DISTINCT (to_timestamp(created_at) AT TIME ZONE 'UTC')::date AS partition_day
+            FROM users.outbox_events_legacy
+        ) AS days
+        """
+    )
+    op.execute("SELECT users.ensure_outbox_partitions(3)")
+    op.execute(
+        f"INSERT INTO users.outbox_events ({OUTBOX_COLUMNS}) "
+        f"SELECT {OUTBOX_COLUMNS} FROM users.outbox_events_legacy"
+    )
+    op.execute("DROP TABLE users.outbox_events_legacy")
+
+    op.execute(
+        """
+        CREATE TRIGGER outbox_events_notify
+        AFTER INSERT ON users.outbox_events
+        FOR EACH STATEMENT EXECUTE FUNCTION users.notify_outbox_events()
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("ALTER TABLE users.outbox_events RENAME TO outbox_events_partitioned")
+    op.execute("ALTER TABLE users.outbox_events_partitioned RENAME CONSTRAINT outbox_events_pkey TO outbox_events_partitioned_pkey")
+    op.execute(
+        """
+        CREATE TABLE users.outbox_events (
+            id UUID NOT NULL,
+            event_type VARCHAR NOT NULL,
+            created_at INTEGER DEFAULT EXTRACT(epoch FROM now()) NOT NULL,
+            payload JSONB NOT NULL,
+            updated_at INTEGER,
+            status outboxstatus DEFAULT 'pending' NOT NULL,
+            retry_count INTEGER DEFAULT 0 NOT NULL,
+            error VARCHAR,
+            locked_by VARCHAR,
+            locked_until INTEGER,
+            next_attempt_at INTEGER,
+            CONSTRAINT outbox_events_pkey PRIMARY KEY (id)
+        )
+        """
+    )
+    op.execute(
+        f"INSERT INTO users.outbox_events ({OUTBOX_COLUMNS}) "
+        f"SELECT {OUTBOX_COLUMNS} FROM users.outbox_events_partitioned"
+    )
+    op.execute("DROP TABLE users.outbox_events_partitioned CASCADE")
+    op.execute("DROP FUNCTION IF EXISTS users.drop_outbox_partitions(INTEGER)")
+    op.execute("DROP FUNCTION IF EXISTS users.ensure_outbox_partitions(INTEGER)")
+    op.execute("DROP FUNCTION IF EXISTS users.create_outbox_partition(DATE)")
+    op.execute(
+        """
+        CREATE TRIGGER outbox_events_notify
+        AFTER INSERT ON users.outbox_events
+        FOR EACH STATEMENT EXECUTE FUNCTION users.notify_outbox_events()
+        """
+    )
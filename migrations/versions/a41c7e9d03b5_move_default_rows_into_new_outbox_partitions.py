@@ -0,0 +1,140 @@
+"""Move default rows into new outbox partitions
+
+Revision ID: a41c7e9d03b5
+Revises: e5f0b71c2a48
+Create Date: 2026-01-26 09:14:31.672405
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41c7e9d03b5'
+down_revision: Union[str, Sequence[str], None] = 'e5f0b71c2a48'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # A partition can't be created while the default partition holds rows in
+    # its range, so the default is detached, the day's rows move over and it
+    # is attached again. Both hold an ACCESS EXCLUSIVE lock on outbox_events
+    # while the default is scanned, so with stray rows present this needs a
+    # maintenance window; b7576d410603 moves the rows without detaching
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION users.create_outbox_partition(partition_day DATE) RETURNS BOOLEAN AS $$
+        DECLARE
+            partition_name TEXT := 'outbox_events_p' || to_char(partition_day, 'YYYYMMDD');
+            lower_bound INTEGER := EXTRACT(epoch FROM partition_day::timestamp)::integer;
+            upper_bound INTEGER := EXTRACT(epoch FROM (partition_day + 1)::timestamp)::integer;
+        BEGIN
+            IF to_regclass('users.' || partition_name) IS NOT NULL THEN
+                RETURN FALSE;
+            END IF;
+
+            IF NOT EXISTS (
+                SELECT 1 FROM users.outbox_events_default
+                WHERE created_at >= lower_bound AND created_at < upper_bound
+            ) THEN
+                EXECUTE format(
+                    'CREATE TABLE users.%I PARTITION OF users.outbox_events FOR VALUES FROM (%s) TO (%s)',
+                    partition_name, lower_bound, upper_bound
+                );
+                RETURN TRUE;
+            END IF;
+
+            ALTER TABLE users.outbox_events DETACH PARTITION users.outbox_events_default;
+            EXECUTE format(
+                'CREATE TABLE users.%I PARTITION OF users.outbox_events FOR VALUES FROM (%s) TO (%s)',
+                partition_name, lower_bound, upper_bound
+            );
+            EXECUTE format(
+                'WITH moved AS ('
+                '    DELETE FROM users.outbox_events_default'
+                '    WHERE created_at >= %s AND created_at < %s RETURNING *'
+                ') INSERT INTO users.%I SELECT * FROM moved',
+                lower_bound, upper_bound, partition_name
+            );
+            ALTER TABLE users.outbox_events ATTACH PARTITION users.outbox_events_default DEFAULT;
+            RETURN TRUE;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    # Rows of past days that landed in the default partition get their own
+    # partition too, so drop_outbox_partitions can reclaim them
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION users.ensure_outbox_partitions(days_ahead INTEGER) RETURNS INTEGER AS $$
+        DECLARE
+            today DATE := (now() AT TIME ZONE 'UTC')::date;
+            stray_days DATE[];
+            stray_day DATE;
+            created INTEGER := 0;
+        BEGIN
+            PERFORM pg_advisory_xact_lock(hashtext('users.outbox_events.partitions'));
+            -- collected up front, the loop detaches the partition it reads from
+            SELECT array_agg(DISTINCT (to_timestamp(created_at) AT TIME ZONE 'UTC')::date)
+            INTO stray_days
+            FROM users.outbox_events_default;
+            FOREACH stray_day IN ARRAY coalesce(stray_days, '{}')
+            LOOP
+                IF users.create_outbox_partition(stray_day) THEN
+                    created := created + 1;
+                END IF;
+            END LOOP;
+            FOR i IN 0..days_ahead LOOP
+                IF users.create_outbox_partition(today + i) THEN
+                    created := created + 1;
+                END IF;
+            END LOOP;
+            RETURN created;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION users.ensure_outbox_partitions(days_ahead INTEGER) RETURNS INTEGER AS $$
+        DECLARE
+            today DATE := (now() AT TIME ZONE 'UTC')::date;
+            created INTEGER := 0;
+        BEGIN
+            PERFORM pg_advisory_xact_lock(hashtext('users.outbox_events.partitions'));
+            FOR i IN 0..days_ahead LOOP
+                IF users.create_outbox_partition(today + i) THEN
+                    created := created + 1;
+                END IF;
+            END LOOP;
+            RETURN created;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION users.create_outbox_partition(partition_day DATE) RETURNS BOOLEAN AS $$
+        DECLARE
+            partition_name TEXT := 'outbox_events_p' || to_char(partition_day, 'YYYYMMDD');
+        BEGIN
+            IF to_regclass('users.' || partition_name) IS NOT NULL THEN
+                RETURN FALSE;
+            END IF;
+            EXECUTE format(
+                'CREATE TABLE users.%I PARTITION OF users.outbox_events FOR VALUES FROM (%s) TO (%s)',
+                partition_name,
+                EXTRACT(epoch FROM partition_day::timestamp)::integer,
+                EXTRACT(epoch FROM (partition_day + 1)::timestamp)::integer
+            );
+            RETURN TRUE;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
@@ -0,0 +1,113 @@
+"""Move stray outbox rows without detaching the default partition
+
+Revision ID: b7576d410603
+Revises: 7c5e2d91b0f4
+Create Date: 2026-01-28 11:05:42.218734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7576d410603'
+down_revision: Union[str, Sequence[str], None] = '7c5e2d91b0f4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Detaching and re-attaching the default partition held an ACCESS
+    # EXCLUSIVE lock on users.outbox_events while the whole default partition
+    # was scanned to validate it, blocking every outbox write. The day's rows
+    # are now deleted from the default into a temporary table first, so the
+    # partition is created like any other and the rows are inserted back
+    # through the parent. Creating it still locks the parent until commit,
+    # so a large backlog of stray rows is best moved in a maintenance window
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION users.create_outbox_partition(partition_day DATE) RETURNS BOOLEAN AS $$
+        DECLARE
+            partition_name TEXT := 'outbox_events_p' || to_char(partition_day, 'YYYYMMDD');
+            lower_bound INTEGER := EXTRACT(epoch FROM partition_day::timestamp)::integer;
+            upper_bound INTEGER := EXTRACT(epoch FROM (partition_day + 1)::timestamp)::integer;
+        BEGIN
+            IF to_regclass('users.' || partition_name) IS NOT NULL THEN
+                RETURN FALSE;
+            END IF;
+
+            IF NOT EXISTS (
+                SELECT 1 FROM users.outbox_events_default
+                WHERE created_at >= lower_bound AND created_at < upper_bound
+            ) THEN
+                EXECUTE format(
+                    'CREATE TABLE users.%I PARTITION OF users.outbox_events FOR VALUES FROM (%s) TO (%s)',
+                    partition_name, lower_bound, upper_bound
+                );
+                RETURN TRUE;
+            END IF;
+
+            CREATE TEMPORARY TABLE outbox_events_moving (LIKE users.outbox_events) ON COMMIT DROP;
+            WITH moved AS (
+                DELETE FROM users.outbox_events_default
+                WHERE created_at >= lower_bound AND created_at < upper_bound
+                RETURNING *
+            )
+            INSERT INTO outbox_events_moving SELECT * FROM moved;
+            EXECUTE format(
+                'CREATE TABLE users.%I PARTITION OF users.outbox_events FOR VALUES FROM (%s) TO (%s)',
+                partition_name, lower_bound, upper_bound
+            );
+            INSERT INTO users.outbox_events SELECT * FROM outbox_events_moving;
+            DROP TABLE outbox_events_moving;
+            RETURN TRUE;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION users.create_outbox_partition(partition_day DATE) RETURNS BOOLEAN AS $$
+        DECLARE
+            partition_name TEXT := 'outbox_events_p' || to_char(partition_day, 'YYYYMMDD');
+            lower_bound INTEGER := EXTRACT(epoch FROM partition_day::timestamp)::integer;
+            upper_bound INTEGER := EXTRACT(epoch FROM (partition_day + 1)::timestamp)::integer;
+        BEGIN
+            IF to_regclass('users.' || partition_name) IS NOT NULL THEN
+                RETURN FALSE;
+            END IF;
+
+            IF NOT EXISTS (
+                SELECT 1 FROM users.outbox_events_default
+                WHERE created_at >= lower_bound AND created_at < upper_bound
+            ) THEN
+                EXECUTE format(
+                    'CREATE TABLE users.%I PARTITION OF users.outbox_events FOR VALUES FROM (%s) TO (%s)',
+                    partition_name, lower_bound, upper_bound
+                );
+                RETURN TRUE;
+            END IF;
+
+            ALTER TABLE users.outbox_events DETACH PARTITION users.outbox_events_default;
+            EXECUTE format(
+                'CREATE TABLE users.%I PARTITION OF users.outbox_events FOR VALUES FROM (%s) TO (%s)',
+                partition_name, lower_bound, upper_bound
+            );
+            EXECUTE format(
+                'WITH moved AS ('
+                '    DELETE FROM users.outbox_events_default'
+                '    WHERE created_at >= %s AND created_at < %s RETURNING *'
+                ') INSERT INTO users.%I SELECT * FROM moved',
+                lower_bound, upper_bound, partition_name
+            );
+            ALTER TABLE users.outbox_events ATTACH PARTITION users.outbox_events_default DEFAULT;
+            RETURN TRUE;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
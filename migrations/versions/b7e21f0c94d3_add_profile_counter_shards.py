@@ -0,0 +1,38 @@
+"""Add profile counter shards
+
+Revision ID: b7e21f0c94d3
+Revises: 41308c7649de
+Create Date: 2026-01-19 10:42:07.915326
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e21f0c94d3'
+down_revision: Union[str, Sequence[str], None] = '41308c7649de'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'profile_counter_shards',
+        sa.Column('user_id', sa.Uuid(), nullable=False),
+        sa.Column('shard', sa.Integer(), nullable=False),
+        sa.Column('followers_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('following_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('releases_count', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('featured_in_releases_count', sa.Integer(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.profiles.user_id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id', 'shard'),
+        schema='users',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('profile_counter_shards', schema='users')
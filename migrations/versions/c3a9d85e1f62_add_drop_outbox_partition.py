@@ -0,0 +1,52 @@
+"""Add drop outbox partition function
+
+Revision ID: c3a9d85e1f62
+Revises: b7e21f0c94d3
+Create Date: 2026-01-21 15:08:44.201739
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a9d85e1f62'
+down_revision: Union[str, Sequence[str], None] = 'b7e21f0c94d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Drops a single daily partition, used by the archiver once it has been written out
+    op.execute(
+        """
+        CREATE OR REPLACE FUNCTION users.drop_outbox_partition(partition_day DATE) RETURNS BOOLEAN AS $$
+        DECLARE
+            partition_name TEXT := 'outbox_events_p' || to_char(partition_day, 'YYYYMMDD');
+            has_pending BOOLEAN;
+        BEGIN
+            PERFORM pg_advisory_xact_lock(hashtext('users.outbox_events.partitions'));
+            IF to_regclass('users.' || partition_name) IS NULL THEN
+                RETURN FALSE;
+            END IF;
+
+            EXECUTE format(
+                'SELECT EXISTS (SELECT 1 FROM users.%I WHERE status = ''pending'')',
+                partition_name
+            ) INTO has_pending;
+            IF has_pending THEN
+                RETURN FALSE;
+            END IF;
+
+            EXECUTE format('DROP TABLE users.%I', partition_name);
+            RETURN TRUE;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP FUNCTION IF EXISTS users.drop_outbox_partition(DATE)")
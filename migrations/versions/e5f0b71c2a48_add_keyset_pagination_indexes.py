@@ -0,0 +1,40 @@
+"""Add keyset pagination indexes
+
+Revision ID: e5f0b71c2a48
+Revises: c3a9d85e1f62
+Create Date: 2026-01-23 11:26:53.480127
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f0b71c2a48'
+down_revision: Union[str, Sequence[str], None] = 'c3a9d85e1f62'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Each index follows the order of a cursor paginated listing, primary key last
+    op.create_index('idx_profiles_top_by_followers', 'profiles', [sa.text('followers_count DESC'), sa.text('user_id DESC')], unique=False, schema='users', postgresql_where=sa.text('deleted_at IS NULL'))
+    op.create_index('idx_profiles_top_by_monthly_listeners', 'profiles', [sa.text('coalesce(monthly_listeners, -1) DESC'), sa.text('user_id DESC')], unique=False, schema='users', postgresql_where=sa.text('deleted_at IS NULL'))
+    op.create_index('idx_profiles_verified', 'profiles', [sa.text('followers_count DESC'), sa.text('user_id DESC')], unique=False, schema='users', postgresql_where=sa.text('verified IS true AND deleted_at IS NULL'))
+    op.create_index('idx_users_status_created_at', 'users', ['status', sa.text('created_at DESC'), sa.text('id DESC')], unique=False, schema='users', postgresql_where=sa.text('deleted_at IS NULL'))
+    op.create_index('idx_user_audit_logs_action_timestamp', 'user_audit_logs', ['action', sa.text('timestamp DESC'), sa.text('id DESC')], unique=False, schema='users')
+    op.create_index('idx_user_audit_logs_changed_by_timestamp', 'user_audit_logs', ['changed_by', sa.text('timestamp DESC'), sa.text('id DESC')], unique=False, schema='users')
+    op.create_index('idx_user_settings_data_consent', 'user_settings', ['user_id'], unique=False, schema='users', postgresql_where=sa.text('data_consent IS true'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('idx_user_settings_data_consent', table_name='user_settings', schema='users')
+    op.drop_index('idx_user_audit_logs_changed_by_timestamp', table_name='user_audit_logs', schema='users')
+    op.drop_index('idx_user_audit_logs_action_timestamp', table_name='user_audit_logs', schema='users')
+    op.drop_index('idx_users_status_created_at', table_name='users', schema='users')
+    op.drop_index('idx_profiles_verified', table_name='profiles', schema='users')
+    op.drop_index('idx_profiles_top_by_monthly_listeners', table_name='profiles', schema='users')
+    op.drop_index('idx_profiles_top_by_followers', table_name='profiles', schema='users')
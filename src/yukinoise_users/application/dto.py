@@ -123,3 +123,18 @@ class PaginatedResultDTO(GenericModel, Generic[T]):
     @property
     def has_prev(self) -> bool:
         return self.offset > 0
+
+
+class CursorPaginationParams(BaseModel):
+    limit: int = 100
+    cursor: Optional[str] = None
+
+
+class CursorPageDTO(GenericModel, Generic[T]):
+    items: List[T]
+    limit: int
+    next_cursor: Optional[str] = None
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
@@ -13,6 +13,43 @@ class Settings(BaseSettings):
     def database_url(self) -> str:
         return f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
 
+    @property
+    def database_dsn(self) -> str:
+        return f"postgresql://{self.DB_USER}:{self.DB_PASSWORD}@{self.DB_HOST}:{self.DB_PORT}/{self.DB_NAME}"
+
+    # number of shard rows per profile for counter writes, 0 updates profiles directly;
+    # with shards, profile reads lag until compaction except get_exact_counters
+    PROFILE_COUNTER_SHARDS: int = 0
+
+    DB_ECHO: bool = False
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_OUTBOX_POOL_SIZE: int = 2
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    # set when connecting through PgBouncer in transaction pooling mode
+    DB_PGBOUNCER: bool = False
+    # serve hot profile and settings lookups with raw asyncpg queries
+    DB_FAST_READS: bool = False
+
+    # comma separated host[:port] list of replicas serving read-only units of work
+    DB_REPLICA_HOSTS: str = ""
+    # reads with a consistency key stay on the primary this long after its writes
+    DB_READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    @property
+    def replica_database_urls(self) -> list[str]:
+        urls = []
+        for host in filter(None, map(str.strip, self.DB_REPLICA_HOSTS.split(","))):
+            if ":" not in host:
+                host = f"{host}:{self.DB_PORT}"
+            urls.append(
+                f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}@{host}/{self.DB_NAME}"
+            )
+        return urls
+
     RABBITMQ_HOST: str = "localhost"
     RABBITMQ_PORT: int = 5672
     RABBITMQ_USER: str = "guest"
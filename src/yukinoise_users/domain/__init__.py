@@ -23,6 +23,8 @@ from yukinoise_users.domain.repositories import (
     UserSettingsRepository,
     UserAuditLogsRepository,
     OutboxRepository,
+    InboxRepository,
+    UnitOfWork,
 )
 from yukinoise_users.domain.value_objects import (
     UserStatus,
@@ -55,6 +57,7 @@ __all__ = [
     "UserSettingsRepository",
     "UserAuditLogsRepository",
     "OutboxRepository",
+    "InboxRepository",
     "UnitOfWork",
     # Value Objects
     "UserStatus",
@@ -22,6 +22,7 @@ class EventType(StrEnum):
 
     SETTINGS_UPDATED = "settings.updated"
 
+    # the followed user is the aggregate, the follower is payload["follower_id"]
     USER_FOLLOWED = "user.followed"
     USER_UNFOLLOWED = "user.unfollowed"
 
@@ -29,10 +30,15 @@ class EventType(StrEnum):
 @dataclass
 class DomainEvent:
     event_type: EventType
+    # sent as the aggregate_id header and body field, not inside the payload
     aggregate_id: UUID
     payload: dict[str, Any] = field(default_factory=dict)
     correlation_id: str | None = None
     causation_id: str | None = None
+    event_id: str | None = None
+
+
+FOLLOWER_ID_KEY = "follower_id"
 
 
 @dataclass
@@ -42,12 +48,16 @@ class IncomingEvent:
     payload: dict[str, Any]
     routing_key: str
     headers: dict[str, Any] = field(default_factory=dict)
+    # False when the message carried no id and event_id was generated on receipt
+    has_stable_id: bool = True
 
 
 class EventProducer(Protocol):
     async def publish(self, event: DomainEvent) -> None: ...
 
-    async def publish_batch(self, events: list[DomainEvent]) -> None: ...
+    async def publish_batch(
+        self, events: list[DomainEvent]
+    ) -> list[BaseException | None]: ...
 
     async def connect(self) -> None: ...
 
@@ -59,8 +69,14 @@ class EventConsumer(Protocol):
 
     async def consume(self) -> AsyncIterator[IncomingEvent]: ...
 
+    async def consume_batch(
+        self, max_items: int = 100, max_wait_ms: int = 100
+    ) -> AsyncIterator[list[IncomingEvent]]: ...
+
     async def ack(self, event_id: str) -> None: ...
 
+    async def ack_batch(self, event_ids: list[str]) -> None: ...
+
     async def nack(self, event_id: str, requeue: bool = True) -> None: ...
 
     async def connect(self) -> None: ...
@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field
 from uuid import UUID
-from typing import Any
+from typing import Any, Generic, TypeVar
 
 from yukinoise_users.domain.value_objects import (
     UserStatus,
@@ -10,6 +10,8 @@ from yukinoise_users.domain.value_objects import (
     OutboxStatus,
 )
 
+T = TypeVar("T")
+
 
 @dataclass
 class User:
@@ -79,3 +81,13 @@ class OutboxEvent:
     status: OutboxStatus = OutboxStatus.PENDING
     retry_count: int = 0
     error: str | None = None
+    locked_by: str | None = None
+    locked_until: int | None = None
+    next_attempt_at: int | None = None
+
+
+@dataclass
+class CursorPage(Generic[T]):
+    items: list[T]
+    # opaque token for the following page, None on the last one
+    next_cursor: str | None = None
@@ -1,4 +1,4 @@
-from typing import Protocol, Sequence, Any
+from typing import Protocol, Sequence, Any, AsyncIterator
 from uuid import UUID
 
 from yukinoise_users.domain.models import (
@@ -7,6 +7,7 @@ from yukinoise_users.domain.models import (
     UserSettings,
     UserAuditLog,
     OutboxEvent,
+    CursorPage,
 )
 from yukinoise_users.domain.value_objects import (
     UserStatus,
@@ -34,6 +35,10 @@ class UsersRepository(Protocol):
         self, status: UserStatus, limit: int = 100, offset: int = 0
     ) -> Sequence[User]: ...
 
+    async def get_by_status_page(
+        self, status: UserStatus, limit: int = 100, cursor: str | None = None
+    ) -> CursorPage[User]: ...
+
     async def get_active_users(
         self, limit: int = 100, offset: int = 0
     ) -> Sequence[User]: ...
@@ -104,6 +109,18 @@ class ProfilesRepository(Protocol):
         self, limit: int = 100, offset: int = 0
     ) -> Sequence[Profile]: ...
 
+    async def get_verified_page(
+        self, limit: int = 100, cursor: str | None = None
+    ) -> CursorPage[Profile]: ...
+
+    async def get_top_by_monthly_listeners_page(
+        self, limit: int = 100, cursor: str | None = None
+    ) -> CursorPage[Profile]: ...
+
+    async def get_top_by_followers_page(
+        self, limit: int = 100, cursor: str | None = None
+    ) -> CursorPage[Profile]: ...
+
     async def update_profile(self, user_id: UUID, **updates: Any) -> None: ...
 
     async def update_avatar(self, user_id: UUID, avatar_url: str | None) -> None: ...
@@ -126,6 +143,16 @@ class ProfilesRepository(Protocol):
 
     async def decrement_featured_in_releases(self, user_id: UUID) -> None: ...
 
+    async def apply_counter_deltas(
+        self, deltas: dict[UUID, dict[str, int]]
+    ) -> None: ...
+
+    async def compact_counter_shards(self, limit: int = 1000) -> int: ...
+
+    # with counter shards the Profile reads above are eventually consistent,
+    # this one includes the deltas not yet compacted
+    async def get_exact_counters(self, user_id: UUID) -> dict[str, int] | None: ...
+
     async def set_verified(self, user_id: UUID, verified: bool) -> None: ...
 
     async def update_monthly_listeners(self, user_id: UUID, count: int) -> None: ...
@@ -142,6 +169,10 @@ class UserSettingsRepository(Protocol):
 
     async def create(self, user_id: UUID, **settings: Any) -> UserSettings: ...
 
+    async def get_with_data_consent_page(
+        self, limit: int = 100, cursor: str | None = None
+    ) -> CursorPage[UserSettings]: ...
+
     async def soft_delete(self, user_id: UUID, timestamp: int) -> None: ...
 
     async def restore(self, user_id: UUID) -> None: ...
@@ -160,24 +191,83 @@ class UserAuditLogsRepository(Protocol):
         self, user_id: UUID, limit: int = 100
     ) -> Sequence[UserAuditLog]: ...
 
+    async def list_by_action_page(
+        self, action: UserAuditAction, limit: int = 100, cursor: str | None = None
+    ) -> CursorPage[UserAuditLog]: ...
+
+    async def list_by_changed_by_page(
+        self, changed_by: UserChangedBy, limit: int = 100, cursor: str | None = None
+    ) -> CursorPage[UserAuditLog]: ...
+
 
 class OutboxRepository(Protocol):
     async def create_event(
         self, event_type: str, payload: dict[str, Any]
     ) -> "OutboxEvent": ...
 
+    async def create_events(self, events: list[tuple[str, dict[str, Any]]]) -> None: ...
+
     async def get_pending_events(self, limit: int = 100) -> Sequence["OutboxEvent"]: ...
 
-    async def mark_event_sent(self, event_id: UUID) -> None: ...
+    async def claim_pending_events(
+        self, worker_id: str, limit: int = 100, lease_seconds: int = 60
+    ) -> Sequence["OutboxEvent"]: ...
+
+    # events are identified by (id, created_at), which routes the statement
+    # to the event's partition
+
+    async def mark_event_sent(
+        self, event_id: UUID, created_at: int, worker_id: str
+    ) -> None: ...
+
+    async def mark_event_failed(
+        self, event_id: UUID, created_at: int, error: str, worker_id: str
+    ) -> None: ...
+
+    async def increment_retry_count(
+        self, event_id: UUID, created_at: int, worker_id: str
+    ) -> None: ...
 
-    async def mark_event_failed(self, event_id: UUID, error: str) -> None: ...
+    async def mark_events_sent(
+        self, events: list[tuple[UUID, int]], worker_id: str
+    ) -> None: ...
 
-    async def increment_retry_count(self, event_id: UUID) -> None: ...
+    async def mark_events_failed(
+        self, errors: dict[tuple[UUID, int], str], worker_id: str
+    ) -> None: ...
+
+    async def schedule_retries(
+        self, delays: dict[tuple[UUID, int], int], worker_id: str
+    ) -> None: ...
 
-    async def delete_event(self, event_id: UUID) -> None: ...
+    async def delete_event(self, event_id: UUID, created_at: int) -> None: ...
 
     async def delete_events_older_than(self, timestamp: int) -> None: ...
 
+    async def ensure_partitions(self, days_ahead: int = 3) -> int: ...
+
+    async def drop_partitions_older_than(self, timestamp: int) -> int: ...
+
+    async def get_partition_days_before(self, timestamp: int) -> list[int]: ...
+
+    async def has_pending_events_between(self, start: int, end: int) -> bool: ...
+
+    def stream_events_between(
+        self, start: int, end: int, batch_size: int = 1000
+    ) -> AsyncIterator[OutboxEvent]: ...
+
+    async def drop_partition(self, day_start: int) -> bool: ...
+
+
+class InboxRepository(Protocol):
+    async def mark_processed(
+        self, consumer: str, event_id: str, event_type: str
+    ) -> bool: ...
+
+    async def exists(self, consumer: str, event_id: str) -> bool: ...
+
+    async def delete_older_than(self, timestamp: int) -> None: ...
+
 
 class UnitOfWork(Protocol):
     """Protocol for UnitOfWork used by application services."""
@@ -203,6 +293,11 @@ class UnitOfWork(Protocol):
     @property
     def outbox(self) -> OutboxRepository: ...
 
+    @property
+    def inbox(self) -> InboxRepository: ...
+
+    def collect_event(self, event_type: str, payload: dict[str, Any]) -> None: ...
+
     async def commit(self) -> None: ...
 
     async def rollback(self) -> None: ...
@@ -4,7 +4,7 @@ from uuid import UUID
 from yukinoise_users.domain.repositories import (
     UserAuditLogsRepository as AuditRepoProtocol,
 )
-from yukinoise_users.domain.models import UserAuditLog
+from yukinoise_users.domain.models import CursorPage, UserAuditLog
 from yukinoise_users.domain.value_objects import UserAuditAction, UserChangedBy
 from yukinoise_users.infrastructure.database.repositories.user_audit_logs_repo import (
     UserAuditLogsRepository as UserAuditLogsDbRepo,
@@ -31,3 +31,17 @@ class UserAuditLogsRepositoryAdapter(AuditRepoProtocol):
     ) -> Sequence[UserAuditLog]:
         orms = await self._db.list_for_user(user_id, limit)
         return [audit_log_orm_to_domain(o) for o in orms]
+
+    async def list_by_action_page(
+        self, action: UserAuditAction, limit: int = 100, cursor: str | None = None
+    ) -> CursorPage[UserAuditLog]:
+        orms, next_cursor = await self._db.list_by_action_page(action, limit, cursor)
+        return CursorPage([audit_log_orm_to_domain(o) for o in orms], next_cursor)
+
+    async def list_by_changed_by_page(
+        self, changed_by: UserChangedBy, limit: int = 100, cursor: str | None = None
+    ) -> CursorPage[UserAuditLog]:
+        orms, next_cursor = await self._db.list_by_changed_by_page(
+            changed_by, limit, cursor
+        )
+        return CursorPage([audit_log_orm_to_domain(o) for o in orms], next_cursor)
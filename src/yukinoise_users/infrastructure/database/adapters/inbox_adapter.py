@@ -0,0 +1,20 @@
+from yukinoise_users.domain.repositories import InboxRepository as InboxRepoProtocol
+from yukinoise_users.infrastructure.database.repositories.processed_events_repo import (
+    ProcessedEventsRepository as ProcessedEventsDbRepo,
+)
+
+
+class InboxRepositoryAdapter(InboxRepoProtocol):
+    def __init__(self, db_repo: ProcessedEventsDbRepo) -> None:
+        self._db = db_repo
+
+    async def mark_processed(
+        self, consumer: str, event_id: str, event_type: str
+    ) -> bool:
+        return bool(await self._db.mark_processed(consumer, event_id, event_type))
+
+    async def exists(self, consumer: str, event_id: str) -> bool:
+        return bool(await self._db.exists(consumer, event_id))
+
+    async def delete_older_than(self, timestamp: int) -> None:
+        await self._db.delete_older_than(timestamp)
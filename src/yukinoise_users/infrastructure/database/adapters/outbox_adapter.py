@@ -1,4 +1,4 @@
-from typing import List, Any
+from typing import List, Any, AsyncIterator
 from uuid import UUID
 
 from yukinoise_users.domain.repositories import OutboxRepository as OutboxRepoProtocol
@@ -19,21 +19,74 @@ class OutboxRepositoryAdapter(OutboxRepoProtocol):
         outbox_orm = await self._db.create_event(event_type, payload)
         return outbox_orm_to_domain(outbox_orm)
 
+    async def create_events(self, events: List[tuple[str, dict[str, Any]]]) -> None:
+        await self._db.create_events(events)
+
     async def get_pending_events(self, limit: int = 100) -> List[OutboxEvent]:
         outbox_orms = await self._db.get_pending_events(limit)
         return [outbox_orm_to_domain(o) for o in outbox_orms]
 
-    async def mark_event_sent(self, event_id: UUID) -> None:
-        await self._db.mark_event_sent(event_id)
+    async def claim_pending_events(
+        self, worker_id: str, limit: int = 100, lease_seconds: int = 60
+    ) -> List[OutboxEvent]:
+        outbox_orms = await self._db.claim_pending_events(
+            worker_id, limit, lease_seconds
+        )
+        return [outbox_orm_to_domain(o) for o in outbox_orms]
+
+    async def mark_event_sent(
+        self, event_id: UUID, created_at: int, worker_id: str
+    ) -> None:
+        await self._db.mark_event_sent(event_id, created_at, worker_id)
+
+    async def mark_event_failed(
+        self, event_id: UUID, created_at: int, error: str, worker_id: str
+    ) -> None:
+        await self._db.mark_event_failed(event_id, created_at, error, worker_id)
+
+    async def increment_retry_count(
+        self, event_id: UUID, created_at: int, worker_id: str
+    ) -> None:
+        await self._db.increment_retry_count(event_id, created_at, worker_id)
+
+    async def mark_events_sent(
+        self, events: List[tuple[UUID, int]], worker_id: str
+    ) -> None:
+        await self._db.mark_events_sent(events, worker_id)
 
-    async def mark_event_failed(self, event_id: UUID, error: str) -> None:
-        await self._db.mark_event_failed(event_id, error)
+    async def mark_events_failed(
+        self, errors: dict[tuple[UUID, int], str], worker_id: str
+    ) -> None:
+        await self._db.mark_events_failed(errors, worker_id)
 
-    async def increment_retry_count(self, event_id: UUID) -> None:
-        await self._db.increment_retry_count(event_id)
+    async def schedule_retries(
+        self, delays: dict[tuple[UUID, int], int], worker_id: str
+    ) -> None:
+        await self._db.schedule_retries(delays, worker_id)
 
-    async def delete_event(self, event_id: UUID) -> None:
-        await self._db.delete_event(event_id)
+    async def delete_event(self, event_id: UUID, created_at: int) -> None:
+        await self._db.delete_event(event_id, created_at)
 
     async def delete_events_older_than(self, timestamp: int) -> None:
         await self._db.delete_events_older_than(timestamp)
+
+    async def ensure_partitions(self, days_ahead: int = 3) -> int:
+        return int(await self._db.ensure_partitions(days_ahead))
+
+    async def drop_partitions_older_than(self, timestamp: int) -> int:
+        return int(await self._db.drop_partitions_older_than(timestamp))
+
+    async def get_partition_days_before(self, timestamp: int) -> List[int]:
+        return list(await self._db.get_partition_days_before(timestamp))
+
+    async def has_pending_events_between(self, start: int, end: int) -> bool:
+        return bool(await self._db.has_pending_events_between(start, end))
+
+    async def stream_events_between(
+        self, start: int, end: int, batch_size: int = 1000
+    ) -> AsyncIterator[OutboxEvent]:
+        async for outbox_orm in self._db.stream_events_between(start, end, batch_size):
+            yield outbox_orm_to_domain(outbox_orm)
+
+    async def drop_partition(self, day_start: int) -> bool:
+        return bool(await self._db.drop_partition(day_start))
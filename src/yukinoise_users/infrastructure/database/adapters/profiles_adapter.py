@@ -4,7 +4,8 @@ from uuid import UUID
 from yukinoise_users.domain.repositories import (
     ProfilesRepository as ProfilesRepoProtocol,
 )
-from yukinoise_users.domain.models import Profile
+from yukinoise_users.domain.models import CursorPage, Profile
+from yukinoise_users.infrastructure.database.fast_reads import FastReads
 from yukinoise_users.infrastructure.database.repositories.profiles_repo import (
     ProfilesRepository as ProfilesDbRepo,
 )
@@ -12,14 +13,19 @@ from yukinoise_users.infrastructure.mapping.orm_to_domain import profile_orm_to_
 
 
 class ProfilesRepositoryAdapter(ProfilesRepoProtocol):
-    def __init__(self, db_repo: ProfilesDbRepo) -> None:
+    def __init__(
+        self, db_repo: ProfilesDbRepo, fast_reads: FastReads | None = None
+    ) -> None:
         self._db = db_repo
+        self._fast_reads = fast_reads
 
     async def create(self, user_id: UUID, **profile_data: Any) -> Profile:
         profile_orm = await self._db.create(user_id, **profile_data)
         return profile_orm_to_domain(profile_orm)
 
     async def get_by_user_id(self, user_id: UUID) -> Profile | None:
+        if self._fast_reads is not None:
+            return await self._fast_reads.get_profile_by_user_id(user_id)
         profile_orm = await self._db.get_by_user_id(user_id)
         return profile_orm_to_domain(profile_orm) if profile_orm is not None else None
 
@@ -28,6 +34,8 @@ class ProfilesRepositoryAdapter(ProfilesRepoProtocol):
         return [profile_orm_to_domain(p) for p in profile_orms]
 
     async def get_by_display_name(self, display_name: str) -> Profile | None:
+        if self._fast_reads is not None:
+            return await self._fast_reads.get_profile_by_display_name(display_name)
         profile_orm = await self._db.get_by_display_name(display_name)
         return profile_orm_to_domain(profile_orm) if profile_orm is not None else None
 
@@ -74,6 +82,28 @@ class ProfilesRepositoryAdapter(ProfilesRepoProtocol):
         profile_orms = await self._db.get_top_by_followers(limit, offset)
         return [profile_orm_to_domain(p) for p in profile_orms]
 
+    async def get_verified_page(
+        self, limit: int = 100, cursor: str | None = None
+    ) -> CursorPage[Profile]:
+        profile_orms, next_cursor = await self._db.get_verified_page(limit, cursor)
+        return CursorPage([profile_orm_to_domain(p) for p in profile_orms], next_cursor)
+
+    async def get_top_by_monthly_listeners_page(
+        self, limit: int = 100, cursor: str | None = None
+    ) -> CursorPage[Profile]:
+        profile_orms, next_cursor = await self._db.get_top_by_monthly_listeners_page(
+            limit, cursor
+        )
+        return CursorPage([profile_orm_to_domain(p) for p in profile_orms], next_cursor)
+
+    async def get_top_by_followers_page(
+        self, limit: int = 100, cursor: str | None = None
+    ) -> CursorPage[Profile]:
+        profile_orms, next_cursor = await self._db.get_top_by_followers_page(
+            limit, cursor
+        )
+        return CursorPage([profile_orm_to_domain(p) for p in profile_orms], next_cursor)
+
     async def update_profile(self, user_id: UUID, **updates: Any) -> None:
         await self._db.update_profile(user_id, **updates)
 
@@ -107,6 +137,16 @@ class ProfilesRepositoryAdapter(ProfilesRepoProtocol):
     async def decrement_featured_in_releases(self, user_id: UUID) -> None:
         await self._db.decrement_featured_in_releases(user_id)
 
+    async def apply_counter_deltas(self, deltas: dict[UUID, dict[str, int]]) -> None:
+        await self._db.apply_counter_deltas(deltas)
+
+    async def compact_counter_shards(self, limit: int = 1000) -> int:
+        return int(await self._db.compact_counter_shards(limit))
+
+    async def get_exact_counters(self, user_id: UUID) -> dict[str, int] | None:
+        counters = await self._db.get_exact_counters(user_id)
+        return None if counters is None else dict(counters)
+
     async def set_verified(self, user_id: UUID, verified: bool) -> None:
         await self._db.set_verified(user_id, verified)
 
@@ -4,7 +4,8 @@ from uuid import UUID
 from yukinoise_users.domain.repositories import (
     UserSettingsRepository as SettingsRepoProtocol,
 )
-from yukinoise_users.domain.models import UserSettings
+from yukinoise_users.domain.models import CursorPage, UserSettings
+from yukinoise_users.infrastructure.database.fast_reads import FastReads
 from yukinoise_users.infrastructure.database.repositories.user_settings_repo import (
     UserSettingsRepository as UserSettingsDbRepo,
 )
@@ -12,10 +13,15 @@ from yukinoise_users.infrastructure.mapping.orm_to_domain import settings_orm_to
 
 
 class UserSettingsRepositoryAdapter(SettingsRepoProtocol):
-    def __init__(self, db_repo: UserSettingsDbRepo) -> None:
+    def __init__(
+        self, db_repo: UserSettingsDbRepo, fast_reads: FastReads | None = None
+    ) -> None:
         self._db = db_repo
+        self._fast_reads = fast_reads
 
     async def get(self, user_id: UUID) -> UserSettings | None:
+        if self._fast_reads is not None:
+            return await self._fast_reads.get_settings_by_user_id(user_id)
         orm = await self._db.get_by_user_id(user_id)
         return settings_orm_to_domain(orm)
 
@@ -26,6 +32,12 @@ class UserSettingsRepositoryAdapter(SettingsRepoProtocol):
         orm = await self._db.create(user_id, **settings)
         return settings_orm_to_domain(orm)
 
+    async def get_with_data_consent_page(
+        self, limit: int = 100, cursor: str | None = None
+    ) -> CursorPage[UserSettings]:
+        orms, next_cursor = await self._db.get_with_data_consent_page(limit, cursor)
+        return CursorPage([settings_orm_to_domain(o) for o in orms], next_cursor)
+
     async def soft_delete(self, user_id: UUID, timestamp: int) -> None:
         raise NotImplementedError("User settings soft delete is not supported")
 
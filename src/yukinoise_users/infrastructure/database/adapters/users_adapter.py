@@ -2,7 +2,7 @@ from typing import Sequence, Any
 from uuid import UUID
 
 from yukinoise_users.domain.repositories import UsersRepository as UsersRepoProtocol
-from yukinoise_users.domain.models import User
+from yukinoise_users.domain.models import CursorPage, User
 from yukinoise_users.domain.value_objects import UserStatus
 from yukinoise_users.infrastructure.database.repositories.users_repo import (
     UsersRepository as UsersDbRepo,
@@ -45,6 +45,14 @@ class UsersRepositoryAdapter(UsersRepoProtocol):
         user_orms = await self._db.get_by_status(status, limit, offset)
         return [user_orm_to_domain(u) for u in user_orms]
 
+    async def get_by_status_page(
+        self, status: UserStatus, limit: int = 100, cursor: str | None = None
+    ) -> CursorPage[User]:
+        user_orms, next_cursor = await self._db.get_by_status_page(
+            status, limit, cursor
+        )
+        return CursorPage([user_orm_to_domain(u) for u in user_orms], next_cursor)
+
     async def get_active_users(
         self, limit: int = 100, offset: int = 0
     ) -> Sequence[User]:
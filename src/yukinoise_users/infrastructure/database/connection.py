@@ -1,17 +1,219 @@
-from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+import time
+from dataclasses import dataclass
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, PoolProxiedConnection
 
 from yukinoise_users.core.conf import settings
 
-async_engine = create_async_engine(
-    settings.database_url,
-    echo=True,
-)
-async_session_factory = async_sessionmaker(
-    bind=async_engine,
-    class_=AsyncSession,
-    expire_on_commit=False,
-)
+API_ROLE = "api"
+OUTBOX_ROLE = "outbox"
+MIGRATIONS_ROLE = "migrations"
+REPLICA_ROLE = "replica"
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long callers wait for a connection."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.waiting = 0
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def connect(self) -> PoolProxiedConnection:
+        self.waiting += 1
+        started = time.perf_counter()
+        try:
+            connection = super().connect()
+        finally:
+            self.waiting -= 1
+        # only successful checkouts count, timeouts and connect errors raise
+        waited = time.perf_counter() - started
+        self.checkouts += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        return connection
+
+
+@dataclass(frozen=True)
+class EngineProfile:
+    role: str
+    pool_size: int = 5
+    max_overflow: int = 10
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    pool_pre_ping: bool = True
+    statement_cache_size: int = 100
+    # transaction-pooling PgBouncer cannot keep named prepared statements
+    pgbouncer: bool = False
+    # no pool at all, for short-lived processes such as migrations
+    null_pool: bool = False
+    echo: bool = False
+
+    def engine_kwargs(self) -> dict[str, Any]:
+        connect_args: dict[str, Any] = {
+            "statement_cache_size": self.statement_cache_size,
+        }
+        kwargs: dict[str, Any] = {"echo": self.echo, "connect_args": connect_args}
+        if self.pgbouncer:
+            connect_args["statement_cache_size"] = 0
+            connect_args["prepared_statement_cache_size"] = 0
+            # unique names, so a statement never clashes with one prepared by
+            # another client on the same server connection
+            connect_args["prepared_statement_name_func"] = (
+                lambda: f"__asyncpg_{uuid4()}__"
+            )
+        if self.null_pool:
+            kwargs["poolclass"] = NullPool
+        else:
+            kwargs.update(
+                poolclass=InstrumentedAsyncPool,
+                pool_size=self.pool_size,
+                max_overflow=self.max_overflow,
+                pool_timeout=self.pool_timeout,
+                pool_recycle=self.pool_recycle,
+                pool_pre_ping=self.pool_pre_ping,
+            )
+        return kwargs
+
+
+ENGINE_PROFILES: dict[str, EngineProfile] = {
+    API_ROLE: EngineProfile(
+        role=API_ROLE,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+        pgbouncer=settings.DB_PGBOUNCER,
+        echo=settings.DB_ECHO,
+    ),
+    # background workers run a few short transactions at a time
+    OUTBOX_ROLE: EngineProfile(
+        role=OUTBOX_ROLE,
+        pool_size=settings.DB_OUTBOX_POOL_SIZE,
+        max_overflow=0,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+        pgbouncer=settings.DB_PGBOUNCER,
+        echo=settings.DB_ECHO,
+    ),
+    MIGRATIONS_ROLE: EngineProfile(
+        role=MIGRATIONS_ROLE,
+        null_pool=True,
+        pgbouncer=settings.DB_PGBOUNCER,
+        echo=settings.DB_ECHO,
+    ),
+    # one engine of this profile per host in DB_REPLICA_HOSTS
+    REPLICA_ROLE: EngineProfile(
+        role=REPLICA_ROLE,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        statement_cache_size=settings.DB_STATEMENT_CACHE_SIZE,
+        pgbouncer=settings.DB_PGBOUNCER,
+        echo=settings.DB_ECHO,
+    ),
+}
+
+# engines are created on first use, so importing this module opens nothing
+# and a process only gets pools for the roles it uses
+_engines: dict[str, AsyncEngine] = {}
+_session_factories: dict[str, async_sessionmaker[AsyncSession]] = {}
+_replica_engines: list[AsyncEngine] = []
+_replica_session_factories: list[async_sessionmaker[AsyncSession]] = []
+
+
+def create_engine_for_profile(
+    profile: EngineProfile, url: str | None = None
+) -> AsyncEngine:
+    return create_async_engine(url or settings.database_url, **profile.engine_kwargs())
+
+
+def get_engine(role: str = API_ROLE) -> AsyncEngine:
+    engine = _engines.get(role)
+    if engine is None:
+        engine = _engines[role] = create_engine_for_profile(ENGINE_PROFILES[role])
+    return engine
+
+
+def get_session_factory(role: str = API_ROLE) -> async_sessionmaker[AsyncSession]:
+    session_factory = _session_factories.get(role)
+    if session_factory is None:
+        session_factory = _session_factories[role] = async_sessionmaker(
+            bind=get_engine(role),
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+    return session_factory
+
+
+def get_replica_session_factories() -> list[async_sessionmaker[AsyncSession]]:
+    """Session factories of the configured replicas, empty without replicas."""
+    if not _replica_engines:
+        profile = ENGINE_PROFILES[REPLICA_ROLE]
+        for url in settings.replica_database_urls:
+            engine = create_engine_for_profile(profile, url)
+            _replica_engines.append(engine)
+            _replica_session_factories.append(
+                async_sessionmaker(
+                    bind=engine, class_=AsyncSession, expire_on_commit=False
+                )
+            )
+    return _replica_session_factories
+
+
+def pool_stats(role: str = API_ROLE) -> dict[str, Any]:
+    """Pool usage of an engine created through ``get_engine``."""
+    engine = _engines.get(role)
+    if engine is None:
+        return {"role": role, "created": False}
+    return _engine_pool_stats(role, engine)
+
+
+def replica_pool_stats() -> list[dict[str, Any]]:
+    return [
+        {"host": engine.url.host, **_engine_pool_stats(REPLICA_ROLE, engine)}
+        for engine in _replica_engines
+    ]
+
+
+def _engine_pool_stats(role: str, engine: AsyncEngine) -> dict[str, Any]:
+    pool = engine.pool
+    stats: dict[str, Any] = {"role": role, "created": True, "status": pool.status()}
+    if isinstance(pool, InstrumentedAsyncPool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            waiting=pool.waiting,
+            checkouts=pool.checkouts,
+            wait_seconds_total=pool.wait_seconds_total,
+            wait_seconds_max=pool.wait_seconds_max,
+        )
+    return stats
+
+
+async def dispose_engines() -> None:
+    """Dispose of every engine created so far, replicas included."""
+    for engine in [*_engines.values(), *_replica_engines]:
+        await engine.dispose()
 
 
 class Base(DeclarativeBase):
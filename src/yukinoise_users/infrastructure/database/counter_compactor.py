@@ -0,0 +1,53 @@
+import asyncio
+import logging
+from typing import Callable
+
+from yukinoise_users.domain.repositories import UnitOfWork
+
+
+logger = logging.getLogger(__name__)
+
+
+class CounterShardCompactor:
+    """Periodically fold sharded profile counter deltas into the profiles."""
+
+    def __init__(
+        self,
+        uow_factory: Callable[[], UnitOfWork],
+        interval_seconds: float = 5.0,
+        batch_size: int = 1000,
+    ) -> None:
+        self._uow_factory = uow_factory
+        self._interval = interval_seconds
+        self._batch_size = batch_size
+        self._running = False
+
+    async def compact(self) -> int:
+        total = 0
+        while True:
+            # one short transaction per batch keeps profile row locks brief
+            async with self._uow_factory() as uow:
+                compacted: int = await uow.profiles.compact_counter_shards(
+                    self._batch_size
+                )
+            total += compacted
+            if compacted < self._batch_size:
+                return total
+
+    async def start(self) -> None:
+        self._running = True
+        logger.info("Starting counter shard compactor")
+
+        while self._running:
+            try:
+                compacted = await self.compact()
+                if compacted > 0:
+                    logger.debug(f"Compacted counter shards of {compacted} profiles")
+            except Exception as e:
+                logger.exception(f"Error in counter shard compactor: {e}")
+
+            await asyncio.sleep(self._interval)
+
+    async def stop(self) -> None:
+        self._running = False
+        logger.info("Stopped counter shard compactor")
@@ -0,0 +1,56 @@
+from uuid import UUID
+
+from sqlalchemy import RowMapping
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from yukinoise_users.domain.models import Profile, UserSettings
+from yukinoise_users.infrastructure.mapping.record_to_domain import (
+    PROFILE_COLUMNS,
+    SETTINGS_COLUMNS,
+    profile_record_to_domain,
+    settings_record_to_domain,
+)
+
+PROFILE_BY_USER_ID = (
+    f"SELECT {', '.join(PROFILE_COLUMNS)} FROM users.profiles "
+    "WHERE user_id = $1 AND deleted_at IS NULL"
+)
+PROFILE_BY_DISPLAY_NAME = (
+    f"SELECT {', '.join(PROFILE_COLUMNS)} FROM users.profiles "
+    "WHERE display_name = $1 AND deleted_at IS NULL"
+)
+SETTINGS_BY_USER_ID = (
+    f"SELECT {', '.join(SETTINGS_COLUMNS)} FROM users.user_settings "
+    "WHERE user_id = $1"
+)
+
+
+class FastReads:
+    """Hot single-row reads run as fixed driver SQL on the session's connection.
+
+    The queries go through ``exec_driver_sql``, so they share the session's
+    transaction and replica, and rows are mapped straight to domain objects
+    without statement compilation or ORM hydration. The asyncpg dialect
+    prepares each query once per connection through its statement cache, and
+    jsonb columns are decoded by the codec it registers on every connection.
+    """
+
+    def __init__(self, session: AsyncSession) -> None:
+        self._session = session
+
+    async def get_profile_by_user_id(self, user_id: UUID) -> Profile | None:
+        record = await self._fetchrow(PROFILE_BY_USER_ID, user_id)
+        return profile_record_to_domain(record) if record is not None else None
+
+    async def get_profile_by_display_name(self, display_name: str) -> Profile | None:
+        record = await self._fetchrow(PROFILE_BY_DISPLAY_NAME, display_name)
+        return profile_record_to_domain(record) if record is not None else None
+
+    async def get_settings_by_user_id(self, user_id: UUID) -> UserSettings | None:
+        record = await self._fetchrow(SETTINGS_BY_USER_ID, user_id)
+        return settings_record_to_domain(record) if record is not None else None
+
+    async def _fetchrow(self, query: str, *args: object) -> RowMapping | None:
+        connection = await self._session.connection()
+        result = await connection.exec_driver_sql(query, args)
+        return result.mappings().first()
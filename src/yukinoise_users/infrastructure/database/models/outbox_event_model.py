@@ -1,7 +1,7 @@
 from enum import StrEnum
 from typing import Any
 
-from sqlalchemy import func
+from sqlalchemy import Enum, Index, func, text
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import mapped_column, Mapped
 import uuid
@@ -17,19 +17,39 @@ class OutboxStatus(StrEnum):
 
 class OutboxEventORM(Base):
     __tablename__ = "outbox_events"
-    __table_args__ = ({"schema": "users"},)
+    __table_args__ = (
+        Index(
+            "idx_outbox_events_pending",
+            "created_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+        {"schema": "users", "postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         primary_key=True, default=func.gen_random_uuid()
     )
     event_type: Mapped[str] = mapped_column(nullable=False)
+    # partition key, hence part of the primary key
     created_at: Mapped[int] = mapped_column(
-        nullable=False, server_default=func.extract("epoch", func.now())
+        primary_key=True,
+        nullable=False,
+        server_default=func.extract("epoch", func.now()),
     )
     payload: Mapped[dict[str, Any]] = mapped_column(JSONB, nullable=False)
     updated_at: Mapped[int | None] = mapped_column(nullable=True)
+    # the outboxstatus type holds the lowercase values, not the member names
     status: Mapped[OutboxStatus] = mapped_column(
-        nullable=False, server_default=OutboxStatus.PENDING.value
+        Enum(
+            OutboxStatus,
+            name="outboxstatus",
+            values_callable=lambda statuses: [s.value for s in statuses],
+        ),
+        nullable=False,
+        server_default=OutboxStatus.PENDING.value,
     )
     retry_count: Mapped[int] = mapped_column(nullable=False, server_default="0")
     error: Mapped[str | None] = mapped_column(nullable=True)
+    locked_by: Mapped[str | None] = mapped_column(nullable=True)
+    locked_until: Mapped[int | None] = mapped_column(nullable=True)
+    next_attempt_at: Mapped[int | None] = mapped_column(nullable=True)
@@ -0,0 +1,19 @@
+from sqlalchemy import Index, func
+from sqlalchemy.orm import mapped_column, Mapped
+
+from yukinoise_users.infrastructure.database.connection import Base
+
+
+class ProcessedEventORM(Base):
+    __tablename__ = "processed_events"
+    __table_args__ = (
+        Index("idx_processed_events_processed_at", "processed_at"),
+        {"schema": "users"},
+    )
+
+    consumer: Mapped[str] = mapped_column(primary_key=True)
+    event_id: Mapped[str] = mapped_column(primary_key=True)
+    event_type: Mapped[str] = mapped_column(nullable=False)
+    processed_at: Mapped[int] = mapped_column(
+        nullable=False, server_default=func.extract("epoch", func.now())
+    )
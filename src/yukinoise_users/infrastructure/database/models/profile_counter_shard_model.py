@@ -0,0 +1,23 @@
+import uuid
+
+from sqlalchemy import ForeignKey
+from sqlalchemy.orm import mapped_column, Mapped
+
+from yukinoise_users.infrastructure.database.connection import Base
+
+
+class ProfileCounterShardORM(Base):
+    """Pending counter deltas of a profile, spread over several shard rows."""
+
+    __tablename__ = "profile_counter_shards"
+    __table_args__ = {"schema": "users"}
+
+    user_id: Mapped[uuid.UUID] = mapped_column(
+        ForeignKey("users.profiles.user_id", ondelete="CASCADE"), primary_key=True
+    )
+    shard: Mapped[int] = mapped_column(primary_key=True)
+
+    followers_count: Mapped[int] = mapped_column(default=0, nullable=False)
+    following_count: Mapped[int] = mapped_column(default=0, nullable=False)
+    releases_count: Mapped[int] = mapped_column(default=0, nullable=False)
+    featured_in_releases_count: Mapped[int] = mapped_column(default=0, nullable=False)
@@ -1,6 +1,6 @@
 from sqlalchemy.orm import mapped_column, Mapped, relationship
-from sqlalchemy.dialects.postgresql import TSVECTOR
-from sqlalchemy import ForeignKey, Index, ARRAY, func, String
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
+from sqlalchemy import ForeignKey, Index, func, String, text
 import uuid
 from sqlalchemy.dialects.postgresql import JSONB
 
@@ -17,6 +17,25 @@ class ProfileORM(Base):
         ),
         Index("idx_profiles_tags", "tags", postgresql_using="gin"),
         Index("idx_profiles_social_links", "social_links", postgresql_using="gin"),
+        # keyset pagination of the leaderboards, tie-broken on user_id
+        Index(
+            "idx_profiles_top_by_followers",
+            text("followers_count DESC"),
+            text("user_id DESC"),
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "idx_profiles_top_by_monthly_listeners",
+            text("coalesce(monthly_listeners, -1) DESC"),
+            text("user_id DESC"),
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
+        Index(
+            "idx_profiles_verified",
+            text("followers_count DESC"),
+            text("user_id DESC"),
+            postgresql_where=text("verified IS true AND deleted_at IS NULL"),
+        ),
         {"schema": "users"},
     )
 
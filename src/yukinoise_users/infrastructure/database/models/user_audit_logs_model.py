@@ -1,7 +1,7 @@
 from enum import StrEnum
 
 from sqlalchemy.orm import mapped_column, Mapped
-from sqlalchemy import ForeignKey, Index, func
+from sqlalchemy import ForeignKey, Index, func, text
 from sqlalchemy.dialects.postgresql import JSONB
 import uuid
 
@@ -27,6 +27,18 @@ class UserAuditLogORM(Base):
     __table_args__ = (
         Index("idx_user_audit_logs_user_id", "user_id"),
         Index("idx_user_audit_logs_action", "action"),
+        Index(
+            "idx_user_audit_logs_action_timestamp",
+            "action",
+            text("timestamp DESC"),
+            text("id DESC"),
+        ),
+        Index(
+            "idx_user_audit_logs_changed_by_timestamp",
+            "changed_by",
+            text("timestamp DESC"),
+            text("id DESC"),
+        ),
         {"schema": "users"},
     )
 
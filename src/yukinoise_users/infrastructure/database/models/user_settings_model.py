@@ -1,7 +1,7 @@
 from enum import StrEnum
 
 from sqlalchemy.orm import mapped_column, Mapped, relationship
-from sqlalchemy import ForeignKey, func
+from sqlalchemy import ForeignKey, Index, func, text
 from sqlalchemy.dialects.postgresql import JSONB
 import uuid
 
@@ -17,7 +17,14 @@ class UserPlaybackQuality(StrEnum):
 
 class UserSettingsORM(Base):
     __tablename__ = "user_settings"
-    __table_args__ = {"schema": "users"}
+    __table_args__ = (
+        Index(
+            "idx_user_settings_data_consent",
+            "user_id",
+            postgresql_where=text("data_consent IS true"),
+        ),
+        {"schema": "users"},
+    )
 
     user_id: Mapped[uuid.UUID] = mapped_column(
         ForeignKey("users.users.id"), primary_key=True
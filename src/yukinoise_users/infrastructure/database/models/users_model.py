@@ -1,7 +1,7 @@
 from enum import StrEnum
 
 from sqlalchemy.orm import mapped_column, Mapped, relationship
-from sqlalchemy import Index, func
+from sqlalchemy import Index, func, text
 import uuid
 
 from yukinoise_users.infrastructure.database.connection import Base
@@ -18,6 +18,13 @@ class UserORM(Base):
     __table_args__ = (
         Index("idx_users_status", "status"),
         Index("idx_users_last_login_at", "last_login_at"),
+        Index(
+            "idx_users_status_created_at",
+            "status",
+            text("created_at DESC"),
+            text("id DESC"),
+            postgresql_where=text("deleted_at IS NULL"),
+        ),
         {"schema": "users"},
     )
 
@@ -42,4 +49,4 @@ class UserORM(Base):
     deleted_at: Mapped[int | None] = mapped_column(nullable=True)
 
     profile = relationship("ProfileORM", back_populates="user", uselist=False)
-    settings = relationship("UserSettingORM", back_populates="user", uselist=False)
+    settings = relationship("UserSettingsORM", back_populates="user", uselist=False)
@@ -0,0 +1,182 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable
+
+from yukinoise_users.domain.models import OutboxEvent
+from yukinoise_users.domain.repositories import UnitOfWork
+
+
+logger = logging.getLogger(__name__)
+
+DAY_SECONDS = 24 * 60 * 60
+INDEX_FILE_NAME = "index.jsonl"
+
+
+class _SegmentWriter:
+    """Write one day of events into size-capped gzip JSONL segments."""
+
+    def __init__(
+        self, directory: Path, day: str, max_events: int, max_bytes: int
+    ) -> None:
+        self._directory = directory
+        self._day = day
+        self._max_events = max_events
+        self._max_bytes = max_bytes
+        self._file: gzip.GzipFile | None = None
+        self._entry: dict[str, Any] = {}
+        self.entries: list[dict[str, Any]] = []
+
+    def write(self, records: list[dict[str, Any]]) -> None:
+        for record in records:
+            segment = self._file or self._open()
+            line = json.dumps(record, separators=(",", ":"), default=str)
+            data = line.encode("utf-8") + b"\n"
+            segment.write(data)
+            self._entry["events"] += 1
+            self._entry["bytes"] += len(data)
+            self._entry["from"] = min(self._entry["from"], record["created_at"])
+            self._entry["to"] = max(self._entry["to"], record["created_at"])
+            if (
+                self._entry["events"] >= self._max_events
+                or self._entry["bytes"] >= self._max_bytes
+            ):
+                self._close()
+
+    def finish(self) -> list[dict[str, Any]]:
+        self._close()
+        return self.entries
+
+    def _open(self) -> gzip.GzipFile:
+        name = f"outbox-{self._day}-{len(self.entries):04d}.jsonl.gz"
+        self._file = gzip.GzipFile(self._directory / name, "wb")
+        self._entry = {
+            "segment": name,
+            "day": self._day,
+            "events": 0,
+            "bytes": 0,
+            "from": float("inf"),
+            "to": float("-inf"),
+        }
+        return self._file
+
+    def _close(self) -> None:
+        if self._file is None:
+            return
+        self._file.close()
+        # the partition is dropped right after, so make sure the data is on disk
+        with open(self._directory / self._entry["segment"], "rb") as segment:
+            os.fsync(segment.fileno())
+        del self._entry["bytes"]
+        self.entries.append(self._entry)
+        self._file = None
+
+
+class OutboxArchiver:
+    """Archive daily outbox partitions to local files before dropping them.
+
+    Each archived day is written as gzip JSONL segments, rotated by event
+    count and uncompressed size, and recorded in ``index.jsonl`` with the
+    ``created_at`` range of every segment. Events are streamed through a
+    server-side cursor, so memory does not grow with the size of a day.
+    Days that still hold pending events are skipped until they drain.
+    """
+
+    def __init__(
+        self,
+        uow_factory: Callable[[], UnitOfWork],
+        archive_dir: str | Path,
+        batch_size: int = 1000,
+        segment_max_events: int = 100_000,
+        segment_max_bytes: int = 64 * 1024 * 1024,
+    ) -> None:
+        self._uow_factory = uow_factory
+        self._archive_dir = Path(archive_dir)
+        self._batch_size = batch_size
+        self._segment_max_events = segment_max_events
+        self._segment_max_bytes = segment_max_bytes
+
+    async def archive_older_than(self, timestamp: int) -> int:
+        """Archive and drop the partitions of days ending before ``timestamp``.
+
+        Returns the number of partitions dropped.
+        """
+        self._archive_dir.mkdir(parents=True, exist_ok=True)
+        cutoff = timestamp - timestamp % DAY_SECONDS
+        archived_days = self._read_archived_days()
+
+        async with self._uow_factory() as uow:
+            day_starts = await uow.outbox.get_partition_days_before(cutoff)
+
+        dropped = 0
+        for day_start in day_starts:
+            day = datetime.fromtimestamp(day_start, timezone.utc).strftime("%Y%m%d")
+            if day not in archived_days:
+                if not await self._archive_day(day_start, day):
+                    continue
+            async with self._uow_factory() as uow:
+                if await uow.outbox.drop_partition(day_start):
+                    dropped += 1
+        return dropped
+
+    async def _archive_day(self, day_start: int, day: str) -> bool:
+        day_end = day_start + DAY_SECONDS
+        writer = _SegmentWriter(
+            self._archive_dir, day, self._segment_max_events, self._segment_max_bytes
+        )
+        async with self._uow_factory() as uow:
+            if await uow.outbox.has_pending_events_between(day_start, day_end):
+                logger.info(f"Skipping outbox archive of {day}: pending events left")
+                return False
+
+            batch: list[dict[str, Any]] = []
+            async for event in uow.outbox.stream_events_between(
+                day_start, day_end, self._batch_size
+            ):
+                batch.append(self._to_record(event))
+                if len(batch) >= self._batch_size:
+                    await asyncio.to_thread(writer.write, batch)
+                    batch = []
+            if batch:
+                await asyncio.to_thread(writer.write, batch)
+
+        entries = await asyncio.to_thread(writer.finish)
+        if not entries:
+            # keep a marker so an empty day is not scanned again
+            entries = [{"segment": None, "day": day, "events": 0}]
+        # the index entry marks the day as complete, so it is written last
+        await asyncio.to_thread(self._append_index, entries)
+        archived = sum(entry["events"] for entry in entries)
+        logger.info(f"Archived {archived} outbox events of {day}")
+        return True
+
+    def _read_archived_days(self) -> set[str]:
+        index = self._archive_dir / INDEX_FILE_NAME
+        if not index.exists():
+            return set()
+        with open(index, encoding="utf-8") as f:
+            return {json.loads(line)["day"] for line in f if line.strip()}
+
+    def _append_index(self, entries: list[dict[str, Any]]) -> None:
+        with open(self._archive_dir / INDEX_FILE_NAME, "a", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry, separators=(",", ":")) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    @staticmethod
+    def _to_record(event: OutboxEvent) -> dict[str, Any]:
+        return {
+            "id": str(event.id),
+            "event_type": event.event_type,
+            "created_at": event.created_at,
+            "updated_at": event.updated_at,
+            "status": event.status.value,
+            "retry_count": event.retry_count,
+            "error": event.error,
+            "payload": event.payload,
+        }
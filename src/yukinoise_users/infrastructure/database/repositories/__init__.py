@@ -16,6 +16,9 @@ from yukinoise_users.infrastructure.database.repositories.user_audit_logs_repo i
 from yukinoise_users.infrastructure.database.repositories.outbox_event_repo import (
     OutboxEventRepository,
 )
+from yukinoise_users.infrastructure.database.repositories.processed_events_repo import (
+    ProcessedEventsRepository,
+)
 
 __all__ = [
     "BaseRepository",
@@ -24,4 +27,5 @@ __all__ = [
     "UserSettingsRepository",
     "UserAuditLogsRepository",
     "OutboxEventRepository",
+    "ProcessedEventsRepository",
 ]
@@ -1,7 +1,104 @@
+from functools import lru_cache
 from typing import Any, cast, List
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, insert, update, delete, UUID
+from sqlalchemy import select, insert, update, delete, bindparam, UUID
+
+from yukinoise_users.infrastructure.database.repositories.keyset import Keyset
+
+# Statements are built once, at import or on first use, with ``b_``-prefixed
+# bind parameters, so every call reuses the construct and its memoized cache
+# key instead of rebuilding it. The ORM cannot evaluate such parameters in
+# Python, so entity selects use populate_existing and DML statements skip
+# session synchronization.
+
+
+@lru_cache(maxsize=1024)
+def _with_bound_values(stmt: Any, names: tuple[str, ...]) -> Any:
+    columns = stmt.table.c
+    unknown = [name for name in names if name not in columns]
+    if unknown:
+        raise ValueError(f"Unknown columns for {stmt.table.name}: {unknown}")
+    return stmt.values(
+        {name: bindparam(f"b_{name}", type_=columns[name].type) for name in names}
+    )
+
+
+def bind_values(stmt: Any, values: dict[str, Any]) -> tuple[Any, dict[str, Any]]:
+    """Give an INSERT/UPDATE a bind parameter per key of ``values``.
+
+    Returns the statement, cached per column set, and its parameters.
+    """
+    bound = _with_bound_values(stmt, tuple(sorted(values)))
+    return bound, {f"b_{name}": value for name, value in values.items()}
+
+
+@lru_cache(maxsize=None)
+def _select_by_id(model: Any) -> Any:
+    return (
+        select(model)
+        .where(model.id == bindparam("b_id"))
+        .execution_options(populate_existing=True)
+    )
+
+
+@lru_cache(maxsize=None)
+def _select_page(model: Any) -> Any:
+    return (
+        select(model)
+        .limit(bindparam("b_limit"))
+        .offset(bindparam("b_offset"))
+        .execution_options(populate_existing=True)
+    )
+
+
+@lru_cache(maxsize=None)
+def _pages_by_primary_key(model: Any) -> Keyset:
+    keys = list(model.__table__.primary_key.columns)
+    return Keyset(
+        model.__tablename__,
+        select(model).execution_options(populate_existing=True),
+        keys,
+        lambda row: [getattr(row, key.key) for key in keys],
+        descending=False,
+    )
+
+
+@lru_cache(maxsize=1024)
+def _select_filtered_by(
+    model: Any, names: tuple[str, ...], null_names: tuple[str, ...] = ()
+) -> Any:
+    # a None bound at execution would compare with = NULL and match nothing
+    return (
+        select(model)
+        .where(*(getattr(model, name).is_(None) for name in null_names))
+        .filter_by(**{name: bindparam(f"b_{name}") for name in names})
+        .execution_options(populate_existing=True)
+    )
+
+
+@lru_cache(maxsize=None)
+def _insert(model: Any) -> Any:
+    return insert(model).returning(model)
+
+
+@lru_cache(maxsize=None)
+def _update_by_id(model: Any) -> Any:
+    return (
+        update(model)
+        .where(model.id == bindparam("b_id"))
+        .returning(model)
+        .execution_options(synchronize_session=False)
+    )
+
+
+@lru_cache(maxsize=None)
+def _delete_by_id(model: Any) -> Any:
+    return (
+        delete(model)
+        .where(model.id == bindparam("b_id"))
+        .execution_options(synchronize_session=False)
+    )
 
 
 class BaseRepository:
@@ -11,33 +108,41 @@ class BaseRepository:
         self.session = session
 
     async def get_by_id(self, id: UUID) -> Any | None:
-        query = select(self.model).where(self.model.id == id)
-        result = await self.session.execute(query)
+        result = await self.session.execute(_select_by_id(self.model), {"b_id": id})
         return result.scalar_one_or_none()
 
     async def get_all(self, limit: int = 100, offset: int = 0) -> list[Any]:
-        query = select(self.model).limit(limit).offset(offset)
-        result = await self.session.execute(query)
+        result = await self.session.execute(
+            _select_page(self.model), {"b_limit": limit, "b_offset": offset}
+        )
         return cast(List[Any], result.scalars().all())
 
+    async def get_all_page(
+        self, limit: int = 100, cursor: str | None = None
+    ) -> tuple[list[Any], str | None]:
+        return await _pages_by_primary_key(self.model).fetch(  # type: ignore[no-any-return]
+            self.session, limit, cursor
+        )
+
     async def get_filtered_by(self, **filters: Any) -> list[Any]:
-        query = select(self.model).filter_by(**filters)
-        result = await self.session.execute(query)
+        values = {name: value for name, value in filters.items() if value is not None}
+        query = _select_filtered_by(
+            self.model,
+            tuple(sorted(values)),
+            tuple(sorted(name for name in filters if name not in values)),
+        )
+        result = await self.session.execute(
+            query, {f"b_{name}": value for name, value in values.items()}
+        )
         return cast(List[Any], result.scalars().all())
 
     async def add(self, instance: dict) -> None:
-        stmt = insert(self.model).values(**instance).returning(self.model)
-        await self.session.execute(stmt)
+        stmt, params = bind_values(_insert(self.model), instance)
+        await self.session.execute(stmt, params)
 
     async def update(self, id: UUID, updates: dict) -> None:
-        stmt = (
-            update(self.model)
-            .where(self.model.id == id)
-            .values(**updates)
-            .returning(self.model)
-        )
-        await self.session.execute(stmt)
+        stmt, params = bind_values(_update_by_id(self.model), updates)
+        await self.session.execute(stmt, {"b_id": id, **params})
 
     async def delete(self, id: UUID) -> None:
-        stmt = delete(self.model).where(self.model.id == id)
-        await self.session.execute(stmt)
+        await self.session.execute(_delete_by_id(self.model), {"b_id": id})
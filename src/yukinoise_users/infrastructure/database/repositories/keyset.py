@@ -0,0 +1,80 @@
+import base64
+import binascii
+import json
+from typing import Any, Callable, Sequence
+
+from sqlalchemy import bindparam, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class Keyset:
+    """Cursor pagination of ``query`` ordered by ``keys``.
+
+    The last key must be unique, normally the primary key, so the order is
+    total and a page resumes strictly after the row its cursor was taken
+    from however many rows were written since. Cursors are opaque tokens
+    carrying that row's key values and the keyset name, so one listing
+    cannot be resumed with another's cursor.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        query: Any,
+        keys: Sequence[Any],
+        row_key: Callable[[Any], Sequence[Any]],
+        descending: bool = True,
+    ) -> None:
+        self.name = name
+        self._row_key = row_key
+        self._python_types = [key.type.python_type for key in keys]
+        bounds = tuple_(
+            *(bindparam(f"b_after_{i}", type_=key.type) for i, key in enumerate(keys))
+        )
+        page = query.order_by(
+            *(key.desc() if descending else key.asc() for key in keys)
+        ).limit(bindparam("b_limit"))
+        self.first_page = page
+        self.next_page = page.where(
+            tuple_(*keys) < bounds if descending else tuple_(*keys) > bounds
+        )
+
+    async def fetch(
+        self,
+        session: AsyncSession,
+        limit: int,
+        cursor: str | None = None,
+        params: dict[str, Any] | None = None,
+    ) -> tuple[list[Any], str | None]:
+        """Return up to ``limit`` rows after ``cursor`` and the next cursor."""
+        if limit < 1:
+            raise ValueError("Page limit must be positive")
+        values = dict(params or {}, b_limit=limit + 1)
+        stmt = self.first_page
+        if cursor is not None:
+            stmt = self.next_page
+            for i, value in enumerate(self.decode(cursor)):
+                values[f"b_after_{i}"] = value
+        result = await session.execute(stmt, values)
+        rows = list(result.scalars().all())
+        if len(rows) <= limit:
+            return rows, None
+        del rows[limit:]
+        return rows, self.encode(self._row_key(rows[-1]))
+
+    def encode(self, key: Sequence[Any]) -> str:
+        payload = json.dumps([self.name, *key], default=str, separators=(",", ":"))
+        return base64.urlsafe_b64encode(payload.encode()).rstrip(b"=").decode()
+
+    def decode(self, cursor: str) -> list[Any]:
+        try:
+            payload = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+            name, *key = json.loads(payload)
+            if name != self.name or len(key) != len(self._python_types):
+                raise ValueError(cursor)
+            return [
+                value if isinstance(value, python_type) else python_type(value)
+                for python_type, value in zip(self._python_types, key)
+            ]
+        except (binascii.Error, UnicodeDecodeError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid cursor for {self.name}: {cursor!r}") from e
@@ -1,7 +1,23 @@
-from typing import Any
+from typing import Any, AsyncIterator
 from uuid import UUID
 
-from sqlalchemy import select, insert, update, delete, func
+from sqlalchemy import (
+    select,
+    insert,
+    update,
+    delete,
+    func,
+    or_,
+    any_,
+    tuple_,
+    column,
+    text,
+    bindparam,
+    Integer,
+    Text,
+    Uuid,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from yukinoise_users.infrastructure.database.models.outbox_event_model import (
@@ -12,6 +28,214 @@ from yukinoise_users.infrastructure.database.repositories.base_repo import (
     BaseRepository,
 )
 
+_now = func.extract("epoch", func.now())
+
+_due = or_(
+    OutboxEventORM.next_attempt_at.is_(None),
+    OutboxEventORM.next_attempt_at <= _now,
+)
+
+_released = {"locked_by": None, "locked_until": None, "updated_at": _now}
+
+_INSERT_EVENT = (
+    insert(OutboxEventORM)
+    .values(event_type=bindparam("b_event_type"), payload=bindparam("b_payload"))
+    .returning(OutboxEventORM)
+)
+
+_SELECT_PENDING = (
+    select(OutboxEventORM)
+    .where(OutboxEventORM.status == OutboxStatus.PENDING, _due)
+    .order_by(OutboxEventORM.created_at)
+    .limit(bindparam("b_limit"))
+    .execution_options(populate_existing=True)
+)
+
+_claimable = (
+    select(OutboxEventORM.id, OutboxEventORM.created_at)
+    .where(
+        OutboxEventORM.status == OutboxStatus.PENDING,
+        _due,
+        or_(
+            OutboxEventORM.locked_until.is_(None),
+            OutboxEventORM.locked_until < _now,
+        ),
+    )
+    .order_by(OutboxEventORM.created_at)
+    .limit(bindparam("b_limit"))
+    .with_for_update(skip_locked=True)
+)
+
+# Events are addressed by their whole primary key: with the partition key
+# in the predicate the claimed rows are looked up in their own partitions
+# instead of probing every day's.
+_CLAIM_PENDING = (
+    update(OutboxEventORM)
+    .where(tuple_(OutboxEventORM.id, OutboxEventORM.created_at).in_(_claimable))
+    .values(
+        locked_by=bindparam("b_worker_id"),
+        locked_until=_now + bindparam("b_lease_seconds"),
+    )
+    .returning(OutboxEventORM)
+    .execution_options(populate_existing=True, synchronize_session=False)
+)
+
+_by_key = (
+    OutboxEventORM.id == bindparam("b_id"),
+    OutboxEventORM.created_at == bindparam("b_created_at"),
+)
+
+_created_ats = bindparam("b_created_ats", type_=ARRAY(Integer))
+
+# the batch's keys bound as arrays; created_at = ANY(...) prunes partitions
+_by_keys = (
+    OutboxEventORM.id == any_(bindparam("b_ids", type_=ARRAY(Uuid))),
+    OutboxEventORM.created_at == any_(_created_ats),
+)
+
+_pending = OutboxEventORM.status == OutboxStatus.PENDING
+
+# once a lease expires the event can be claimed and settled by another
+# worker, so a worker only settles the events it still holds
+_held = OutboxEventORM.locked_by == bindparam("b_worker_id")
+
+_MARK_SENT = (
+    update(OutboxEventORM)
+    .where(*_by_key, _pending, _held)
+    .values(status=OutboxStatus.SENT, **_released)
+    .execution_options(synchronize_session=False)
+)
+
+_MARK_FAILED = (
+    update(OutboxEventORM)
+    .where(*_by_key, _pending, _held)
+    .values(status=OutboxStatus.FAILED, error=bindparam("b_error"), **_released)
+    .execution_options(synchronize_session=False)
+)
+
+_INCREMENT_RETRY_COUNT = (
+    update(OutboxEventORM)
+    .where(*_by_key, _pending, _held)
+    .values(retry_count=OutboxEventORM.retry_count + 1, **_released)
+    .execution_options(synchronize_session=False)
+)
+
+_MARK_MANY_SENT = (
+    update(OutboxEventORM)
+    .where(*_by_keys, _pending, _held)
+    .values(status=OutboxStatus.SENT, **_released)
+    .execution_options(synchronize_session=False)
+)
+
+# per-event values of the batch transitions, bound as parallel arrays and
+# joined in with unnest so one statement serves any batch size
+_errors = (
+    func.unnest(
+        bindparam("b_ids", type_=ARRAY(Uuid)),
+        _created_ats,
+        bindparam("b_errors", type_=ARRAY(Text)),
+    )
+    .table_valued(
+        column("id", Uuid), column("created_at", Integer), column("error", Text)
+    )
+    .render_derived(name="errors")
+)
+
+_MARK_MANY_FAILED = (
+    update(OutboxEventORM)
+    .where(
+        OutboxEventORM.id == _errors.c.id,
+        OutboxEventORM.created_at == _errors.c.created_at,
+        OutboxEventORM.created_at == any_(_created_ats),
+        _pending,
+        _held,
+    )
+    .values(status=OutboxStatus.FAILED, error=_errors.c.error, **_released)
+    .execution_options(synchronize_session=False)
+)
+
+_delays = (
+    func.unnest(
+        bindparam("b_ids", type_=ARRAY(Uuid)),
+        _created_ats,
+        bindparam("b_delays", type_=ARRAY(Integer)),
+    )
+    .table_valued(
+        column("id", Uuid), column("created_at", Integer), column("delay", Integer)
+    )
+    .render_derived(name="delays")
+)
+
+_SCHEDULE_RETRIES = (
+    update(OutboxEventORM)
+    .where(
+        OutboxEventORM.id == _delays.c.id,
+        OutboxEventORM.created_at == _delays.c.created_at,
+        OutboxEventORM.created_at == any_(_created_ats),
+        _pending,
+        _held,
+    )
+    .values(
+        retry_count=OutboxEventORM.retry_count + 1,
+        next_attempt_at=_now + _delays.c.delay,
+        **_released,
+    )
+    .execution_options(synchronize_session=False)
+)
+
+_DELETE_BY_KEY = (
+    delete(OutboxEventORM).where(*_by_key).execution_options(synchronize_session=False)
+)
+
+_DELETE_OLDER_THAN = (
+    delete(OutboxEventORM)
+    .where(OutboxEventORM.updated_at < bindparam("b_timestamp"))
+    .execution_options(synchronize_session=False)
+)
+
+_ENSURE_PARTITIONS = text("SELECT users.ensure_outbox_partitions(:days_ahead)")
+
+_DROP_PARTITIONS = text("SELECT users.drop_outbox_partitions(:cutoff)")
+
+_SELECT_PARTITION_DAYS = text(
+    """
+    SELECT day_start FROM (
+        SELECT EXTRACT(
+            epoch FROM to_date(substring(c.relname FROM 16), 'YYYYMMDD')::timestamp
+        )::integer AS day_start
+        FROM pg_inherits i
+        JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = 'users.outbox_events'::regclass
+          AND c.relname ~ '^outbox_events_p[0-9]{8}$'
+    ) AS partitions
+    WHERE day_start + 86400 <= :cutoff
+    ORDER BY day_start
+    """
+)
+
+_created_between = (
+    OutboxEventORM.created_at >= bindparam("b_start"),
+    OutboxEventORM.created_at < bindparam("b_end"),
+)
+
+_HAS_PENDING_BETWEEN = select(
+    select(OutboxEventORM.id)
+    .where(OutboxEventORM.status == OutboxStatus.PENDING, *_created_between)
+    .exists()
+)
+
+_SELECT_BETWEEN = (
+    select(OutboxEventORM)
+    .where(*_created_between)
+    .order_by(OutboxEventORM.created_at)
+    .execution_options(populate_existing=True)
+)
+
+_DROP_PARTITION = text(
+    "SELECT users.drop_outbox_partition("
+    "(to_timestamp(:day_start) AT TIME ZONE 'UTC')::date)"
+)
+
 
 class OutboxEventRepository(BaseRepository):
     def __init__(self, session: AsyncSession) -> None:
@@ -21,65 +245,159 @@ class OutboxEventRepository(BaseRepository):
     async def create_event(
         self, event_type: str, payload: dict[str, Any]
     ) -> OutboxEventORM:
-        stmt = (
-            insert(OutboxEventORM)
-            .values(event_type=event_type, payload=payload)
-            .returning(OutboxEventORM)
+        result = await self.session.execute(
+            _INSERT_EVENT, {"b_event_type": event_type, "b_payload": payload}
         )
-        result = await self.session.execute(stmt)
         return result.scalar_one()
 
-    async def get_pending_events(self, limit: int = 100) -> list[OutboxEventORM]:
-        query = (
-            select(OutboxEventORM)
-            .where(OutboxEventORM.status == OutboxStatus.PENDING)
-            .order_by(OutboxEventORM.created_at)
-            .limit(limit)
+    async def create_events(self, events: list[tuple[str, dict[str, Any]]]) -> None:
+        if not events:
+            return
+        # the row count varies, so this statement is built per call
+        stmt = insert(OutboxEventORM).values(
+            [
+                {"event_type": event_type, "payload": payload}
+                for event_type, payload in events
+            ]
         )
-        result = await self.session.execute(query)
+        await self.session.execute(stmt)
+
+    async def get_pending_events(self, limit: int = 100) -> list[OutboxEventORM]:
+        result = await self.session.execute(_SELECT_PENDING, {"b_limit": limit})
         return result.scalars().all()  # type: ignore[no-any-return]
 
-    async def mark_event_sent(self, event_id: UUID) -> None:
-        stmt = (
-            update(OutboxEventORM)
-            .where(OutboxEventORM.id == event_id)
-            .values(
-                status=OutboxStatus.SENT, updated_at=func.extract("epoch", func.now())
-            )
+    async def claim_pending_events(
+        self, worker_id: str, limit: int = 100, lease_seconds: int = 60
+    ) -> list[OutboxEventORM]:
+        result = await self.session.execute(
+            _CLAIM_PENDING,
+            {
+                "b_worker_id": worker_id,
+                "b_limit": limit,
+                "b_lease_seconds": lease_seconds,
+            },
         )
-        await self.session.execute(stmt)
+        events = list(result.scalars().all())
+        events.sort(key=lambda e: e.created_at)
+        return events
 
-    async def mark_event_failed(self, event_id: UUID, error: str) -> None:
-        stmt = (
-            update(OutboxEventORM)
-            .where(OutboxEventORM.id == event_id)
-            .values(
-                status=OutboxStatus.FAILED,
-                error=error,
-                updated_at=func.extract("epoch", func.now()),
-            )
+    async def mark_event_sent(
+        self, event_id: UUID, created_at: int, worker_id: str
+    ) -> None:
+        await self.session.execute(
+            _MARK_SENT,
+            {"b_id": event_id, "b_created_at": created_at, "b_worker_id": worker_id},
         )
-        await self.session.execute(stmt)
 
-    async def increment_retry_count(self, event_id: UUID) -> None:
-        stmt = (
-            update(OutboxEventORM)
-            .where(OutboxEventORM.id == event_id)
-            .values(
-                retry_count=OutboxEventORM.retry_count + 1,
-                updated_at=func.extract("epoch", func.now()),
-            )
+    async def mark_event_failed(
+        self, event_id: UUID, created_at: int, error: str, worker_id: str
+    ) -> None:
+        await self.session.execute(
+            _MARK_FAILED,
+            {
+                "b_id": event_id,
+                "b_created_at": created_at,
+                "b_error": error,
+                "b_worker_id": worker_id,
+            },
         )
-        await self.session.execute(stmt)
 
-    async def delete_event(self, event_id: UUID) -> None:
-        stmt = delete(OutboxEventORM).where(
-            OutboxEventORM.id == event_id,
+    async def increment_retry_count(
+        self, event_id: UUID, created_at: int, worker_id: str
+    ) -> None:
+        await self.session.execute(
+            _INCREMENT_RETRY_COUNT,
+            {"b_id": event_id, "b_created_at": created_at, "b_worker_id": worker_id},
+        )
+
+    async def mark_events_sent(
+        self, events: list[tuple[UUID, int]], worker_id: str
+    ) -> None:
+        if not events:
+            return
+        event_ids, created_ats = zip(*events)
+        await self.session.execute(
+            _MARK_MANY_SENT,
+            {
+                "b_ids": list(event_ids),
+                "b_created_ats": list(created_ats),
+                "b_worker_id": worker_id,
+            },
+        )
+
+    async def mark_events_failed(
+        self, errors: dict[tuple[UUID, int], str], worker_id: str
+    ) -> None:
+        if not errors:
+            return
+        await self.session.execute(
+            _MARK_MANY_FAILED,
+            {
+                "b_ids": [event_id for event_id, _ in errors],
+                "b_created_ats": [created_at for _, created_at in errors],
+                "b_errors": list(errors.values()),
+                "b_worker_id": worker_id,
+            },
+        )
+
+    async def schedule_retries(
+        self, delays: dict[tuple[UUID, int], int], worker_id: str
+    ) -> None:
+        if not delays:
+            return
+        await self.session.execute(
+            _SCHEDULE_RETRIES,
+            {
+                "b_ids": [event_id for event_id, _ in delays],
+                "b_created_ats": [created_at for _, created_at in delays],
+                "b_delays": list(delays.values()),
+                "b_worker_id": worker_id,
+            },
+        )
+
+    async def delete_event(self, event_id: UUID, created_at: int) -> None:
+        await self.session.execute(
+            _DELETE_BY_KEY, {"b_id": event_id, "b_created_at": created_at}
         )
-        await self.session.execute(stmt)
 
     async def delete_events_older_than(self, timestamp: int) -> None:
-        stmt = delete(OutboxEventORM).where(
-            OutboxEventORM.updated_at < timestamp,
+        await self.session.execute(_DELETE_OLDER_THAN, {"b_timestamp": timestamp})
+
+    async def ensure_partitions(self, days_ahead: int = 3) -> int:
+        result = await self.session.execute(
+            _ENSURE_PARTITIONS, {"days_ahead": days_ahead}
         )
-        await self.session.execute(stmt)
+        return result.scalar_one()  # type: ignore[no-any-return]
+
+    async def drop_partitions_older_than(self, timestamp: int) -> int:
+        result = await self.session.execute(_DROP_PARTITIONS, {"cutoff": timestamp})
+        return result.scalar_one()  # type: ignore[no-any-return]
+
+    async def get_partition_days_before(self, timestamp: int) -> list[int]:
+        """Start timestamps of the daily partitions ending at or before ``timestamp``."""
+        result = await self.session.execute(
+            _SELECT_PARTITION_DAYS, {"cutoff": timestamp}
+        )
+        return list(result.scalars().all())
+
+    async def has_pending_events_between(self, start: int, end: int) -> bool:
+        result = await self.session.execute(
+            _HAS_PENDING_BETWEEN, {"b_start": start, "b_end": end}
+        )
+        return bool(result.scalar())
+
+    async def stream_events_between(
+        self, start: int, end: int, batch_size: int = 1000
+    ) -> AsyncIterator[OutboxEventORM]:
+        """Yield events created in ``[start, end)`` through a server-side cursor."""
+        result = await self.session.stream(
+            _SELECT_BETWEEN,
+            {"b_start": start, "b_end": end},
+            execution_options={"yield_per": batch_size},
+        )
+        async for event in result.scalars():
+            yield event
+
+    async def drop_partition(self, day_start: int) -> bool:
+        result = await self.session.execute(_DROP_PARTITION, {"day_start": day_start})
+        return result.scalar_one()  # type: ignore[no-any-return]
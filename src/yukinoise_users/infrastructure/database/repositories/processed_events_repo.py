@@ -0,0 +1,62 @@
+from sqlalchemy import select, delete, bindparam
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from yukinoise_users.infrastructure.database.models.processed_event_model import (
+    ProcessedEventORM,
+)
+from yukinoise_users.infrastructure.database.repositories.base_repo import (
+    BaseRepository,
+)
+
+_MARK_PROCESSED = (
+    insert(ProcessedEventORM)
+    .values(
+        consumer=bindparam("b_consumer"),
+        event_id=bindparam("b_event_id"),
+        event_type=bindparam("b_event_type"),
+    )
+    .on_conflict_do_nothing(
+        index_elements=[ProcessedEventORM.consumer, ProcessedEventORM.event_id]
+    )
+    .returning(ProcessedEventORM.event_id)
+)
+
+_SELECT_EVENT_ID = select(ProcessedEventORM.event_id).where(
+    ProcessedEventORM.consumer == bindparam("b_consumer"),
+    ProcessedEventORM.event_id == bindparam("b_event_id"),
+)
+
+_DELETE_OLDER_THAN = (
+    delete(ProcessedEventORM)
+    .where(ProcessedEventORM.processed_at < bindparam("b_timestamp"))
+    .execution_options(synchronize_session=False)
+)
+
+
+class ProcessedEventsRepository(BaseRepository):
+    def __init__(self, session: AsyncSession) -> None:
+        super().__init__(session)
+        self.model = ProcessedEventORM
+
+    async def mark_processed(
+        self, consumer: str, event_id: str, event_type: str
+    ) -> bool:
+        result = await self.session.execute(
+            _MARK_PROCESSED,
+            {
+                "b_consumer": consumer,
+                "b_event_id": event_id,
+                "b_event_type": event_type,
+            },
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def exists(self, consumer: str, event_id: str) -> bool:
+        result = await self.session.execute(
+            _SELECT_EVENT_ID, {"b_consumer": consumer, "b_event_id": event_id}
+        )
+        return result.scalar_one_or_none() is not None
+
+    async def delete_older_than(self, timestamp: int) -> None:
+        await self.session.execute(_DELETE_OLDER_THAN, {"b_timestamp": timestamp})
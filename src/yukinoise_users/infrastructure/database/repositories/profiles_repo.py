@@ -1,174 +1,356 @@
+import random
 from typing import Any, Sequence
 from uuid import UUID
 
-from sqlalchemy import select, update, insert, func
-from sqlalchemy.ext.asyncio import AsyncSession
-
-from typing import Any, Sequence
-from uuid import UUID
-
-from sqlalchemy import select, update, insert, func
+from sqlalchemy import (
+    select,
+    update,
+    insert,
+    delete,
+    func,
+    values,
+    column,
+    literal_column,
+    bindparam,
+    Integer,
+    Uuid,
+)
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from yukinoise_users.infrastructure.database.models.profiles_model import ProfileORM
+from yukinoise_users.infrastructure.database.models.profile_counter_shard_model import (
+    ProfileCounterShardORM,
+)
 from yukinoise_users.infrastructure.database.repositories.base_repo import (
     BaseRepository,
+    bind_values,
 )
+from yukinoise_users.infrastructure.database.repositories.keyset import Keyset
+
+
+COUNTER_FIELDS = (
+    "followers_count",
+    "following_count",
+    "releases_count",
+    "featured_in_releases_count",
+)
+
+_not_deleted = ProfileORM.deleted_at.is_(None)
+
+_INSERT = insert(ProfileORM).returning(ProfileORM)
+
+_SELECT_BY_USER_ID = (
+    select(ProfileORM)
+    .where(ProfileORM.user_id == bindparam("b_user_id"), _not_deleted)
+    .execution_options(populate_existing=True)
+)
+
+_SELECT_BY_USER_IDS = (
+    select(ProfileORM)
+    .where(
+        ProfileORM.user_id.in_(bindparam("b_user_ids", expanding=True)),
+        _not_deleted,
+    )
+    .execution_options(populate_existing=True)
+)
+
+_SELECT_BY_DISPLAY_NAME = (
+    select(ProfileORM)
+    .where(ProfileORM.display_name == bindparam("b_display_name"), _not_deleted)
+    .execution_options(populate_existing=True)
+)
+
+_SELECT_BY_DISPLAY_NAME_ILIKE = (
+    select(ProfileORM)
+    .where(ProfileORM.display_name.ilike(bindparam("b_pattern")), _not_deleted)
+    .limit(bindparam("b_limit"))
+    .execution_options(populate_existing=True)
+)
+
+_COUNT_BY_DISPLAY_NAME = (
+    select(func.count())
+    .select_from(ProfileORM)
+    .where(ProfileORM.display_name == bindparam("b_display_name"), _not_deleted)
+)
+
+_SEARCH_FULLTEXT = (
+    select(ProfileORM)
+    .where(ProfileORM.search_vector.match(bindparam("b_query")), _not_deleted)
+    .limit(bindparam("b_limit"))
+    .execution_options(populate_existing=True)
+)
+
+_SELECT_BY_GENRES = (
+    select(ProfileORM)
+    .where(ProfileORM.preferred_genres.overlap(bindparam("b_genres")), _not_deleted)
+    .limit(bindparam("b_limit"))
+    .execution_options(populate_existing=True)
+)
+
+_SELECT_BY_TAGS = (
+    select(ProfileORM)
+    .where(ProfileORM.tags.overlap(bindparam("b_tags")), _not_deleted)
+    .limit(bindparam("b_limit"))
+    .execution_options(populate_existing=True)
+)
+
+_SELECT_VERIFIED = (
+    select(ProfileORM)
+    .where(ProfileORM.verified.is_(True), _not_deleted)
+    .order_by(ProfileORM.followers_count.desc())
+    .limit(bindparam("b_limit"))
+    .offset(bindparam("b_offset"))
+    .execution_options(populate_existing=True)
+)
+
+_SELECT_TOP_BY_MONTHLY_LISTENERS = (
+    select(ProfileORM)
+    .where(_not_deleted)
+    .order_by(ProfileORM.monthly_listeners.desc().nullslast())
+    .limit(bindparam("b_limit"))
+    .offset(bindparam("b_offset"))
+    .execution_options(populate_existing=True)
+)
+
+_SELECT_TOP_BY_FOLLOWERS = (
+    select(ProfileORM)
+    .where(_not_deleted)
+    .order_by(ProfileORM.followers_count.desc())
+    .limit(bindparam("b_limit"))
+    .offset(bindparam("b_offset"))
+    .execution_options(populate_existing=True)
+)
+
+# Cursor pages of the listings above, tie-broken on user_id. Profiles
+# without a listener count sort last as -1, like nullslast does; it is
+# inlined rather than bound so the expression index matches.
+_monthly_listeners_key = func.coalesce(
+    ProfileORM.monthly_listeners, literal_column("-1", Integer)
+)
+
+_VERIFIED_PAGES = Keyset(
+    "profiles_verified",
+    select(ProfileORM)
+    .where(ProfileORM.verified.is_(True), _not_deleted)
+    .execution_options(populate_existing=True),
+    [ProfileORM.followers_count, ProfileORM.user_id],
+    lambda p: [p.followers_count, p.user_id],
+)
+
+_TOP_BY_MONTHLY_LISTENERS_PAGES = Keyset(
+    "profiles_top_by_monthly_listeners",
+    select(ProfileORM).where(_not_deleted).execution_options(populate_existing=True),
+    [_monthly_listeners_key, ProfileORM.user_id],
+    lambda p: [-1 if p.monthly_listeners is None else p.monthly_listeners, p.user_id],
+)
+
+_TOP_BY_FOLLOWERS_PAGES = Keyset(
+    "profiles_top_by_followers",
+    select(ProfileORM).where(_not_deleted).execution_options(populate_existing=True),
+    [ProfileORM.followers_count, ProfileORM.user_id],
+    lambda p: [p.followers_count, p.user_id],
+)
+
+_UPDATE_BY_USER_ID = (
+    update(ProfileORM)
+    .where(ProfileORM.user_id == bindparam("b_user_id"))
+    .execution_options(synchronize_session=False)
+)
+
+_ADD_TO_COUNTER = {
+    name: _UPDATE_BY_USER_ID.values(
+        {name: getattr(ProfileORM, name) + bindparam("b_delta")}
+    )
+    for name in COUNTER_FIELDS
+}
+
+_SET_DELETED_AT = _UPDATE_BY_USER_ID.values(deleted_at=bindparam("b_deleted_at"))
+
+
+def _build_compact_counter_shards() -> Any:
+    batch = (
+        select(ProfileCounterShardORM.user_id)
+        .distinct()
+        .order_by(ProfileCounterShardORM.user_id)
+        .limit(bindparam("b_limit"))
+    )
+    moved = (
+        delete(ProfileCounterShardORM)
+        .where(ProfileCounterShardORM.user_id.in_(batch.scalar_subquery()))
+        .returning(
+            ProfileCounterShardORM.user_id,
+            *(getattr(ProfileCounterShardORM, name) for name in COUNTER_FIELDS),
+        )
+        .cte("moved")
+    )
+    totals = (
+        select(
+            moved.c.user_id,
+            *(func.sum(moved.c[name]).label(name) for name in COUNTER_FIELDS),
+        )
+        .group_by(moved.c.user_id)
+        .cte("totals")
+    )
+    return (
+        update(ProfileORM)
+        .where(ProfileORM.user_id == totals.c.user_id)
+        .values(
+            {
+                name: getattr(ProfileORM, name) + totals.c[name]
+                for name in COUNTER_FIELDS
+            }
+        )
+        .execution_options(synchronize_session=False)
+    )
+
+
+def _build_select_exact_counters() -> Any:
+    shard_totals = (
+        select(
+            ProfileCounterShardORM.user_id,
+            *(
+                func.sum(getattr(ProfileCounterShardORM, name)).label(name)
+                for name in COUNTER_FIELDS
+            ),
+        )
+        .where(ProfileCounterShardORM.user_id == bindparam("b_user_id"))
+        .group_by(ProfileCounterShardORM.user_id)
+        .subquery()
+    )
+    return (
+        select(
+            *(
+                (
+                    getattr(ProfileORM, name) + func.coalesce(shard_totals.c[name], 0)
+                ).label(name)
+                for name in COUNTER_FIELDS
+            )
+        )
+        .outerjoin(shard_totals, shard_totals.c.user_id == ProfileORM.user_id)
+        .where(ProfileORM.user_id == bindparam("b_user_id"), _not_deleted)
+    )
+
+
+_COMPACT_COUNTER_SHARDS = _build_compact_counter_shards()
+
+_SELECT_EXACT_COUNTERS = _build_select_exact_counters()
 
 
 class ProfilesRepository(BaseRepository):
-    def __init__(self, session: AsyncSession) -> None:
+    def __init__(self, session: AsyncSession, counter_shards: int = 0) -> None:
         super().__init__(session)
         self.model = ProfileORM
+        # with shards, counter writes go to one of N rows per profile instead
+        # of the hot profile row and are folded in by compact_counter_shards.
+        # Until then every other read sees the profile row's counters alone,
+        # so they lag by the uncompacted deltas; get_exact_counters adds them
+        self.counter_shards = counter_shards
 
     async def create(self, user_id: UUID, **profile_data: Any) -> ProfileORM:
-        stmt = (
-            insert(ProfileORM)
-            .values(user_id=user_id, **profile_data)
-            .returning(ProfileORM)
-        )
-        result = await self.session.execute(stmt)
+        stmt, params = bind_values(_INSERT, {"user_id": user_id, **profile_data})
+        result = await self.session.execute(stmt, params)
         return result.scalar_one()
 
     async def get_by_user_id(self, user_id: UUID) -> ProfileORM | None:
-        query = select(ProfileORM).where(
-            ProfileORM.user_id == user_id,
-            ProfileORM.deleted_at.is_(None),
-        )
-        result = await self.session.execute(query)
+        result = await self.session.execute(_SELECT_BY_USER_ID, {"b_user_id": user_id})
         return result.scalar_one_or_none()
 
     async def get_by_user_ids(self, user_ids: list[UUID]) -> Sequence[ProfileORM]:
         if not user_ids:
             return []
-        query = select(ProfileORM).where(
-            ProfileORM.user_id.in_(user_ids),
-            ProfileORM.deleted_at.is_(None),
+        result = await self.session.execute(
+            _SELECT_BY_USER_IDS, {"b_user_ids": user_ids}
         )
-        result = await self.session.execute(query)
         return result.scalars().all()  # type: ignore[no-any-return]
 
     async def get_by_display_name(self, display_name: str) -> ProfileORM | None:
-        query = select(ProfileORM).where(
-            ProfileORM.display_name == display_name,
-            ProfileORM.deleted_at.is_(None),
+        result = await self.session.execute(
+            _SELECT_BY_DISPLAY_NAME, {"b_display_name": display_name}
         )
-        result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
     async def get_by_display_name_ilike(
         self, pattern: str, limit: int = 100
     ) -> Sequence[ProfileORM]:
-        query = (
-            select(ProfileORM)
-            .where(
-                ProfileORM.display_name.ilike(f"%{pattern}%"),
-                ProfileORM.deleted_at.is_(None),
-            )
-            .limit(limit)
+        result = await self.session.execute(
+            _SELECT_BY_DISPLAY_NAME_ILIKE,
+            {"b_pattern": f"%{pattern}%", "b_limit": limit},
         )
-        result = await self.session.execute(query)
         return result.scalars().all()  # type: ignore[no-any-return]
 
     async def exists_display_name(self, display_name: str) -> bool:
-        query = (
-            select(func.count())
-            .select_from(ProfileORM)
-            .where(
-                ProfileORM.display_name == display_name,
-                ProfileORM.deleted_at.is_(None),
-            )
+        result = await self.session.execute(
+            _COUNT_BY_DISPLAY_NAME, {"b_display_name": display_name}
         )
-        result = await self.session.execute(query)
         return (result.scalar() or 0) > 0
 
     async def search_fulltext(
         self, query_text: str, limit: int = 100
     ) -> Sequence[ProfileORM]:
-        query = (
-            select(ProfileORM)
-            .where(
-                ProfileORM.search_vector.match(query_text),
-                ProfileORM.deleted_at.is_(None),
-            )
-            .limit(limit)
+        result = await self.session.execute(
+            _SEARCH_FULLTEXT, {"b_query": query_text, "b_limit": limit}
         )
-        result = await self.session.execute(query)
         return result.scalars().all()  # type: ignore[no-any-return]
 
     async def get_by_genres(
         self, genres: list[str], limit: int = 100
     ) -> Sequence[ProfileORM]:
-        query = (
-            select(ProfileORM)
-            .where(
-                ProfileORM.preferred_genres.overlap(genres),
-                ProfileORM.deleted_at.is_(None),
-            )
-            .limit(limit)
+        result = await self.session.execute(
+            _SELECT_BY_GENRES, {"b_genres": genres, "b_limit": limit}
         )
-        result = await self.session.execute(query)
         return result.scalars().all()  # type: ignore[no-any-return]
 
     async def get_by_tags(
         self, tags: list[str], limit: int = 100
     ) -> Sequence[ProfileORM]:
-        query = (
-            select(ProfileORM)
-            .where(
-                ProfileORM.tags.overlap(tags),
-                ProfileORM.deleted_at.is_(None),
-            )
-            .limit(limit)
+        result = await self.session.execute(
+            _SELECT_BY_TAGS, {"b_tags": tags, "b_limit": limit}
         )
-        result = await self.session.execute(query)
         return result.scalars().all()  # type: ignore[no-any-return]
 
     async def get_verified(
         self, limit: int = 100, offset: int = 0
     ) -> Sequence[ProfileORM]:
-        query = (
-            select(ProfileORM)
-            .where(
-                ProfileORM.verified.is_(True),
-                ProfileORM.deleted_at.is_(None),
-            )
-            .order_by(ProfileORM.followers_count.desc())
-            .limit(limit)
-            .offset(offset)
+        result = await self.session.execute(
+            _SELECT_VERIFIED, {"b_limit": limit, "b_offset": offset}
         )
-        result = await self.session.execute(query)
         return result.scalars().all()  # type: ignore[no-any-return]
 
     async def get_top_by_monthly_listeners(
         self, limit: int = 100, offset: int = 0
     ) -> Sequence[ProfileORM]:
-        query = (
-            select(ProfileORM)
-            .where(ProfileORM.deleted_at.is_(None))
-            .order_by(ProfileORM.monthly_listeners.desc().nullslast())
-            .limit(limit)
-            .offset(offset)
+        result = await self.session.execute(
+            _SELECT_TOP_BY_MONTHLY_LISTENERS, {"b_limit": limit, "b_offset": offset}
         )
-        result = await self.session.execute(query)
         return result.scalars().all()  # type: ignore[no-any-return]
 
     async def get_top_by_followers(
         self, limit: int = 100, offset: int = 0
     ) -> Sequence[ProfileORM]:
-        query = (
-            select(ProfileORM)
-            .where(ProfileORM.deleted_at.is_(None))
-            .order_by(ProfileORM.followers_count.desc())
-            .limit(limit)
-            .offset(offset)
+        result = await self.session.execute(
+            _SELECT_TOP_BY_FOLLOWERS, {"b_limit": limit, "b_offset": offset}
         )
-        result = await self.session.execute(query)
         return result.scalars().all()  # type: ignore[no-any-return]
 
+    async def get_verified_page(
+        self, limit: int = 100, cursor: str | None = None
+    ) -> tuple[list[ProfileORM], str | None]:
+        return await _VERIFIED_PAGES.fetch(self.session, limit, cursor)  # type: ignore[no-any-return]
+
+    async def get_top_by_monthly_listeners_page(
+        self, limit: int = 100, cursor: str | None = None
+    ) -> tuple[list[ProfileORM], str | None]:
+        return await _TOP_BY_MONTHLY_LISTENERS_PAGES.fetch(self.session, limit, cursor)  # type: ignore[no-any-return]
+
+    async def get_top_by_followers_page(
+        self, limit: int = 100, cursor: str | None = None
+    ) -> tuple[list[ProfileORM], str | None]:
+        return await _TOP_BY_FOLLOWERS_PAGES.fetch(self.session, limit, cursor)  # type: ignore[no-any-return]
+
     async def update_profile(self, user_id: UUID, **updates: Any) -> None:
-        stmt = update(ProfileORM).where(ProfileORM.user_id == user_id).values(**updates)
-        await self.session.execute(stmt)
+        stmt, params = bind_values(_UPDATE_BY_USER_ID, updates)
+        await self.session.execute(stmt, {"b_user_id": user_id, **params})
 
     async def update_avatar(self, user_id: UUID, avatar_url: str | None) -> None:
         await self.update_profile(user_id, avatar_url=avatar_url)
@@ -177,73 +359,132 @@ class ProfilesRepository(BaseRepository):
         await self.update_profile(user_id, banner_url=banner_url)
 
     async def increment_followers(self, user_id: UUID) -> None:
-        stmt = (
-            update(ProfileORM)
-            .where(ProfileORM.user_id == user_id)
-            .values(followers_count=ProfileORM.followers_count + 1)
-        )
-        await self.session.execute(stmt)
+        await self._add_to_counter(user_id, "followers_count", 1)
 
     async def decrement_followers(self, user_id: UUID) -> None:
-        stmt = (
-            update(ProfileORM)
-            .where(ProfileORM.user_id == user_id)
-            .values(followers_count=ProfileORM.followers_count - 1)
-        )
-        await self.session.execute(stmt)
+        await self._add_to_counter(user_id, "followers_count", -1)
 
     async def increment_following(self, user_id: UUID) -> None:
-        stmt = (
-            update(ProfileORM)
-            .where(ProfileORM.user_id == user_id)
-            .values(following_count=ProfileORM.following_count + 1)
-        )
-        await self.session.execute(stmt)
+        await self._add_to_counter(user_id, "following_count", 1)
 
     async def decrement_following(self, user_id: UUID) -> None:
-        stmt = (
-            update(ProfileORM)
-            .where(ProfileORM.user_id == user_id)
-            .values(following_count=ProfileORM.following_count - 1)
-        )
-        await self.session.execute(stmt)
+        await self._add_to_counter(user_id, "following_count", -1)
 
     async def increment_releases(self, user_id: UUID) -> None:
-        stmt = (
-            update(ProfileORM)
-            .where(ProfileORM.user_id == user_id)
-            .values(releases_count=ProfileORM.releases_count + 1)
-        )
-        await self.session.execute(stmt)
+        await self._add_to_counter(user_id, "releases_count", 1)
 
     async def decrement_releases(self, user_id: UUID) -> None:
-        stmt = (
-            update(ProfileORM)
-            .where(ProfileORM.user_id == user_id)
-            .values(releases_count=ProfileORM.releases_count - 1)
-        )
-        await self.session.execute(stmt)
+        await self._add_to_counter(user_id, "releases_count", -1)
 
     async def increment_featured_in_releases(self, user_id: UUID) -> None:
+        await self._add_to_counter(user_id, "featured_in_releases_count", 1)
+
+    async def decrement_featured_in_releases(self, user_id: UUID) -> None:
+        await self._add_to_counter(user_id, "featured_in_releases_count", -1)
+
+    async def apply_counter_deltas(self, deltas: dict[UUID, dict[str, int]]) -> None:
+        """Apply many counter deltas with one ``UPDATE ... FROM (VALUES ...)``.
+
+        ``deltas`` maps a user id to per-counter deltas, keyed by counter
+        column name.
+        """
+        if not deltas:
+            return
+
+        unknown = {name for counters in deltas.values() for name in counters}
+        unknown.difference_update(COUNTER_FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown profile counters: {sorted(unknown)}")
+
+        if self.counter_shards > 0:
+            await self._add_to_counter_shards(deltas)
+            return
+
+        # a stable row order makes concurrent flushes lock profiles in the
+        # same order instead of deadlocking
+        rows = [
+            (user_id, *(deltas[user_id].get(name, 0) for name in COUNTER_FIELDS))
+            for user_id in sorted(deltas)
+        ]
+        delta_values = values(
+            column("user_id", Uuid),
+            *(column(name, Integer) for name in COUNTER_FIELDS),
+            name="deltas",
+        ).data(rows)
         stmt = (
             update(ProfileORM)
-            .where(ProfileORM.user_id == user_id)
+            .where(ProfileORM.user_id == delta_values.c.user_id)
             .values(
-                featured_in_releases_count=ProfileORM.featured_in_releases_count + 1
+                {
+                    name: getattr(ProfileORM, name) + delta_values.c[name]
+                    for name in COUNTER_FIELDS
+                }
             )
         )
         await self.session.execute(stmt)
 
-    async def decrement_featured_in_releases(self, user_id: UUID) -> None:
-        stmt = (
-            update(ProfileORM)
-            .where(ProfileORM.user_id == user_id)
-            .values(
-                featured_in_releases_count=ProfileORM.featured_in_releases_count - 1
+    async def _add_to_counter(self, user_id: UUID, name: str, delta: int) -> None:
+        if self.counter_shards > 0:
+            await self._add_to_counter_shards({user_id: {name: delta}})
+            return
+
+        await self.session.execute(
+            _ADD_TO_COUNTER[name], {"b_user_id": user_id, "b_delta": delta}
+        )
+
+    async def _add_to_counter_shards(self, deltas: dict[UUID, dict[str, int]]) -> None:
+        rows = [
+            (
+                user_id,
+                random.randrange(self.counter_shards),
+                *(deltas[user_id].get(name, 0) for name in COUNTER_FIELDS),
             )
+            for user_id in sorted(deltas)
+        ]
+        delta_values = values(
+            column("user_id", Uuid),
+            column("shard", Integer),
+            *(column(name, Integer) for name in COUNTER_FIELDS),
+            name="deltas",
+        ).data(rows)
+        # deltas of missing profiles are dropped, like direct updates would be
+        source = select(delta_values).join(
+            ProfileORM, ProfileORM.user_id == delta_values.c.user_id
+        )
+        stmt = pg_insert(ProfileCounterShardORM).from_select(
+            ["user_id", "shard", *COUNTER_FIELDS], source
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["user_id", "shard"],
+            set_={
+                name: getattr(ProfileCounterShardORM, name) + stmt.excluded[name]
+                for name in COUNTER_FIELDS
+            },
         )
         await self.session.execute(stmt)
 
+    async def compact_counter_shards(self, limit: int = 1000) -> int:
+        """Fold the shard rows of up to ``limit`` profiles into ``ProfileORM``.
+
+        Deleting the shards and updating the profiles is one statement, so a
+        delta is never counted twice or lost. Returns the number of profiles
+        updated.
+        """
+        result = await self.session.execute(_COMPACT_COUNTER_SHARDS, {"b_limit": limit})
+        return result.rowcount  # type: ignore[no-any-return]
+
+    async def get_exact_counters(self, user_id: UUID) -> dict[str, int] | None:
+        """Profile counters including deltas not yet compacted from shards.
+
+        With counter shards this is the only read whose counters are current,
+        at the cost of summing the profile's shard rows.
+        """
+        result = await self.session.execute(
+            _SELECT_EXACT_COUNTERS, {"b_user_id": user_id}
+        )
+        row = result.one_or_none()
+        return None if row is None else {k: int(v) for k, v in row._mapping.items()}
+
     async def set_verified(self, user_id: UUID, verified: bool) -> None:
         await self.update_profile(user_id, verified=verified)
 
@@ -251,17 +492,11 @@ class ProfilesRepository(BaseRepository):
         await self.update_profile(user_id, monthly_listeners=count)
 
     async def soft_delete(self, user_id: UUID, timestamp: int) -> None:
-        stmt = (
-            update(ProfileORM)
-            .where(ProfileORM.user_id == user_id)
-            .values(deleted_at=timestamp)
+        await self.session.execute(
+            _SET_DELETED_AT, {"b_user_id": user_id, "b_deleted_at": timestamp}
         )
-        await self.session.execute(stmt)
 
     async def restore(self, user_id: UUID) -> None:
-        stmt = (
-            update(ProfileORM)
-            .where(ProfileORM.user_id == user_id)
-            .values(deleted_at=None)
+        await self.session.execute(
+            _SET_DELETED_AT, {"b_user_id": user_id, "b_deleted_at": None}
         )
-        await self.session.execute(stmt)
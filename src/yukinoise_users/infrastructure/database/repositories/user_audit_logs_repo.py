@@ -1,7 +1,7 @@
 from typing import Sequence
 from uuid import UUID
 
-from sqlalchemy import select, insert
+from sqlalchemy import select, insert, bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from yukinoise_users.infrastructure.database.models.user_audit_logs_model import (
@@ -12,6 +12,84 @@ from yukinoise_users.infrastructure.database.models.user_audit_logs_model import
 from yukinoise_users.infrastructure.database.repositories.base_repo import (
     BaseRepository,
 )
+from yukinoise_users.infrastructure.database.repositories.keyset import Keyset
+
+_INSERT = (
+    insert(UserAuditLogORM)
+    .values(
+        user_id=bindparam("b_user_id"),
+        action=bindparam("b_action"),
+        changed_by=bindparam("b_changed_by"),
+        details=bindparam("b_details"),
+    )
+    .returning(UserAuditLogORM)
+)
+
+_newest_first = UserAuditLogORM.timestamp.desc()
+
+_SELECT_FOR_USER = (
+    select(UserAuditLogORM)
+    .where(UserAuditLogORM.user_id == bindparam("b_user_id"))
+    .order_by(_newest_first)
+    .limit(bindparam("b_limit"))
+    .execution_options(populate_existing=True)
+)
+
+_SELECT_BY_ACTION = (
+    select(UserAuditLogORM)
+    .where(UserAuditLogORM.action == bindparam("b_action"))
+    .order_by(_newest_first)
+    .limit(bindparam("b_limit"))
+    .offset(bindparam("b_offset"))
+    .execution_options(populate_existing=True)
+)
+
+_SELECT_BY_CHANGED_BY = (
+    select(UserAuditLogORM)
+    .where(UserAuditLogORM.changed_by == bindparam("b_changed_by"))
+    .order_by(_newest_first)
+    .limit(bindparam("b_limit"))
+    .offset(bindparam("b_offset"))
+    .execution_options(populate_existing=True)
+)
+
+# newest first as above, tie-broken on the id for rows logged the same second
+_BY_ACTION_PAGES = Keyset(
+    "audit_logs_by_action",
+    select(UserAuditLogORM)
+    .where(UserAuditLogORM.action == bindparam("b_action"))
+    .execution_options(populate_existing=True),
+    [UserAuditLogORM.timestamp, UserAuditLogORM.id],
+    lambda log: [log.timestamp, log.id],
+)
+
+_BY_CHANGED_BY_PAGES = Keyset(
+    "audit_logs_by_changed_by",
+    select(UserAuditLogORM)
+    .where(UserAuditLogORM.changed_by == bindparam("b_changed_by"))
+    .execution_options(populate_existing=True),
+    [UserAuditLogORM.timestamp, UserAuditLogORM.id],
+    lambda log: [log.timestamp, log.id],
+)
+
+_SELECT_SINCE = (
+    select(UserAuditLogORM)
+    .where(UserAuditLogORM.timestamp >= bindparam("b_since"))
+    .order_by(_newest_first)
+    .limit(bindparam("b_limit"))
+    .execution_options(populate_existing=True)
+)
+
+_SELECT_USER_LOGINS = (
+    select(UserAuditLogORM)
+    .where(
+        UserAuditLogORM.user_id == bindparam("b_user_id"),
+        UserAuditLogORM.action == UserAuditAction.LOGIN,
+    )
+    .order_by(_newest_first)
+    .limit(bindparam("b_limit"))
+    .execution_options(populate_existing=True)
+)
 
 
 class UserAuditLogsRepository(BaseRepository):
@@ -26,17 +104,15 @@ class UserAuditLogsRepository(BaseRepository):
         changed_by: UserChangedBy,
         details: dict[str, str] | None = None,
     ) -> UserAuditLogORM:
-        stmt = (
-            insert(UserAuditLogORM)
-            .values(
-                user_id=user_id,
-                action=action,
-                changed_by=changed_by,
-                details=details,
-            )
-            .returning(UserAuditLogORM)
+        result = await self.session.execute(
+            _INSERT,
+            {
+                "b_user_id": user_id,
+                "b_action": action,
+                "b_changed_by": changed_by,
+                "b_details": details,
+            },
         )
-        result = await self.session.execute(stmt)
         return result.scalar_one()
 
     async def list_for_user(
@@ -44,13 +120,9 @@ class UserAuditLogsRepository(BaseRepository):
         user_id: UUID,
         limit: int = 100,
     ) -> Sequence[UserAuditLogORM]:
-        query = (
-            select(UserAuditLogORM)
-            .where(UserAuditLogORM.user_id == user_id)
-            .order_by(UserAuditLogORM.timestamp.desc())
-            .limit(limit)
+        result = await self.session.execute(
+            _SELECT_FOR_USER, {"b_user_id": user_id, "b_limit": limit}
         )
-        result = await self.session.execute(query)
         return result.scalars().all()  # type: ignore[no-any-return]
 
     async def list_by_action(
@@ -59,14 +131,10 @@ class UserAuditLogsRepository(BaseRepository):
         limit: int = 100,
         offset: int = 0,
     ) -> Sequence[UserAuditLogORM]:
-        query = (
-            select(UserAuditLogORM)
-            .where(UserAuditLogORM.action == action)
-            .order_by(UserAuditLogORM.timestamp.desc())
-            .limit(limit)
-            .offset(offset)
+        result = await self.session.execute(
+            _SELECT_BY_ACTION,
+            {"b_action": action, "b_limit": limit, "b_offset": offset},
         )
-        result = await self.session.execute(query)
         return result.scalars().all()  # type: ignore[no-any-return]
 
     async def list_by_changed_by(
@@ -75,28 +143,40 @@ class UserAuditLogsRepository(BaseRepository):
         limit: int = 100,
         offset: int = 0,
     ) -> Sequence[UserAuditLogORM]:
-        query = (
-            select(UserAuditLogORM)
-            .where(UserAuditLogORM.changed_by == changed_by)
-            .order_by(UserAuditLogORM.timestamp.desc())
-            .limit(limit)
-            .offset(offset)
+        result = await self.session.execute(
+            _SELECT_BY_CHANGED_BY,
+            {"b_changed_by": changed_by, "b_limit": limit, "b_offset": offset},
         )
-        result = await self.session.execute(query)
         return result.scalars().all()  # type: ignore[no-any-return]
 
+    async def list_by_action_page(
+        self,
+        action: UserAuditAction,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> tuple[list[UserAuditLogORM], str | None]:
+        return await _BY_ACTION_PAGES.fetch(  # type: ignore[no-any-return]
+            self.session, limit, cursor, {"b_action": action}
+        )
+
+    async def list_by_changed_by_page(
+        self,
+        changed_by: UserChangedBy,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> tuple[list[UserAuditLogORM], str | None]:
+        return await _BY_CHANGED_BY_PAGES.fetch(  # type: ignore[no-any-return]
+            self.session, limit, cursor, {"b_changed_by": changed_by}
+        )
+
     async def list_since(
         self,
         since_timestamp: int,
         limit: int = 100,
     ) -> Sequence[UserAuditLogORM]:
-        query = (
-            select(UserAuditLogORM)
-            .where(UserAuditLogORM.timestamp >= since_timestamp)
-            .order_by(UserAuditLogORM.timestamp.desc())
-            .limit(limit)
+        result = await self.session.execute(
+            _SELECT_SINCE, {"b_since": since_timestamp, "b_limit": limit}
         )
-        result = await self.session.execute(query)
         return result.scalars().all()  # type: ignore[no-any-return]
 
     async def get_user_logins(
@@ -104,14 +184,7 @@ class UserAuditLogsRepository(BaseRepository):
         user_id: UUID,
         limit: int = 100,
     ) -> Sequence[UserAuditLogORM]:
-        query = (
-            select(UserAuditLogORM)
-            .where(
-                UserAuditLogORM.user_id == user_id,
-                UserAuditLogORM.action == UserAuditAction.LOGIN,
-            )
-            .order_by(UserAuditLogORM.timestamp.desc())
-            .limit(limit)
+        result = await self.session.execute(
+            _SELECT_USER_LOGINS, {"b_user_id": user_id, "b_limit": limit}
         )
-        result = await self.session.execute(query)
         return result.scalars().all()  # type: ignore[no-any-return]
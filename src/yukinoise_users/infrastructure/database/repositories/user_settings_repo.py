@@ -1,7 +1,7 @@
 from typing import Any, Sequence
 from uuid import UUID
 
-from sqlalchemy import select, update, insert, func
+from sqlalchemy import select, update, insert, func, bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from yukinoise_users.infrastructure.database.models.user_settings_model import (
@@ -10,6 +10,71 @@ from yukinoise_users.infrastructure.database.models.user_settings_model import (
 )
 from yukinoise_users.infrastructure.database.repositories.base_repo import (
     BaseRepository,
+    bind_values,
+)
+from yukinoise_users.infrastructure.database.repositories.keyset import Keyset
+
+_INSERT = insert(UserSettingsORM).returning(UserSettingsORM)
+
+_SELECT_BY_USER_ID = (
+    select(UserSettingsORM)
+    .where(UserSettingsORM.user_id == bindparam("b_user_id"))
+    .execution_options(populate_existing=True)
+)
+
+_SELECT_BY_USER_IDS = (
+    select(UserSettingsORM)
+    .where(UserSettingsORM.user_id.in_(bindparam("b_user_ids", expanding=True)))
+    .execution_options(populate_existing=True)
+)
+
+_COUNT_BY_USER_ID = (
+    select(func.count())
+    .select_from(UserSettingsORM)
+    .where(UserSettingsORM.user_id == bindparam("b_user_id"))
+)
+
+_UPDATE_BY_USER_ID = (
+    update(UserSettingsORM)
+    .where(UserSettingsORM.user_id == bindparam("b_user_id"))
+    .execution_options(synchronize_session=False)
+)
+
+_SELECT_BY_LANGUAGE = (
+    select(UserSettingsORM)
+    .where(UserSettingsORM.language == bindparam("b_language"))
+    .limit(bindparam("b_limit"))
+    .execution_options(populate_existing=True)
+)
+
+_SELECT_WITH_DATA_CONSENT = (
+    select(UserSettingsORM)
+    .where(UserSettingsORM.data_consent.is_(True))
+    .limit(bindparam("b_limit"))
+    .offset(bindparam("b_offset"))
+    .execution_options(populate_existing=True)
+)
+
+_WITH_DATA_CONSENT_PAGES = Keyset(
+    "settings_with_data_consent",
+    select(UserSettingsORM)
+    .where(UserSettingsORM.data_consent.is_(True))
+    .execution_options(populate_existing=True),
+    [UserSettingsORM.user_id],
+    lambda s: [s.user_id],
+    descending=False,
+)
+
+_COUNT_BY_LANGUAGE = (
+    select(func.count())
+    .select_from(UserSettingsORM)
+    .where(UserSettingsORM.language == bindparam("b_language"))
+)
+
+_COUNT_WITH_NOTIFICATIONS_ENABLED = (
+    select(func.count())
+    .select_from(UserSettingsORM)
+    .where(UserSettingsORM.notifications_enabled.is_(True))
 )
 
 
@@ -19,45 +84,32 @@ class UserSettingsRepository(BaseRepository):
         self.model = UserSettingsORM
 
     async def create(self, user_id: UUID, **settings: Any) -> UserSettingsORM:
-        stmt = (
-            insert(UserSettingsORM)
-            .values(user_id=user_id, **settings)
-            .returning(UserSettingsORM)
-        )
-        result = await self.session.execute(stmt)
+        stmt, params = bind_values(_INSERT, {"user_id": user_id, **settings})
+        result = await self.session.execute(stmt, params)
         return result.scalar_one()
 
     async def create_default(self, user_id: UUID) -> UserSettingsORM:
         return await self.create(user_id)
 
     async def get_by_user_id(self, user_id: UUID) -> UserSettingsORM | None:
-        query = select(UserSettingsORM).where(UserSettingsORM.user_id == user_id)
-        result = await self.session.execute(query)
+        result = await self.session.execute(_SELECT_BY_USER_ID, {"b_user_id": user_id})
         return result.scalar_one_or_none()
 
     async def get_by_user_ids(self, user_ids: list[UUID]) -> Sequence[UserSettingsORM]:
         if not user_ids:
             return []
-        query = select(UserSettingsORM).where(UserSettingsORM.user_id.in_(user_ids))
-        result = await self.session.execute(query)
+        result = await self.session.execute(
+            _SELECT_BY_USER_IDS, {"b_user_ids": user_ids}
+        )
         return result.scalars().all()  # type: ignore[no-any-return]
 
     async def exists(self, user_id: UUID) -> bool:
-        query = (
-            select(func.count())
-            .select_from(UserSettingsORM)
-            .where(UserSettingsORM.user_id == user_id)
-        )
-        result = await self.session.execute(query)
+        result = await self.session.execute(_COUNT_BY_USER_ID, {"b_user_id": user_id})
         return (result.scalar() or 0) > 0
 
     async def update_settings(self, user_id: UUID, **updates: Any) -> None:
-        stmt = (
-            update(UserSettingsORM)
-            .where(UserSettingsORM.user_id == user_id)
-            .values(**updates)
-        )
-        await self.session.execute(stmt)
+        stmt, params = bind_values(_UPDATE_BY_USER_ID, updates)
+        await self.session.execute(stmt, {"b_user_id": user_id, **params})
 
     async def set_dark_mode(self, user_id: UUID, enabled: bool) -> None:
         await self.update_settings(user_id, dark_mode=enabled)
@@ -96,40 +148,30 @@ class UserSettingsRepository(BaseRepository):
     async def get_by_language(
         self, language: str, limit: int = 100
     ) -> Sequence[UserSettingsORM]:
-        query = (
-            select(UserSettingsORM)
-            .where(UserSettingsORM.language == language)
-            .limit(limit)
+        result = await self.session.execute(
+            _SELECT_BY_LANGUAGE, {"b_language": language, "b_limit": limit}
         )
-        result = await self.session.execute(query)
         return result.scalars().all()  # type: ignore[no-any-return]
 
     async def get_with_data_consent(
         self, limit: int = 100, offset: int = 0
     ) -> Sequence[UserSettingsORM]:
-        query = (
-            select(UserSettingsORM)
-            .where(UserSettingsORM.data_consent.is_(True))
-            .limit(limit)
-            .offset(offset)
+        result = await self.session.execute(
+            _SELECT_WITH_DATA_CONSENT, {"b_limit": limit, "b_offset": offset}
         )
-        result = await self.session.execute(query)
         return result.scalars().all()  # type: ignore[no-any-return]
 
+    async def get_with_data_consent_page(
+        self, limit: int = 100, cursor: str | None = None
+    ) -> tuple[list[UserSettingsORM], str | None]:
+        return await _WITH_DATA_CONSENT_PAGES.fetch(self.session, limit, cursor)  # type: ignore[no-any-return]
+
     async def count_by_language(self, language: str) -> int:
-        query = (
-            select(func.count())
-            .select_from(UserSettingsORM)
-            .where(UserSettingsORM.language == language)
+        result = await self.session.execute(
+            _COUNT_BY_LANGUAGE, {"b_language": language}
         )
-        result = await self.session.execute(query)
         return result.scalar() or 0
 
     async def count_with_notifications_enabled(self) -> int:
-        query = (
-            select(func.count())
-            .select_from(UserSettingsORM)
-            .where(UserSettingsORM.notifications_enabled.is_(True))
-        )
-        result = await self.session.execute(query)
+        result = await self.session.execute(_COUNT_WITH_NOTIFICATIONS_ENABLED)
         return result.scalar() or 0
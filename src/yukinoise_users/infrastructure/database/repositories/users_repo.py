@@ -1,14 +1,8 @@
+from functools import lru_cache
 from uuid import UUID
-from typing import Sequence
+from typing import Any, Sequence
 
-from sqlalchemy import select, update, insert, func
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
-
-from uuid import UUID
-from typing import Sequence
-
-from sqlalchemy import select, update, insert, func
+from sqlalchemy import select, update, insert, func, bindparam
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
@@ -19,6 +13,94 @@ from yukinoise_users.infrastructure.database.models.users_model import (
 from yukinoise_users.infrastructure.database.repositories.base_repo import (
     BaseRepository,
 )
+from yukinoise_users.infrastructure.database.repositories.keyset import Keyset
+
+_not_deleted = UserORM.deleted_at.is_(None)
+
+_INSERT_FROM_KEYCLOAK = (
+    insert(UserORM)
+    .values(id=bindparam("b_id"), email_verified=bindparam("b_email_verified"))
+    .returning(UserORM)
+)
+
+_SELECT_BY_ID = (
+    select(UserORM)
+    .where(UserORM.id == bindparam("b_id"), _not_deleted)
+    .execution_options(populate_existing=True)
+)
+
+
+# loader options configure all mappers, so these are built on first use
+@lru_cache(maxsize=None)
+def _select_by_id_with(*relationships: str) -> Any:
+    return _SELECT_BY_ID.options(
+        *(selectinload(getattr(UserORM, name)) for name in relationships)
+    )
+
+
+_SELECT_BY_IDS = (
+    select(UserORM)
+    .where(UserORM.id.in_(bindparam("b_ids", expanding=True)), _not_deleted)
+    .execution_options(populate_existing=True)
+)
+
+_COUNT_BY_ID = (
+    select(func.count())
+    .select_from(UserORM)
+    .where(UserORM.id == bindparam("b_id"), _not_deleted)
+)
+
+_SELECT_BY_STATUS = (
+    select(UserORM)
+    .where(UserORM.status == bindparam("b_status"), _not_deleted)
+    .order_by(UserORM.created_at.desc())
+    .limit(bindparam("b_limit"))
+    .offset(bindparam("b_offset"))
+    .execution_options(populate_existing=True)
+)
+
+_BY_STATUS_PAGES = Keyset(
+    "users_by_status",
+    select(UserORM)
+    .where(UserORM.status == bindparam("b_status"), _not_deleted)
+    .execution_options(populate_existing=True),
+    [UserORM.created_at, UserORM.id],
+    lambda u: [u.created_at, u.id],
+)
+
+_SELECT_RECENTLY_ACTIVE = (
+    select(UserORM)
+    .where(UserORM.last_login_at >= bindparam("b_since"), _not_deleted)
+    .order_by(UserORM.last_login_at.desc())
+    .limit(bindparam("b_limit"))
+    .execution_options(populate_existing=True)
+)
+
+_UPDATE_BY_ID = (
+    update(UserORM)
+    .where(UserORM.id == bindparam("b_id"))
+    .execution_options(synchronize_session=False)
+)
+
+_SET_LAST_LOGIN_AT = _UPDATE_BY_ID.values(last_login_at=bindparam("b_last_login_at"))
+
+_SET_EMAIL_VERIFIED = _UPDATE_BY_ID.values(email_verified=bindparam("b_email_verified"))
+
+_SET_STATUS = _UPDATE_BY_ID.values(status=bindparam("b_status"))
+
+_SET_DELETED_AT = _UPDATE_BY_ID.values(deleted_at=bindparam("b_deleted_at"))
+
+_COUNT_BY_STATUS = (
+    select(func.count())
+    .select_from(UserORM)
+    .where(UserORM.status == bindparam("b_status"), _not_deleted)
+)
+
+_COUNT_REGISTERED_SINCE = (
+    select(func.count())
+    .select_from(UserORM)
+    .where(UserORM.created_at >= bindparam("b_since"), _not_deleted)
+)
 
 
 class UsersRepository(BaseRepository):
@@ -31,72 +113,36 @@ class UsersRepository(BaseRepository):
         keycloak_id: UUID,
         email_verified: bool = False,
     ) -> UserORM:
-        stmt = (
-            insert(UserORM)
-            .values(
-                id=keycloak_id,
-                email_verified=email_verified,
-            )
-            .returning(UserORM)
+        result = await self.session.execute(
+            _INSERT_FROM_KEYCLOAK,
+            {"b_id": keycloak_id, "b_email_verified": email_verified},
         )
-        result = await self.session.execute(stmt)
         return result.scalar_one()
 
     async def get_by_id(self, user_id: UUID) -> UserORM | None:
-        query = select(UserORM).where(
-            UserORM.id == user_id,
-            UserORM.deleted_at.is_(None),
-        )
-        result = await self.session.execute(query)
+        result = await self.session.execute(_SELECT_BY_ID, {"b_id": user_id})
         return result.scalar_one_or_none()
 
     async def get_by_id_with_profile(self, user_id: UUID) -> UserORM | None:
-        query = (
-            select(UserORM)
-            .options(selectinload(UserORM.profile))
-            .where(
-                UserORM.id == user_id,
-                UserORM.deleted_at.is_(None),
-            )
+        result = await self.session.execute(
+            _select_by_id_with("profile"), {"b_id": user_id}
         )
-        result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
     async def get_by_id_full(self, user_id: UUID) -> UserORM | None:
-        query = (
-            select(UserORM)
-            .options(
-                selectinload(UserORM.profile),
-                selectinload(UserORM.settings),
-            )
-            .where(
-                UserORM.id == user_id,
-                UserORM.deleted_at.is_(None),
-            )
+        result = await self.session.execute(
+            _select_by_id_with("profile", "settings"), {"b_id": user_id}
         )
-        result = await self.session.execute(query)
         return result.scalar_one_or_none()
 
     async def get_by_ids(self, user_ids: list[UUID]) -> Sequence[UserORM]:
         if not user_ids:
             return []
-        query = select(UserORM).where(
-            UserORM.id.in_(user_ids),
-            UserORM.deleted_at.is_(None),
-        )
-        result = await self.session.execute(query)
+        result = await self.session.execute(_SELECT_BY_IDS, {"b_ids": user_ids})
         return result.scalars().all()  # type: ignore[no-any-return]
 
     async def exists(self, user_id: UUID) -> bool:
-        query = (
-            select(func.count())
-            .select_from(UserORM)
-            .where(
-                UserORM.id == user_id,
-                UserORM.deleted_at.is_(None),
-            )
-        )
-        result = await self.session.execute(query)
+        result = await self.session.execute(_COUNT_BY_ID, {"b_id": user_id})
         return (result.scalar() or 0) > 0
 
     async def get_by_status(
@@ -105,19 +151,22 @@ class UsersRepository(BaseRepository):
         limit: int = 100,
         offset: int = 0,
     ) -> Sequence[UserORM]:
-        query = (
-            select(UserORM)
-            .where(
-                UserORM.status == status,
-                UserORM.deleted_at.is_(None),
-            )
-            .order_by(UserORM.created_at.desc())
-            .limit(limit)
-            .offset(offset)
+        result = await self.session.execute(
+            _SELECT_BY_STATUS,
+            {"b_status": status, "b_limit": limit, "b_offset": offset},
         )
-        result = await self.session.execute(query)
         return result.scalars().all()  # type: ignore[no-any-return]
 
+    async def get_by_status_page(
+        self,
+        status: UserStatus,
+        limit: int = 100,
+        cursor: str | None = None,
+    ) -> tuple[list[UserORM], str | None]:
+        return await _BY_STATUS_PAGES.fetch(  # type: ignore[no-any-return]
+            self.session, limit, cursor, {"b_status": status}
+        )
+
     async def get_active_users(
         self,
         limit: int = 100,
@@ -130,41 +179,31 @@ class UsersRepository(BaseRepository):
         since_timestamp: int,
         limit: int = 100,
     ) -> Sequence[UserORM]:
-        query = (
-            select(UserORM)
-            .where(
-                UserORM.last_login_at >= since_timestamp,
-                UserORM.deleted_at.is_(None),
-            )
-            .order_by(UserORM.last_login_at.desc())
-            .limit(limit)
+        result = await self.session.execute(
+            _SELECT_RECENTLY_ACTIVE, {"b_since": since_timestamp, "b_limit": limit}
         )
-        result = await self.session.execute(query)
         return result.scalars().all()  # type: ignore[no-any-return]
 
     async def update_last_login(self, user_id: UUID, timestamp: int) -> None:
-        stmt = (
-            update(UserORM).where(UserORM.id == user_id).values(last_login_at=timestamp)
+        await self.session.execute(
+            _SET_LAST_LOGIN_AT, {"b_id": user_id, "b_last_login_at": timestamp}
         )
-        await self.session.execute(stmt)
 
     async def update_email_verified(
         self,
         user_id: UUID,
         verified: bool,
     ) -> None:
-        stmt = (
-            update(UserORM).where(UserORM.id == user_id).values(email_verified=verified)
+        await self.session.execute(
+            _SET_EMAIL_VERIFIED, {"b_id": user_id, "b_email_verified": verified}
         )
-        await self.session.execute(stmt)
 
     async def update_status(
         self,
         user_id: UUID,
         status: UserStatus,
     ) -> None:
-        stmt = update(UserORM).where(UserORM.id == user_id).values(status=status)
-        await self.session.execute(stmt)
+        await self.session.execute(_SET_STATUS, {"b_id": user_id, "b_status": status})
 
     async def suspend_user(self, user_id: UUID) -> None:
         await self.update_status(user_id, UserStatus.SUSPENDED)
@@ -176,36 +215,24 @@ class UsersRepository(BaseRepository):
         await self.update_status(user_id, UserStatus.ACTIVE)
 
     async def soft_delete(self, user_id: UUID, timestamp: int) -> None:
-        stmt = update(UserORM).where(UserORM.id == user_id).values(deleted_at=timestamp)
-        await self.session.execute(stmt)
+        await self.session.execute(
+            _SET_DELETED_AT, {"b_id": user_id, "b_deleted_at": timestamp}
+        )
 
     async def restore(self, user_id: UUID) -> None:
-        stmt = update(UserORM).where(UserORM.id == user_id).values(deleted_at=None)
-        await self.session.execute(stmt)
+        await self.session.execute(
+            _SET_DELETED_AT, {"b_id": user_id, "b_deleted_at": None}
+        )
 
     async def count_by_status(self, status: UserStatus) -> int:
-        query = (
-            select(func.count())
-            .select_from(UserORM)
-            .where(
-                UserORM.status == status,
-                UserORM.deleted_at.is_(None),
-            )
-        )
-        result = await self.session.execute(query)
+        result = await self.session.execute(_COUNT_BY_STATUS, {"b_status": status})
         return result.scalar() or 0
 
     async def count_total_active(self) -> int:
         return await self.count_by_status(UserStatus.ACTIVE)
 
     async def count_registered_since(self, since_timestamp: int) -> int:
-        query = (
-            select(func.count())
-            .select_from(UserORM)
-            .where(
-                UserORM.created_at >= since_timestamp,
-                UserORM.deleted_at.is_(None),
-            )
+        result = await self.session.execute(
+            _COUNT_REGISTERED_SINCE, {"b_since": since_timestamp}
         )
-        result = await self.session.execute(query)
         return result.scalar() or 0
@@ -0,0 +1,82 @@
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from yukinoise_users.core.conf import settings
+from yukinoise_users.infrastructure.database.connection import (
+    get_replica_session_factories,
+)
+
+# READ ONLY transactions never get a transaction id; DEFERRABLE additionally
+# avoids serialization failures when the isolation level is SERIALIZABLE
+READ_ONLY_EXECUTION_OPTIONS = {
+    "postgresql_readonly": True,
+    "postgresql_deferrable": True,
+}
+
+
+class ReplicaRouter:
+    """Choose the replica serving a read-only unit of work.
+
+    Replicas are used round robin. A read-write unit of work with a
+    consistency key records its commit, and read-only units of work with
+    the same key go to the primary for ``read_your_writes_seconds`` after
+    it, so a user sees their own changes before replication catches up.
+    Pins are kept in process memory, so this holds only for requests that
+    reach the same instance.
+    """
+
+    def __init__(
+        self,
+        replicas: list[async_sessionmaker[AsyncSession]],
+        read_your_writes_seconds: float = 5.0,
+        max_pinned_keys: int = 100_000,
+    ) -> None:
+        self._replicas = replicas
+        self._read_your_writes_seconds = read_your_writes_seconds
+        self._max_pinned_keys = max_pinned_keys
+        self._next_replica = 0
+        # key -> monotonic deadline, in deadline order since the TTL is fixed
+        self._pinned: OrderedDict[str, float] = OrderedDict()
+
+    def replica_for(
+        self, consistency_key: str | None = None
+    ) -> async_sessionmaker[AsyncSession] | None:
+        """Return a replica session factory, or None to read from the primary."""
+        if not self._replicas:
+            return None
+        if consistency_key is not None and self._is_pinned(consistency_key):
+            return None
+        replica = self._replicas[self._next_replica % len(self._replicas)]
+        self._next_replica += 1
+        return replica
+
+    def record_write(self, consistency_key: str) -> None:
+        if self._read_your_writes_seconds <= 0:
+            return
+        self._pinned[consistency_key] = (
+            time.monotonic() + self._read_your_writes_seconds
+        )
+        self._pinned.move_to_end(consistency_key)
+        while len(self._pinned) > self._max_pinned_keys:
+            self._pinned.popitem(last=False)
+
+    def _is_pinned(self, consistency_key: str) -> bool:
+        now = time.monotonic()
+        while self._pinned:
+            key, deadline = next(iter(self._pinned.items()))
+            if deadline > now:
+                break
+            del self._pinned[key]
+        return consistency_key in self._pinned
+
+
+@lru_cache(maxsize=None)
+def get_replica_router() -> ReplicaRouter:
+    """The process-wide router over the configured replicas, built on first use."""
+    return ReplicaRouter(
+        get_replica_session_factories(),
+        read_your_writes_seconds=settings.DB_READ_YOUR_WRITES_SECONDS,
+    )
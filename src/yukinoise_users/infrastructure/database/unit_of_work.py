@@ -1,14 +1,26 @@
-from typing import TYPE_CHECKING, Type, Any
+from typing import TYPE_CHECKING, Any
 
-from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
-from yukinoise_users.infrastructure.database.connection import async_session_factory
+from yukinoise_users.core.conf import settings as app_settings
+from yukinoise_users.infrastructure.database.connection import (
+    API_ROLE,
+    OUTBOX_ROLE,
+    get_session_factory,
+)
+from yukinoise_users.infrastructure.database.fast_reads import FastReads
+from yukinoise_users.infrastructure.database.routing import (
+    READ_ONLY_EXECUTION_OPTIONS,
+    ReplicaRouter,
+    get_replica_router,
+)
 from yukinoise_users.infrastructure.database.repositories import (
     UsersRepository as UsersDbRepository,
     ProfilesRepository as ProfilesDbRepository,
     UserSettingsRepository as UserSettingsDbRepository,
     UserAuditLogsRepository as UserAuditLogsDbRepository,
     OutboxEventRepository as OutboxEventDbRepository,
+    ProcessedEventsRepository as ProcessedEventsDbRepository,
 )
 from yukinoise_users.infrastructure.database.adapters.users_adapter import (
     UsersRepositoryAdapter,
@@ -25,6 +37,9 @@ from yukinoise_users.infrastructure.database.adapters.audit_logs_adapter import
 from yukinoise_users.infrastructure.database.adapters.outbox_adapter import (
     OutboxRepositoryAdapter,
 )
+from yukinoise_users.infrastructure.database.adapters.inbox_adapter import (
+    InboxRepositoryAdapter,
+)
 
 if TYPE_CHECKING:
     from yukinoise_users.domain.repositories import (
@@ -33,6 +48,7 @@ if TYPE_CHECKING:
         UserSettingsRepository,
         UserAuditLogsRepository,
         OutboxRepository,
+        InboxRepository,
     )
 
     session: AsyncSession
@@ -41,13 +57,29 @@ if TYPE_CHECKING:
     settings: UserSettingsRepository
     audit_logs: UserAuditLogsRepository
     outbox: OutboxRepository
+    inbox: InboxRepository
 
 
 class UnitOfWork:
+    """Transaction scope over the repositories.
+
+    ``read_only=True`` runs a READ ONLY transaction on a replica when one is
+    configured. Passing the same ``consistency_key`` (for example the user
+    id) to writes and reads keeps the reads on the primary for a short
+    while after a write, see ``ReplicaRouter``.
+    """
+
     def __init__(
-        self, session_factory: Type[async_session_factory] = async_session_factory
+        self,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+        read_only: bool = False,
+        consistency_key: str | None = None,
+        router: ReplicaRouter | None = None,
     ) -> None:
-        self._session_factory = session_factory
+        self._session_factory = session_factory or get_session_factory(API_ROLE)
+        self._read_only = read_only
+        self._consistency_key = consistency_key
+        self._router = router or get_replica_router()
         self._session: AsyncSession | None = None
 
         # repository instances (private until context entered)
@@ -56,45 +88,76 @@ class UnitOfWork:
         self._settings: UserSettingsRepository | None = None
         self._audit_logs: UserAuditLogsRepository | None = None
         self._outbox: OutboxRepository | None = None
+        self._inbox: InboxRepository | None = None
 
         self._txn: Any | None = None
+        # outbox events raised during the transaction, inserted at commit
+        self._collected_events: list[tuple[str, dict[str, Any]]] = []
 
     async def __aenter__(self) -> "UnitOfWork":
-        self._session = self._session_factory()
+        if self._read_only:
+            replica = self._router.replica_for(self._consistency_key)
+            self._session = (replica or self._session_factory)()
+        else:
+            self._session = self._session_factory()
         self._txn = self._session.begin()
         # mypy cannot infer transaction context type; treat as Any
         await self._txn.__aenter__()
+        if self._read_only:
+            # options apply to the connection before its transaction begins
+            await self._session.connection(
+                execution_options=READ_ONLY_EXECUTION_OPTIONS
+            )
 
         _db_users = UsersDbRepository(self._session)
-        _db_profiles = ProfilesDbRepository(self._session)
+        _db_profiles = ProfilesDbRepository(
+            self._session, counter_shards=app_settings.PROFILE_COUNTER_SHARDS
+        )
         _db_settings = UserSettingsDbRepository(self._session)
         _db_audit_logs = UserAuditLogsDbRepository(self._session)
         _db_outbox = OutboxEventDbRepository(self._session)
+        _db_inbox = ProcessedEventsDbRepository(self._session)
+
+        fast_reads = FastReads(self._session) if app_settings.DB_FAST_READS else None
 
         self._users = UsersRepositoryAdapter(_db_users)
-        self._profiles = ProfilesRepositoryAdapter(_db_profiles)
-        self._settings = UserSettingsRepositoryAdapter(_db_settings)
+        self._profiles = ProfilesRepositoryAdapter(_db_profiles, fast_reads)
+        self._settings = UserSettingsRepositoryAdapter(_db_settings, fast_reads)
         self._audit_logs = UserAuditLogsRepositoryAdapter(_db_audit_logs)
         self._outbox = OutboxRepositoryAdapter(_db_outbox)
+        self._inbox = InboxRepositoryAdapter(_db_inbox)
 
         return self
 
     async def __aexit__(
         self, exc_type: type | None, exc: BaseException | None, tb: object | None
     ) -> None:
-        # delegate to the transaction context manager which will commit or rollback
-        if self._txn is not None:
-            await self._txn.__aexit__(exc_type, exc, tb)
-
-        # close and clear the session and repos
-        if self._session is not None:
-            await self._session.close()
-        self._session = None
-        self._users = None
-        self._profiles = None
-        self._settings = None
-        self._audit_logs = None
-        self._outbox = None
+        try:
+            if exc_type is None:
+                await self._flush_events()
+        except BaseException as e:
+            # roll back instead of committing when the outbox insert fails
+            exc_type, exc, tb = type(e), e, e.__traceback__
+            raise
+        finally:
+            self._collected_events = []
+
+            # delegate to the transaction context manager which will commit or rollback
+            if self._txn is not None:
+                await self._txn.__aexit__(exc_type, exc, tb)
+                if exc_type is None:
+                    self._record_write()
+
+            # close and clear the session and repos
+            if self._session is not None:
+                await self._session.close()
+            self._session = None
+            self._users = None
+            self._profiles = None
+            self._settings = None
+            self._audit_logs = None
+            self._outbox = None
+            self._inbox = None
 
     @property
     def session(self) -> AsyncSession:
@@ -132,8 +195,41 @@ class UnitOfWork:
             raise RuntimeError("UnitOfWork has no active session")
         return self._outbox
 
+    @property
+    def inbox(self) -> InboxRepository:
+        if self._inbox is None:
+            raise RuntimeError("UnitOfWork has no active session")
+        return self._inbox
+
+    def collect_event(self, event_type: str, payload: dict[str, Any]) -> None:
+        """Queue an outbox event to be inserted with the others at commit."""
+        if self._read_only:
+            raise RuntimeError("Cannot collect events in a read-only UnitOfWork")
+        self._collected_events.append((event_type, payload))
+
+    async def _flush_events(self) -> None:
+        events, self._collected_events = self._collected_events, []
+        if events:
+            await self.outbox.create_events(events)
+
+    def _record_write(self) -> None:
+        if not self._read_only and self._consistency_key is not None:
+            self._router.record_write(self._consistency_key)
+
     async def commit(self) -> None:
+        await self._flush_events()
         await self.session.commit()
+        self._record_write()
 
     async def rollback(self) -> None:
+        self._collected_events = []
         await self.session.rollback()
+
+
+def outbox_unit_of_work() -> UnitOfWork:
+    """A unit of work on the outbox engine, the ``uow_factory`` of ``OutboxProcessor``.
+
+    Keeps the processor's short claim and settle transactions on their own
+    small pool instead of competing with API requests for connections.
+    """
+    return UnitOfWork(get_session_factory(OUTBOX_ROLE))
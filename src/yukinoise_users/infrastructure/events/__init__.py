@@ -1,9 +1,21 @@
 from yukinoise_users.infrastructure.events.producer import RabbitMQEventProducer
 from yukinoise_users.infrastructure.events.consumer import RabbitMQEventConsumer
-from yukinoise_users.infrastructure.events.outbox_processor import OutboxProcessor
+from yukinoise_users.infrastructure.events.outbox_processor import (
+    OutboxProcessor,
+    LATEST_STATE_EVENT_TYPES,
+)
+from yukinoise_users.infrastructure.events.inbox import InboxDeduplicator
+from yukinoise_users.infrastructure.events.prefetch import PrefetchTuner
+from yukinoise_users.infrastructure.events.counter_aggregator import (
+    CounterDeltaAggregator,
+)
 
 __all__ = [
     "RabbitMQEventProducer",
     "RabbitMQEventConsumer",
     "OutboxProcessor",
+    "LATEST_STATE_EVENT_TYPES",
+    "InboxDeduplicator",
+    "PrefetchTuner",
+    "CounterDeltaAggregator",
 ]
@@ -0,0 +1,155 @@
+import gzip
+import json
+from datetime import date, datetime, time
+from enum import Enum
+from typing import Any, Protocol
+from uuid import UUID
+
+# typed as Any so the checks below hold whether or not the extra is installed;
+# msgpack ships no type information and is Any already
+orjson: Any
+zstandard: Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional codec
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional compression
+    zstandard = None
+
+
+JSON_CONTENT_TYPE = "application/json"
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+
+GZIP_ENCODING = "gzip"
+ZSTD_ENCODING = "zstd"
+
+
+class UnsupportedCodecError(Exception):
+    """Content type or encoding is unknown or its library is not installed."""
+
+
+class Codec(Protocol):
+    content_type: str
+
+    def encode(self, payload: dict[str, Any]) -> bytes: ...
+
+    def decode(self, body: bytes) -> dict[str, Any]: ...
+
+
+def _json_default(value: Any) -> Any:
+    # the non-JSON types orjson serializes natively, in the same form
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class JsonCodec:
+    """JSON codec backed by orjson when installed, stdlib json otherwise.
+
+    Both produce the same bytes, so consumers see one format whichever
+    producer sent the event.
+    """
+
+    content_type = JSON_CONTENT_TYPE
+
+    def encode(self, payload: dict[str, Any]) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(payload)  # type: ignore[no-any-return]
+        return json.dumps(
+            payload, separators=(",", ":"), ensure_ascii=False, default=_json_default
+        ).encode("utf-8")
+
+    def decode(self, body: bytes) -> dict[str, Any]:
+        if orjson is not None:
+            return orjson.loads(body)  # type: ignore[no-any-return]
+        return json.loads(body)  # type: ignore[no-any-return]
+
+
+class MsgpackCodec:
+    content_type = MSGPACK_CONTENT_TYPE
+
+    def __init__(self) -> None:
+        if msgpack is None:
+            raise UnsupportedCodecError("msgpack is not installed")
+
+    def encode(self, payload: dict[str, Any]) -> bytes:
+        return msgpack.packb(payload, use_bin_type=True)  # type: ignore[no-any-return]
+
+    def decode(self, body: bytes) -> dict[str, Any]:
+        return msgpack.unpackb(body, raw=False)  # type: ignore[no-any-return]
+
+
+_CODEC_FACTORIES: dict[str, type[Codec]] = {
+    JSON_CONTENT_TYPE: JsonCodec,
+    MSGPACK_CONTENT_TYPE: MsgpackCodec,
+}
+_codecs: dict[str, Codec] = {}
+
+
+def get_codec(content_type: str | None) -> Codec:
+    # messages without a content type predate codecs and are plain JSON
+    content_type = content_type or JSON_CONTENT_TYPE
+    codec = _codecs.get(content_type)
+    if codec is None:
+        factory = _CODEC_FACTORIES.get(content_type)
+        if factory is None:
+            raise UnsupportedCodecError(f"Unsupported content type: {content_type}")
+        codec = _codecs[content_type] = factory()
+    return codec
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == GZIP_ENCODING:
+        return gzip.compress(body, compresslevel=6)
+    if encoding == ZSTD_ENCODING:
+        if zstandard is None:
+            raise UnsupportedCodecError("zstandard is not installed")
+        return zstandard.ZstdCompressor().compress(body)  # type: ignore[no-any-return]
+    raise UnsupportedCodecError(f"Unsupported content encoding: {encoding}")
+
+
+def decompress(body: bytes, encoding: str | None) -> bytes:
+    if not encoding or encoding == "identity":
+        return body
+    if encoding == GZIP_ENCODING:
+        return gzip.decompress(body)
+    if encoding == ZSTD_ENCODING:
+        if zstandard is None:
+            raise UnsupportedCodecError("zstandard is not installed")
+        return zstandard.ZstdDecompressor().decompress(body)  # type: ignore[no-any-return]
+    raise UnsupportedCodecError(f"Unsupported content encoding: {encoding}")
+
+
+def encode_body(
+    payload: dict[str, Any],
+    content_type: str = JSON_CONTENT_TYPE,
+    compression: str | None = None,
+    compression_threshold: int = 1024,
+) -> tuple[bytes, str | None]:
+    """Serialize a payload, compressing it when it crosses the threshold.
+
+    Returns the body and the content encoding to put on the message.
+    """
+    body = get_codec(content_type).encode(payload)
+    if compression is not None and len(body) >= compression_threshold:
+        return compress(body, compression), compression
+    return body, None
+
+
+def decode_body(
+    body: bytes, content_type: str | None, content_encoding: str | None
+) -> dict[str, Any]:
+    return get_codec(content_type).decode(decompress(body, content_encoding))
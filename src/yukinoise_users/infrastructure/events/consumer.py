@@ -1,9 +1,11 @@
-import json
+import asyncio
 import logging
+import time
+from functools import partial
 from typing import AsyncIterator, Callable, Awaitable
 from uuid import uuid4
 
-from aio_pika import connect_robust, ExchangeType
+from aio_pika import connect_robust, DeliveryMode, ExchangeType, Message
 from aio_pika.abc import (
     AbstractRobustConnection,
     AbstractChannel,
@@ -12,10 +14,16 @@ from aio_pika.abc import (
 )
 
 from yukinoise_users.domain.events import IncomingEvent
+from yukinoise_users.infrastructure.events.codecs import decode_body
+from yukinoise_users.infrastructure.events.prefetch import PrefetchTuner
 
 
 logger = logging.getLogger(__name__)
 
+RETRY_COUNT_HEADER = "x-retry-count"
+ORIGINAL_ROUTING_KEY_HEADER = "x-original-routing-key"
+DEAD_LETTER_ROUTING_KEY = "dead-letter"
+
 
 class RabbitMQEventConsumer:
     def __init__(
@@ -25,17 +33,26 @@ class RabbitMQEventConsumer:
         queue_name: str = "yukinoise-users",
         prefetch_count: int = 10,
         connection_name: str = "yukinoise-users-consumer",
+        retry_delays_ms: tuple[int, ...] = (1_000, 10_000, 60_000),
+        prefetch_tuner: PrefetchTuner | None = None,
     ) -> None:
         self.amqp_url = amqp_url
         self.exchange_name = exchange_name
         self.queue_name = queue_name
-        self.prefetch_count = prefetch_count
+        self.prefetch_count = (
+            prefetch_tuner.clamp(prefetch_count) if prefetch_tuner else prefetch_count
+        )
         self.connection_name = connection_name
+        self.retry_delays_ms = retry_delays_ms
+        self._prefetch_tuner = prefetch_tuner
 
         self._connection: AbstractRobustConnection | None = None
         self._channel: AbstractChannel | None = None
         self._queue: AbstractQueue | None = None
-        self._pending_messages: dict[str, AbstractIncomingMessage] = {}
+        # unacked deliveries by delivery tag, and their tags per event id in
+        # delivery order, as redeliveries of one event can be in flight at once
+        self._pending_messages: dict[int, AbstractIncomingMessage] = {}
+        self._pending_tags: dict[str, list[int]] = {}
 
     async def connect(self) -> None:
         if self._connection is not None and not self._connection.is_closed:
@@ -46,7 +63,9 @@ class RabbitMQEventConsumer:
             client_properties={"connection_name": self.connection_name},
         )
         self._channel = await self._connection.channel()
-        await self._channel.set_qos(prefetch_count=self.prefetch_count)
+        # a channel-wide limit, unlike a per-consumer one, can be changed for
+        # a running consumer; the channel has a single consumer either way
+        await self._channel.set_qos(prefetch_count=self.prefetch_count, global_=True)
 
         await self._channel.declare_exchange(
             self.exchange_name,
@@ -58,13 +77,48 @@ class RabbitMQEventConsumer:
             self.queue_name,
             durable=True,
             arguments={
-                "x-dead-letter-exchange": f"{self.exchange_name}.dlx",
-                "x-dead-letter-routing-key": "dead-letter",
+                "x-dead-letter-exchange": self.dead_letter_exchange_name,
+                "x-dead-letter-routing-key": DEAD_LETTER_ROUTING_KEY,
             },
         )
+        await self._declare_dead_letter_queue()
+        await self._declare_retry_queues()
 
         logger.info(f"Connected to RabbitMQ queue: {self.queue_name}")
 
+    @property
+    def dead_letter_exchange_name(self) -> str:
+        return f"{self.exchange_name}.dlx"
+
+    def retry_queue_name(self, delay_ms: int) -> str:
+        return f"{self.queue_name}.retry.{delay_ms}ms"
+
+    async def _declare_dead_letter_queue(self) -> None:
+        dlx = await self._channel.declare_exchange(  # type: ignore
+            self.dead_letter_exchange_name,
+            ExchangeType.DIRECT,
+            durable=True,
+        )
+        dlq = await self._channel.declare_queue(  # type: ignore
+            f"{self.queue_name}.dlq",
+            durable=True,
+        )
+        await dlq.bind(dlx, routing_key=DEAD_LETTER_ROUTING_KEY)
+
+    async def _declare_retry_queues(self) -> None:
+        # retry queues have no consumers: messages wait out the TTL, then the
+        # default exchange dead-letters them straight back to the main queue
+        for delay_ms in self.retry_delays_ms:
+            await self._channel.declare_queue(  # type: ignore
+                self.retry_queue_name(delay_ms),
+                durable=True,
+                arguments={
+                    "x-message-ttl": delay_ms,
+                    "x-dead-letter-exchange": "",
+                    "x-dead-letter-routing-key": self.queue_name,
+                },
+            )
+
     async def disconnect(self) -> None:
         if self._channel and not self._channel.is_closed:
             await self._channel.close()
@@ -74,6 +128,7 @@ class RabbitMQEventConsumer:
         self._channel = None
         self._queue = None
         self._pending_messages.clear()
+        self._pending_tags.clear()
         logger.info("Disconnected from RabbitMQ")
 
     async def subscribe(self, routing_keys: list[str]) -> None:
@@ -96,54 +151,299 @@ class RabbitMQEventConsumer:
 
         async with self._queue.iterator() as queue_iter:  # type: ignore
             async for message in queue_iter:
-                event = self._parse_message(message)
-                self._pending_messages[event.event_id] = message
-                yield event
+                event = await self._track_or_reject(message)
+                if event is not None:
+                    yield event
+                await self._retune_prefetch()
+
+    async def _retune_prefetch(self) -> None:
+        if self._prefetch_tuner is None or self._channel is None:
+            return
+        prefetch_count = self._prefetch_tuner.recommend(self.prefetch_count)
+        if prefetch_count is None:
+            return
+
+        # applies to the live consumer: deliveries beyond a lowered limit stay
+        # in flight until acked, a raised one lets more through right away
+        await self._channel.set_qos(prefetch_count=prefetch_count, global_=True)
+        logger.info(
+            f"Adjusted prefetch of {self.queue_name} from {self.prefetch_count} "
+            f"to {prefetch_count}"
+        )
+        self.prefetch_count = prefetch_count
+
+    async def consume_batch(
+        self, max_items: int = 100, max_wait_ms: int = 100
+    ) -> AsyncIterator[list[IncomingEvent]]:
+        """Yield batches of up to ``max_items`` events.
+
+        A batch is closed when it is full or ``max_wait_ms`` after its first
+        event arrived. Batches never exceed ``prefetch_count``.
+        """
+        if self._queue is None:
+            await self.connect()
+
+        # queue iterators close when a pending read is cancelled, so buffer
+        # deliveries in an asyncio.Queue whose get() can time out safely
+        buffer: asyncio.Queue[AbstractIncomingMessage] = asyncio.Queue()
+        consumer_tag = await self._queue.consume(buffer.put)  # type: ignore
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                event = await self._track_or_reject(await buffer.get())
+                if event is None:
+                    continue
+                batch = [event]
+                deadline = loop.time() + max_wait_ms / 1000
+                while len(batch) < max_items:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        message = await asyncio.wait_for(buffer.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                    if (event := await self._track_or_reject(message)) is not None:
+                        batch.append(event)
+                yield batch
+        finally:
+            if self._channel is not None and not self._channel.is_closed:
+                await self._queue.cancel(consumer_tag)  # type: ignore
+                # deliveries still buffered were never handed out, so return
+                # them to the queue rather than leaving them unacked
+                while not buffer.empty():
+                    await buffer.get_nowait().nack(requeue=True)
+
+    def _track(self, message: AbstractIncomingMessage) -> IncomingEvent:
+        event = self._parse_message(message)
+        delivery_tag = message.delivery_tag or 0
+        self._pending_messages[delivery_tag] = message
+        self._pending_tags.setdefault(event.event_id, []).append(delivery_tag)
+        return event
+
+    async def _track_or_reject(
+        self, message: AbstractIncomingMessage
+    ) -> IncomingEvent | None:
+        """Track ``message``, or dead-letter it when it cannot be decoded.
+
+        A message of an unknown content type, or one whose codec is not
+        installed here, would fail the same way on every redelivery.
+        """
+        try:
+            return self._track(message)
+        except Exception as e:
+            logger.error(
+                f"Dead-lettering undecodable message {message.message_id} "
+                f"({message.content_type}, {message.content_encoding}): {e}"
+            )
+            await message.nack(requeue=False)
+            return None
+
+    def _untrack(self, event_id: str) -> AbstractIncomingMessage | None:
+        """Pop the oldest unacked delivery of ``event_id``."""
+        delivery_tags = self._pending_tags.get(event_id)
+        if not delivery_tags:
+            return None
+        delivery_tag = delivery_tags.pop(0)
+        if not delivery_tags:
+            del self._pending_tags[event_id]
+        return self._pending_messages.pop(delivery_tag, None)
 
     async def ack(self, event_id: str) -> None:
-        message = self._pending_messages.pop(event_id, None)
+        message = self._untrack(event_id)
         if message:
             await message.ack()
             logger.debug(f"Acknowledged event: {event_id}")
 
+    async def ack_batch(self, event_ids: list[str]) -> None:
+        """Acknowledge events with a single ``multiple=True`` ack when possible.
+
+        Nack the failed events of a batch first: a multiple ack would also
+        settle any other unacked delivery with a lower tag, so when one is
+        still outstanding the events are acked one by one instead.
+        """
+        messages = [
+            message
+            for event_id in event_ids
+            if (message := self._untrack(event_id)) is not None
+        ]
+        if not messages:
+            return
+
+        last = max(messages, key=lambda m: m.delivery_tag or 0)
+        last_tag = last.delivery_tag or 0
+        if any(delivery_tag <= last_tag for delivery_tag in self._pending_messages):
+            for message in messages:
+                await message.ack()
+        else:
+            await last.ack(multiple=True)
+        logger.debug(f"Acknowledged batch of {len(messages)} events")
+
     async def nack(self, event_id: str, requeue: bool = True) -> None:
-        message = self._pending_messages.pop(event_id, None)
-        if message:
-            await message.nack(requeue=requeue)
-            logger.debug(f"Rejected event: {event_id}, requeue={requeue}")
+        """Reject an event.
+
+        With retry queues configured, ``requeue=True`` schedules a delayed
+        redelivery through the next retry tier instead of an immediate
+        requeue. Once every tier was used, or with ``requeue=False``, the
+        message is dead-lettered to the ``.dlx`` exchange.
+        """
+        message = self._untrack(event_id)
+        if not message:
+            return
+
+        if requeue and self.retry_delays_ms:
+            await self._retry_later(event_id, message)
+            return
+
+        await message.nack(requeue=requeue)
+        logger.debug(f"Rejected event: {event_id}, requeue={requeue}")
+
+    async def _retry_later(
+        self, event_id: str, message: AbstractIncomingMessage
+    ) -> None:
+        headers = dict(message.headers) if message.headers else {}
+        retry_count = int(headers.get(RETRY_COUNT_HEADER) or 0)  # type: ignore
+        if retry_count >= len(self.retry_delays_ms):
+            await message.nack(requeue=False)
+            logger.warning(
+                f"Event {event_id} dead-lettered after {retry_count} retries"
+            )
+            return
+
+        delay_ms = self.retry_delays_ms[retry_count]
+        headers[RETRY_COUNT_HEADER] = retry_count + 1
+        headers.setdefault(ORIGINAL_ROUTING_KEY_HEADER, message.routing_key or "")
+        retry_message = Message(
+            body=message.body,
+            headers=headers,
+            content_type=message.content_type,
+            content_encoding=message.content_encoding,
+            message_id=message.message_id,
+            correlation_id=message.correlation_id,
+            timestamp=message.timestamp,
+            type=message.type,
+            delivery_mode=DeliveryMode.PERSISTENT,
+        )
+        try:
+            await self._channel.default_exchange.publish(  # type: ignore
+                retry_message, routing_key=self.retry_queue_name(delay_ms)
+            )
+        except Exception as e:
+            logger.error(f"Failed to schedule retry for event {event_id}: {e}")
+            await message.nack(requeue=True)
+            return
+
+        await message.ack()
+        logger.debug(
+            f"Scheduled retry {retry_count + 1} for event {event_id} in {delay_ms}ms"
+        )
 
     def _parse_message(self, message: AbstractIncomingMessage) -> IncomingEvent:
-        body = json.loads(message.body.decode("utf-8"))
+        body = decode_body(message.body, message.content_type, message.content_encoding)
         headers = dict(message.headers) if message.headers else {}
 
-        event_id = message.message_id or str(uuid4())
+        stable_id = message.message_id or headers.get("event_id")
+        event_id = str(stable_id) if stable_id else str(uuid4())
         event_type = headers.get("event_type", body.get("event_type", "unknown"))
 
         return IncomingEvent(
             event_id=event_id,
             event_type=event_type,
             payload=body.get("payload", body),
-            routing_key=message.routing_key or "",
+            # retried messages come back through the default exchange
+            routing_key=str(
+                headers.get(ORIGINAL_ROUTING_KEY_HEADER) or message.routing_key or ""
+            ),
             headers=headers,
+            has_stable_id=bool(stable_id),
         )
 
     async def consume_with_handler(
         self,
         handler: Callable[[IncomingEvent], Awaitable[bool]],
         auto_ack: bool = True,
+        concurrency: int = 1,
+    ) -> None:
+        """Run ``handler`` for every consumed event.
+
+        With ``concurrency`` > 1 up to that many handlers run at once, while
+        events sharing an ``aggregate_id`` header are still handled in delivery
+        order. No more than ``prefetch_count`` events are taken in at a time,
+        counting those waiting on their lane, so keep it at least as large as
+        ``concurrency``.
+        """
+        if concurrency <= 1:
+            async for event in self.consume():
+                await self._handle_event(handler, event, auto_ack)
+            return
+
+        semaphore = asyncio.Semaphore(concurrency)
+        lanes: dict[str, asyncio.Task[None]] = {}
+        in_flight: set[asyncio.Task[None]] = set()
+        try:
+            async for event in self.consume():
+                key = str(event.headers.get("aggregate_id") or event.event_id)
+                task = asyncio.create_task(
+                    self._handle_in_lane(
+                        lanes.get(key), semaphore, handler, event, auto_ack
+                    )
+                )
+                lanes[key] = task
+                in_flight.add(task)
+                task.add_done_callback(partial(self._release_lane, lanes, key))
+                task.add_done_callback(in_flight.discard)
+                # read the next delivery only with room for it; the prefetch
+                # may have been retuned meanwhile
+                while len(in_flight) >= self.prefetch_count:
+                    await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            if in_flight:
+                await asyncio.gather(*in_flight, return_exceptions=True)
+
+    async def _handle_in_lane(
+        self,
+        previous: asyncio.Task[None] | None,
+        semaphore: asyncio.Semaphore,
+        handler: Callable[[IncomingEvent], Awaitable[bool]],
+        event: IncomingEvent,
+        auto_ack: bool,
+    ) -> None:
+        if previous is not None:
+            await asyncio.wait({previous})
+        async with semaphore:
+            await self._handle_event(handler, event, auto_ack)
+
+    @staticmethod
+    def _release_lane(
+        lanes: dict[str, asyncio.Task[None]], key: str, task: asyncio.Task[None]
+    ) -> None:
+        if lanes.get(key) is task:
+            del lanes[key]
+
+    async def _handle_event(
+        self,
+        handler: Callable[[IncomingEvent], Awaitable[bool]],
+        event: IncomingEvent,
+        auto_ack: bool,
     ) -> None:
-        async for event in self.consume():
-            try:
-                success = await handler(event)
-                if auto_ack:
-                    if success:
-                        await self.ack(event.event_id)
-                    else:
-                        await self.nack(event.event_id, requeue=True)
-            except Exception as e:
-                logger.exception(f"Error processing event {event.event_id}: {e}")
-                if auto_ack:
-                    await self.nack(event.event_id, requeue=False)
+        tuner = self._prefetch_tuner
+        if tuner is not None:
+            tuner.handler_started()
+        started = time.monotonic()
+        try:
+            success = await handler(event)
+            if auto_ack:
+                if success:
+                    await self.ack(event.event_id)
+                else:
+                    await self.nack(event.event_id, requeue=True)
+        except Exception as e:
+            logger.exception(f"Error processing event {event.event_id}: {e}")
+            if auto_ack:
+                await self.nack(event.event_id, requeue=False)
+        finally:
+            if tuner is not None:
+                tuner.handler_finished(time.monotonic() - started)
 
     async def __aenter__(self) -> "RabbitMQEventConsumer":
         await self.connect()
@@ -0,0 +1,105 @@
+import logging
+from collections import defaultdict
+from typing import Callable
+from uuid import UUID
+
+from yukinoise_users.domain.events import (
+    EventConsumer,
+    EventType,
+    FOLLOWER_ID_KEY,
+    IncomingEvent,
+)
+from yukinoise_users.domain.repositories import UnitOfWork
+
+
+logger = logging.getLogger(__name__)
+
+FOLLOW_DELTAS = {
+    EventType.USER_FOLLOWED.value: 1,
+    EventType.USER_UNFOLLOWED.value: -1,
+}
+
+CounterDeltas = dict[UUID, dict[str, int]]
+
+
+class CounterDeltaAggregator:
+    """Write-behind follower/following counters.
+
+    Deltas of all follow events consumed within ``flush_interval_ms`` are
+    summed per user and written with a single statement, so a burst of
+    follows for one profile costs one row update instead of one per event.
+    Messages are acked only after their deltas were committed, which gives
+    at-least-once semantics: a crash between commit and ack replays deltas.
+    """
+
+    def __init__(
+        self,
+        consumer: EventConsumer,
+        uow_factory: Callable[[], UnitOfWork],
+        flush_interval_ms: int = 500,
+        max_batch_size: int = 500,
+    ) -> None:
+        self._consumer = consumer
+        self._uow_factory = uow_factory
+        self._flush_interval_ms = flush_interval_ms
+        # batches never exceed the consumer prefetch, keep it at least this large
+        self._max_batch_size = max_batch_size
+
+    async def start(self) -> None:
+        await self._consumer.subscribe(list(FOLLOW_DELTAS))
+        async for batch in self._consumer.consume_batch(
+            max_items=self._max_batch_size, max_wait_ms=self._flush_interval_ms
+        ):
+            await self.flush(batch)
+
+    async def flush(self, events: list[IncomingEvent]) -> None:
+        deltas: CounterDeltas = defaultdict(lambda: defaultdict(int))
+        accepted: list[str] = []
+
+        for event in events:
+            try:
+                self._collect(event, deltas)
+            except Exception as e:
+                logger.error(
+                    f"Dead-lettering malformed follow event {event.event_id}: {e!r}"
+                )
+                await self._consumer.nack(event.event_id, requeue=False)
+                continue
+            accepted.append(event.event_id)
+
+        if not accepted:
+            return
+
+        changed = {
+            user_id: {name: delta for name, delta in counters.items() if delta}
+            for user_id, counters in deltas.items()
+            if any(counters.values())
+        }
+        try:
+            if changed:
+                async with self._uow_factory() as uow:
+                    await uow.profiles.apply_counter_deltas(changed)
+        except Exception as e:
+            logger.exception(f"Failed to flush counter deltas: {e}")
+            for event_id in accepted:
+                await self._consumer.nack(event_id, requeue=True)
+            return
+
+        await self._consumer.ack_batch(accepted)
+        logger.debug(
+            f"Flushed counter deltas of {len(accepted)} events for "
+            f"{len(changed)} profiles"
+        )
+
+    @staticmethod
+    def _collect(event: IncomingEvent, deltas: CounterDeltas) -> None:
+        delta = FOLLOW_DELTAS.get(event.event_type)
+        if delta is None:
+            raise ValueError(f"unexpected event type {event.event_type}")
+        aggregate_id = event.headers.get("aggregate_id")
+        if aggregate_id is None:
+            raise ValueError("missing aggregate_id header")
+        followed_id = UUID(str(aggregate_id))
+        follower_id = UUID(str(event.payload[FOLLOWER_ID_KEY]))
+        deltas[followed_id]["followers_count"] += delta
+        deltas[follower_id]["following_count"] += delta
@@ -0,0 +1,341 @@
+"""Replay dead-lettered events back to the queues they were rejected from.
+
+Usage::
+
+    python -m yukinoise_users.infrastructure.events.dlx_replay \\
+        --event-type user.followed --since 2026-01-20T08:00:00+00:00 --rate 50
+"""
+
+import argparse
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any
+
+from aio_pika import connect_robust, DeliveryMode, Message
+from aio_pika.abc import AbstractChannel, AbstractIncomingMessage, AbstractQueue
+
+from yukinoise_users.infrastructure.events.codecs import decode_body
+from yukinoise_users.infrastructure.events.consumer import (
+    ORIGINAL_ROUTING_KEY_HEADER,
+    RETRY_COUNT_HEADER,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ReplayStats:
+    scanned: int = 0
+    replayed: int = 0
+    skipped: int = 0
+    failed: int = 0
+
+
+class DeadLetterReplayer:
+    """Move messages from a dead-letter queue back to their original queues.
+
+    Each selected message is republished unchanged through the default
+    exchange to the queue named in its ``x-death`` header, so only the
+    consumer that rejected it sees it again, and acked once the broker
+    confirms the copy. Only the messages present when the replay starts are
+    scanned. Messages that are skipped, or whose copy was not confirmed, stay
+    unacked until the run ends and are then requeued, so the broker puts them
+    back in place with their ``x-death`` history intact. At most ``max_held``
+    of them are held at once; a run stops scanning when it reaches that, and a
+    dry run, which replays nothing, holds every message it scans.
+    """
+
+    def __init__(
+        self,
+        amqp_url: str,
+        queue_name: str = "yukinoise-users.dlq",
+        batch_size: int = 50,
+        rate_per_second: float = 100.0,
+        max_held: int = 1_000,
+    ) -> None:
+        self.amqp_url = amqp_url
+        self.queue_name = queue_name
+        self.batch_size = batch_size
+        self.rate_per_second = rate_per_second
+        self.max_held = max_held
+
+    async def replay(
+        self,
+        event_types: set[str] | None = None,
+        since: datetime | None = None,
+        until: datetime | None = None,
+        limit: int | None = None,
+        dry_run: bool = False,
+    ) -> ReplayStats:
+        connection = await connect_robust(
+            self.amqp_url,
+            client_properties={"connection_name": "yukinoise-users-dlx-replay"},
+        )
+        try:
+            channel = await connection.channel(publisher_confirms=True)
+            queue = await channel.declare_queue(self.queue_name, passive=True)
+            available = queue.declaration_result.message_count or 0
+            if limit is not None:
+                available = min(available, limit)
+            logger.info(f"Replaying up to {available} messages from {self.queue_name}")
+            stats = await self._replay(
+                channel, queue, available, event_types, since, until, dry_run
+            )
+        finally:
+            # the broker requeues whatever is still unacked when we go away
+            await connection.close()
+
+        logger.info(
+            f"Replay finished: {stats.replayed} replayed, {stats.skipped} skipped, "
+            f"{stats.failed} failed of {stats.scanned} scanned"
+        )
+        return stats
+
+    async def _replay(
+        self,
+        channel: AbstractChannel,
+        queue: AbstractQueue,
+        available: int,
+        event_types: set[str] | None,
+        since: datetime | None,
+        until: datetime | None,
+        dry_run: bool,
+    ) -> ReplayStats:
+        stats = ReplayStats()
+        # unacked messages block basic.get from returning them again, which
+        # is what lets the scan move past them
+        held: list[AbstractIncomingMessage] = []
+        loop = asyncio.get_running_loop()
+        try:
+            while stats.scanned < available:
+                if len(held) >= self.max_held:
+                    logger.warning(
+                        f"Stopped after holding {len(held)} messages, "
+                        f"{available - stats.scanned} left unscanned"
+                    )
+                    break
+                started = loop.time()
+                batch = await self._read_batch(
+                    queue,
+                    min(
+                        self.batch_size,
+                        available - stats.scanned,
+                        self.max_held - len(held),
+                    ),
+                )
+                if not batch:
+                    break
+                stats.scanned += len(batch)
+
+                selected: list[tuple[AbstractIncomingMessage, str]] = []
+                for message in batch:
+                    target = self._select(message, event_types, since, until)
+                    if target is None:
+                        stats.skipped += 1
+                        held.append(message)
+                    else:
+                        selected.append((message, target))
+
+                if dry_run:
+                    stats.replayed += len(selected)
+                    held.extend(message for message, _ in selected)
+                    continue
+
+                failed = await self._publish(channel, selected)
+                stats.replayed += len(selected) - len(failed)
+                stats.failed += len(failed)
+                held.extend(failed)
+                # pace whole batches so confirms are still awaited together
+                delay = started + len(selected) / self.rate_per_second - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+        finally:
+            await self._requeue(held)
+        return stats
+
+    async def _read_batch(
+        self, queue: AbstractQueue, size: int
+    ) -> list[AbstractIncomingMessage]:
+        batch: list[AbstractIncomingMessage] = []
+        while len(batch) < size:
+            message = await queue.get(no_ack=False, fail=False)
+            if message is None:
+                break
+            batch.append(message)
+        return batch
+
+    async def _publish(
+        self,
+        channel: AbstractChannel,
+        selected: list[tuple[AbstractIncomingMessage, str]],
+    ) -> list[AbstractIncomingMessage]:
+        """Publish copies through the default exchange, acking each confirmed one.
+
+        Returns the messages whose copy was not confirmed, still unacked.
+        """
+        if not selected:
+            return []
+        results = await asyncio.gather(
+            *(
+                channel.default_exchange.publish(
+                    self._original_message(message), routing_key=target
+                )
+                for message, target in selected
+            ),
+            return_exceptions=True,
+        )
+        failed: list[AbstractIncomingMessage] = []
+        for (message, target), result in zip(selected, results):
+            if isinstance(result, BaseException):
+                logger.error(
+                    f"Failed to publish message {message.message_id} "
+                    f"to {target}: {result}"
+                )
+                failed.append(message)
+            else:
+                await message.ack()
+        return failed
+
+    async def _requeue(self, messages: list[AbstractIncomingMessage]) -> None:
+        for message in messages:
+            try:
+                await message.nack(requeue=True)
+            except Exception as e:
+                # still unacked, so the broker requeues it with the connection
+                logger.warning(f"Failed to requeue message {message.message_id}: {e}")
+
+    def _select(
+        self,
+        message: AbstractIncomingMessage,
+        event_types: set[str] | None,
+        since: datetime | None,
+        until: datetime | None,
+    ) -> str | None:
+        """Return the queue to replay ``message`` to, None to skip it."""
+        death = self._last_death(message)
+        queue = death.get("queue")
+        if isinstance(queue, bytes):
+            queue = queue.decode()
+        if not isinstance(queue, str) or not queue:
+            logger.warning(f"Skipping message {message.message_id} without x-death")
+            return None
+
+        if event_types:
+            try:
+                body = decode_body(
+                    message.body, message.content_type, message.content_encoding
+                )
+            except Exception as e:
+                logger.warning(
+                    f"Skipping undecodable message {message.message_id}: {e}"
+                )
+                return None
+            if str(body.get("event_type")) not in event_types:
+                return None
+
+        dead_lettered_at = death.get("time") or message.timestamp
+        if not isinstance(dead_lettered_at, datetime):
+            dead_lettered_at = None
+        if since is not None and (dead_lettered_at is None or dead_lettered_at < since):
+            return None
+        if until is not None and (dead_lettered_at is None or dead_lettered_at > until):
+            return None
+        return queue
+
+    def _original_message(self, message: AbstractIncomingMessage) -> Message:
+        headers = dict(message.headers) if message.headers else {}
+        # a fresh set of delayed retries, and the routing key it was published
+        # with rather than the dead-letter one
+        headers.pop(RETRY_COUNT_HEADER, None)
+        routing_keys = self._last_death(message).get("routing-keys")
+        if isinstance(routing_keys, list) and routing_keys:
+            original = routing_keys[0]
+            if isinstance(original, bytes):
+                original = original.decode()
+            headers.setdefault(ORIGINAL_ROUTING_KEY_HEADER, str(original))
+        return Message(
+            body=message.body,
+            headers=headers,
+            content_type=message.content_type,
+            content_encoding=message.content_encoding,
+            message_id=message.message_id,
+            correlation_id=message.correlation_id,
+            timestamp=message.timestamp,
+            type=message.type,
+            delivery_mode=DeliveryMode.PERSISTENT,
+        )
+
+    @staticmethod
+    def _last_death(message: AbstractIncomingMessage) -> dict[str, Any]:
+        # x-death is ordered most recent first
+        x_death = (message.headers or {}).get("x-death")
+        if isinstance(x_death, list) and x_death and isinstance(x_death[0], dict):
+            return x_death[0]
+        return {}
+
+
+def _parse_time(value: str) -> datetime:
+    # broker timestamps are UTC, so naive times are read as UTC too
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def _parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--queue", default="yukinoise-users.dlq")
+    parser.add_argument(
+        "--event-type",
+        action="append",
+        dest="event_types",
+        help="replay only this event type, may be repeated",
+    )
+    parser.add_argument(
+        "--since",
+        type=_parse_time,
+        help="replay only messages dead-lettered at or after this ISO time",
+    )
+    parser.add_argument(
+        "--until",
+        type=_parse_time,
+        help="replay only messages dead-lettered at or before this ISO time",
+    )
+    parser.add_argument("--limit", type=int, help="scan at most this many messages")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--rate", type=float, default=100.0, help="messages per second")
+    parser.add_argument(
+        "--max-held",
+        type=int,
+        default=1_000,
+        help="stop after holding this many skipped or unconfirmed messages",
+    )
+    parser.add_argument("--dry-run", action="store_true")
+    return parser.parse_args(argv)
+
+
+async def _main(args: argparse.Namespace) -> None:
+    from yukinoise_users.core.conf import settings
+
+    replayer = DeadLetterReplayer(
+        settings.rabbitmq_url,
+        queue_name=args.queue,
+        batch_size=args.batch_size,
+        rate_per_second=args.rate,
+        max_held=args.max_held,
+    )
+    await replayer.replay(
+        event_types=set(args.event_types) if args.event_types else None,
+        since=args.since,
+        until=args.until,
+        limit=args.limit,
+        dry_run=args.dry_run,
+    )
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(_main(_parse_args()))
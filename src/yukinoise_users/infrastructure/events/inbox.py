@@ -0,0 +1,94 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Awaitable, Callable
+
+from yukinoise_users.domain.events import IncomingEvent
+from yukinoise_users.domain.repositories import UnitOfWork
+
+
+logger = logging.getLogger(__name__)
+
+InboxHandler = Callable[[IncomingEvent, UnitOfWork], Awaitable[bool]]
+
+
+class _HandlerDeclined(Exception):
+    """Raised inside the unit of work to roll back a handler returning False."""
+
+
+class InboxDeduplicator:
+    """Run a consumer's event handlers at most once per event id.
+
+    The id is recorded in ``users.processed_events`` under ``consumer`` inside
+    the handler's own UnitOfWork, so it commits together with the handler's
+    side effects and other consumers of the same event are not affected.
+    Recently processed ids are also kept in a bounded in-process LRU, letting
+    redeliveries be acked without touching the database. Events without a
+    producer-assigned id can't be recognised when redelivered and are handled
+    without deduplication.
+    """
+
+    def __init__(
+        self,
+        uow_factory: Callable[[], UnitOfWork],
+        consumer: str,
+        cache_size: int = 10_000,
+    ) -> None:
+        self._uow_factory = uow_factory
+        self._consumer = consumer
+        self._cache_size = cache_size
+        self._seen: OrderedDict[str, None] = OrderedDict()
+
+    def wrap(self, handler: InboxHandler) -> Callable[[IncomingEvent], Awaitable[bool]]:
+        async def deduplicated(event: IncomingEvent) -> bool:
+            return await self.handle(event, handler)
+
+        return deduplicated
+
+    async def handle(self, event: IncomingEvent, handler: InboxHandler) -> bool:
+        if not event.has_stable_id:
+            try:
+                async with self._uow_factory() as uow:
+                    if not await handler(event, uow):
+                        raise _HandlerDeclined()
+            except _HandlerDeclined:
+                return False
+            return True
+
+        if self._is_seen(event.event_id):
+            logger.debug(f"Skipping duplicate event {event.event_id} (cached)")
+            return True
+
+        try:
+            async with self._uow_factory() as uow:
+                if not await uow.inbox.mark_processed(
+                    self._consumer, event.event_id, event.event_type
+                ):
+                    logger.debug(f"Skipping duplicate event {event.event_id}")
+                    self._remember(event.event_id)
+                    return True
+                if not await handler(event, uow):
+                    raise _HandlerDeclined()
+        except _HandlerDeclined:
+            return False
+
+        self._remember(event.event_id)
+        return True
+
+    async def cleanup(self, older_than_days: int = 7) -> None:
+        cutoff_timestamp = int(time.time()) - (older_than_days * 24 * 60 * 60)
+        async with self._uow_factory() as uow:
+            await uow.inbox.delete_older_than(cutoff_timestamp)
+        logger.info(f"Deleted processed events older than {older_than_days} days")
+
+    def _is_seen(self, event_id: str) -> bool:
+        if event_id not in self._seen:
+            return False
+        self._seen.move_to_end(event_id)
+        return True
+
+    def _remember(self, event_id: str) -> None:
+        self._seen[event_id] = None
+        self._seen.move_to_end(event_id)
+        while len(self._seen) > self._cache_size:
+            self._seen.popitem(last=False)
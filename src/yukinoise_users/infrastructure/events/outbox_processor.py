@@ -1,86 +1,295 @@
 import asyncio
+import math
+import os
+import random
+import socket
 import time
 import logging
+from typing import Any, Callable
+from uuid import UUID, uuid4
 
-from yukinoise_users.domain.repositories import OutboxRepository
+import asyncpg
+
+from yukinoise_users.domain.events import DomainEvent, EventType
+from yukinoise_users.domain.models import OutboxEvent
+from yukinoise_users.domain.repositories import OutboxRepository, UnitOfWork
+from yukinoise_users.infrastructure.database.outbox_archiver import OutboxArchiver
 from yukinoise_users.infrastructure.events.producer import RabbitMQEventProducer
 from yukinoise_users.infrastructure.mapping.outbox_mapper import outbox_to_domain
 
 
 logger = logging.getLogger(__name__)
 
+# Event types whose payload carries the full latest state of the aggregate
+LATEST_STATE_EVENT_TYPES = frozenset(
+    {EventType.PROFILE_UPDATED, EventType.SETTINGS_UPDATED}
+)
+
 
 class OutboxProcessor:
     def __init__(
         self,
-        outbox_repo: OutboxRepository,
+        uow_factory: Callable[[], UnitOfWork],
         event_producer: RabbitMQEventProducer,
         batch_size: int = 100,
         max_retries: int = 5,
         retry_delay_seconds: float = 1.0,
+        max_retry_delay_seconds: float = 300.0,
+        worker_id: str | None = None,
+        lease_seconds: int = 60,
+        listen_dsn: str | None = None,
+        notify_channel: str = "users_outbox_events",
+        partitions_ahead_days: int = 3,
+        partition_check_seconds: float = 3600.0,
+        coalesce_event_types: frozenset[EventType] = frozenset(),
+        archiver: OutboxArchiver | None = None,
     ) -> None:
-        self._outbox_repo = outbox_repo
+        # every batch gets fresh short transactions, so no session, identity
+        # map or snapshot outlives a batch; outbox_unit_of_work runs them on
+        # the outbox engine's own pool
+        self._uow_factory = uow_factory
         self._event_producer = event_producer
         self._batch_size = batch_size
         self._max_retries = max_retries
         self._retry_delay = retry_delay_seconds
+        self._max_retry_delay = max_retry_delay_seconds
+        self._worker_id = (
+            worker_id or f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+        )
+        # must outlive one publish round, otherwise another worker reclaims rows
+        self._lease_seconds = lease_seconds
+        self._listen_dsn = listen_dsn
+        self._notify_channel = notify_channel
+        self._listen_conn: asyncpg.Connection | None = None
+        self._wakeup = asyncio.Event()
+        self._partitions_ahead_days = partitions_ahead_days
+        # re-checked while running, or rows past the window land in the
+        # default partition
+        self._partition_check_seconds = partition_check_seconds
+        self._next_partition_check = 0.0
+        self._coalesce_event_types = coalesce_event_types
+        self._archiver = archiver
         self._running = False
 
     async def process_pending_events(self) -> int:
-        events = await self._outbox_repo.get_pending_events(limit=self._batch_size)
+        _, sent = await self._process_batch()
+        return sent
+
+    async def _process_batch(self) -> tuple[int, int]:
+        """Claim and publish one batch, returning the claimed and sent counts."""
+        # the lease is committed right away and the broker is called outside
+        # any transaction, so no row lock is held while publishing
+        async with self._uow_factory() as uow:
+            events = await uow.outbox.claim_pending_events(
+                self._worker_id,
+                limit=self._batch_size,
+                lease_seconds=self._lease_seconds,
+            )
 
         if not events:
-            return 0
+            return 0, 0
 
-        processed_count = 0
+        publishable: list[tuple[OutboxEvent, DomainEvent]] = []
+        failures: list[tuple[OutboxEvent, BaseException]] = []
 
         for event in events:
             try:
-                domain_event = outbox_to_domain(event)
+                publishable.append((event, outbox_to_domain(event)))
+            except Exception as e:
+                logger.error(f"Failed to map outbox event {event.id}: {e}")
+                failures.append((event, e))
 
-                await self._event_producer.publish(domain_event)
+        publishable, superseded = self._coalesce(publishable)
+        sent: list[tuple[UUID, int]] = []
 
-                await self._outbox_repo.mark_event_sent(event.id)
-                processed_count += 1
+        if publishable:
+            try:
+                errors = await self._event_producer.publish_batch(
+                    [domain_event for _, domain_event in publishable]
+                )
+            except Exception as e:
+                logger.error(f"Failed to publish outbox batch: {e}")
+                errors = [e] * len(publishable)
 
-                logger.debug(f"Successfully published event {event.id}")
+            for (event, _), error in zip(publishable, errors):
+                # superseded events share the outcome of the event replacing them
+                covered = [event, *superseded.get(event.id, [])]
+                if error is None:
+                    sent.extend((e.id, e.created_at) for e in covered)
+                    logger.debug(f"Successfully published event {event.id}")
+                else:
+                    logger.error(f"Failed to publish event {event.id}: {error}")
+                    failures.extend((e, error) for e in covered)
 
-            except Exception as e:
-                logger.error(f"Failed to publish event {event.id}: {e}")
+        async with self._uow_factory() as uow:
+            await uow.outbox.mark_events_sent(sent, self._worker_id)
+            await self._handle_failures(uow.outbox, failures)
+
+        return len(events), len(sent)
+
+    def _coalesce(
+        self, publishable: list[tuple[OutboxEvent, DomainEvent]]
+    ) -> tuple[list[tuple[OutboxEvent, DomainEvent]], dict[UUID, list[OutboxEvent]]]:
+        """Keep only the newest event per aggregate for coalescable types.
+
+        Returns the events to publish and, keyed by the id of each kept event,
+        the older events it supersedes. Claimed batches are ordered by
+        ``created_at``, so the last occurrence is the newest.
+        """
+        if not self._coalesce_event_types:
+            return publishable, {}
+
+        newest: dict[tuple[EventType, UUID], int] = {}
+        for index, (_, domain_event) in enumerate(publishable):
+            if domain_event.event_type in self._coalesce_event_types:
+                key = (domain_event.event_type, domain_event.aggregate_id)
+                newest[key] = index
+
+        kept: list[tuple[OutboxEvent, DomainEvent]] = []
+        superseded: dict[UUID, list[OutboxEvent]] = {}
+        for index, (event, domain_event) in enumerate(publishable):
+            key = (domain_event.event_type, domain_event.aggregate_id)
+            survivor = newest.get(key, index)
+            if survivor == index:
+                kept.append((event, domain_event))
+            else:
+                superseded.setdefault(publishable[survivor][0].id, []).append(event)
+
+        if len(kept) < len(publishable):
+            logger.debug(
+                f"Coalesced {len(publishable) - len(kept)} superseded outbox events"
+            )
+        return kept, superseded
 
-                await self._outbox_repo.increment_retry_count(event.id)
+    async def _handle_failures(
+        self,
+        outbox: OutboxRepository,
+        failures: list[tuple[OutboxEvent, BaseException]],
+    ) -> None:
+        if not failures:
+            return
 
-                if event.retry_count + 1 >= self._max_retries:
-                    await self._outbox_repo.mark_event_failed(event.id, error=str(e))
-                    logger.warning(
-                        f"Event {event.id} marked as failed after "
-                        f"{self._max_retries} retries"
-                    )
+        # both release the lease they are guarded on, so each event gets one
+        exhausted = {
+            (event.id, event.created_at): str(error)
+            for event, error in failures
+            if event.retry_count + 1 >= self._max_retries
+        }
+        delays = {
+            (event.id, event.created_at): self._backoff_seconds(event.retry_count)
+            for event, _ in failures
+            if (event.id, event.created_at) not in exhausted
+        }
+        await outbox.schedule_retries(delays, self._worker_id)
+        await outbox.mark_events_failed(exhausted, self._worker_id)
+        for event_id, _ in exhausted:
+            logger.warning(
+                f"Event {event_id} marked as failed after "
+                f"{self._max_retries} retries"
+            )
 
-        return processed_count
+    def _backoff_seconds(self, retry_count: int) -> int:
+        delay = min(self._max_retry_delay, self._retry_delay * 2**retry_count)
+        # equal jitter keeps a floor while spreading retries of one outage apart
+        return max(1, math.ceil(random.uniform(delay / 2, delay)))
 
     async def start(self, interval_seconds: float = 5.0) -> None:
+        """Run until stopped.
+
+        With ``listen_dsn`` set, the processor wakes up on NOTIFY from the outbox
+        insert trigger and ``interval_seconds`` only acts as a safety-net poll.
+        """
         self._running = True
-        logger.info("Starting outbox processor")
+        logger.info(f"Starting outbox processor {self._worker_id}")
 
         await self._event_producer.connect()
 
         while self._running:
+            if self._listen_dsn is not None and self._listen_conn is None:
+                await self._listen()
+
+            if time.monotonic() >= self._next_partition_check:
+                await self._ensure_partitions()
+
+            self._wakeup.clear()
             try:
-                processed = await self.process_pending_events()
+                processed = await self._drain()
                 if processed > 0:
                     logger.info(f"Processed {processed} outbox events")
             except Exception as e:
                 logger.exception(f"Error in outbox processor: {e}")
 
-            await asyncio.sleep(interval_seconds)
+            await self._wait_for_wakeup(interval_seconds)
 
     async def stop(self) -> None:
         self._running = False
+        self._wakeup.set()
+        await self._unlisten()
         await self._event_producer.disconnect()
         logger.info("Stopped outbox processor")
 
+    async def _ensure_partitions(self) -> None:
+        try:
+            async with self._uow_factory() as uow:
+                created = await uow.outbox.ensure_partitions(
+                    self._partitions_ahead_days
+                )
+            if created:
+                logger.info(f"Created {created} outbox partitions")
+        except Exception as e:
+            logger.exception(f"Failed to ensure outbox partitions: {e}")
+        self._next_partition_check = time.monotonic() + self._partition_check_seconds
+
+    async def _drain(self) -> int:
+        total = 0
+        while self._running:
+            # a full claim means more may be pending even if publishing failed
+            claimed, sent = await self._process_batch()
+            total += sent
+            if claimed < self._batch_size:
+                break
+        return total
+
+    async def _wait_for_wakeup(self, timeout: float) -> None:
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _listen(self) -> None:
+        try:
+            conn = await asyncpg.connect(self._listen_dsn)
+            await conn.add_listener(self._notify_channel, self._on_notify)
+            conn.add_termination_listener(self._on_listen_terminated)
+        except Exception as e:
+            logger.warning(f"Outbox LISTEN unavailable, falling back to polling: {e}")
+            return
+        self._listen_conn = conn
+        logger.info(f"Listening for outbox notifications on {self._notify_channel}")
+
+    async def _unlisten(self) -> None:
+        conn, self._listen_conn = self._listen_conn, None
+        if conn is not None and not conn.is_closed():
+            await conn.close()
+
+    def _on_notify(self, conn: Any, pid: int, channel: str, payload: str) -> None:
+        self._wakeup.set()
+
+    def _on_listen_terminated(self, conn: Any) -> None:
+        logger.warning("Outbox LISTEN connection lost, reconnecting")
+        self._listen_conn = None
+        self._wakeup.set()
+
     async def cleanup_old_events(self, older_than_days: int = 7) -> None:
         cutoff_timestamp = int(time.time()) - (older_than_days * 24 * 60 * 60)
-        await self._outbox_repo.delete_events_older_than(cutoff_timestamp)
-        logger.info(f"Cleaned up outbox events older than {older_than_days} days")
+        async with self._uow_factory() as uow:
+            await uow.outbox.ensure_partitions(self._partitions_ahead_days)
+        if self._archiver is not None:
+            # archived partitions are dropped by the archiver itself
+            dropped = await self._archiver.archive_older_than(cutoff_timestamp)
+        else:
+            async with self._uow_factory() as uow:
+                dropped = await uow.outbox.drop_partitions_older_than(cutoff_timestamp)
+        logger.info(
+            f"Dropped {dropped} outbox partitions older than {older_than_days} days"
+        )
@@ -0,0 +1,73 @@
+import math
+import time
+
+
+class PrefetchTuner:
+    """Size a consumer prefetch from measured handler throughput and latency.
+
+    By Little's law the number of messages needed to keep handlers busy is
+    throughput times the time each message spends between delivery and ack.
+    The tuner adds ``headroom_seconds`` to the measured handler latency to
+    cover the broker round trip, so the next delivery is already buffered
+    when a handler frees up, without letting a large unacked backlog build.
+    """
+
+    def __init__(
+        self,
+        min_prefetch: int = 1,
+        max_prefetch: int = 256,
+        headroom_seconds: float = 0.05,
+        interval_seconds: float = 5.0,
+        tolerance: float = 0.2,
+    ) -> None:
+        if not 1 <= min_prefetch <= max_prefetch:
+            raise ValueError("Expected 1 <= min_prefetch <= max_prefetch")
+        self.min_prefetch = min_prefetch
+        self.max_prefetch = max_prefetch
+        self.headroom_seconds = headroom_seconds
+        self.interval_seconds = interval_seconds
+        # ignore small changes, every retune is a broker round trip
+        self.tolerance = tolerance
+
+        self._in_flight = 0
+        self._window_start = time.monotonic()
+        self._window_peak_in_flight = 0
+        self._window_completed = 0
+        self._window_latency = 0.0
+
+    def clamp(self, prefetch: int) -> int:
+        return max(self.min_prefetch, min(self.max_prefetch, prefetch))
+
+    def handler_started(self) -> None:
+        self._in_flight += 1
+        self._window_peak_in_flight = max(self._window_peak_in_flight, self._in_flight)
+
+    def handler_finished(self, latency_seconds: float) -> None:
+        self._in_flight -= 1
+        self._window_completed += 1
+        self._window_latency += latency_seconds
+
+    def recommend(self, current: int) -> int | None:
+        """Return a new prefetch once per interval, or None to keep ``current``."""
+        now = time.monotonic()
+        elapsed = now - self._window_start
+        if elapsed < self.interval_seconds or self._window_completed == 0:
+            return None
+
+        throughput = self._window_completed / elapsed
+        latency = self._window_latency / self._window_completed
+        desired = math.ceil(throughput * (latency + self.headroom_seconds))
+        if self._window_peak_in_flight >= current:
+            # every prefetched message was in a handler at once, so throughput
+            # was capped by the prefetch itself: grow geometrically
+            desired = max(desired, current * 2)
+        desired = self.clamp(desired)
+
+        self._window_start = now
+        self._window_peak_in_flight = self._in_flight
+        self._window_completed = 0
+        self._window_latency = 0.0
+
+        if abs(desired - current) < max(1, current * self.tolerance):
+            return None
+        return desired
@@ -1,87 +1,212 @@
-import json
+import asyncio
 import logging
 from typing import Any
 from uuid import uuid4
 
 from aio_pika import connect_robust, Message, DeliveryMode, ExchangeType
 from aio_pika.abc import AbstractRobustConnection, AbstractChannel, AbstractExchange
+from pamqp.commands import Basic
 
 from yukinoise_users.domain.events import DomainEvent
+from yukinoise_users.infrastructure.events.codecs import (
+    JSON_CONTENT_TYPE,
+    encode_body,
+    get_codec,
+)
 
 
 logger = logging.getLogger(__name__)
 
 
+ROUND_ROBIN = "round_robin"
+LEAST_LOADED = "least_loaded"
+
+
+class PublishNotConfirmedError(Exception):
+    """Broker did not ack a message published with confirms enabled."""
+
+
 class RabbitMQEventProducer:
     def __init__(
         self,
         amqp_url: str,
         exchange_name: str = "yukinoise.events",
         connection_name: str = "yukinoise-users-producer",
+        confirm_timeout: float | None = 30.0,
+        content_type: str = JSON_CONTENT_TYPE,
+        compression: str | None = None,
+        compression_threshold: int = 1024,
+        channel_pool_size: int = 1,
+        channel_selection: str = ROUND_ROBIN,
     ) -> None:
+        if channel_pool_size < 1:
+            raise ValueError("channel_pool_size must be at least 1")
+        if channel_selection not in (ROUND_ROBIN, LEAST_LOADED):
+            raise ValueError(f"Unknown channel selection: {channel_selection}")
         self.amqp_url = amqp_url
         self.exchange_name = exchange_name
         self.connection_name = connection_name
+        self.confirm_timeout = confirm_timeout
+        self.content_type = content_type
+        self.compression = compression
+        self.compression_threshold = compression_threshold
+        self.channel_pool_size = channel_pool_size
+        self.channel_selection = channel_selection
+        # fail fast on a codec whose library is not installed
+        get_codec(content_type)
         self._connection: AbstractRobustConnection | None = None
-        self._channel: AbstractChannel | None = None
-        self._exchange: AbstractExchange | None = None
+        self._channels: list[AbstractChannel] = []
+        self._exchanges: list[AbstractExchange] = []
+        # unconfirmed publishes per channel, used for least-loaded selection
+        self._in_flight: list[int] = []
+        self._next_channel = 0
 
     async def connect(self) -> None:
         if self._connection is not None and not self._connection.is_closed:
             return
 
+        # drop the channels of a previous connection that was lost
+        self._channels = []
+        self._exchanges = []
+        self._in_flight = []
+        self._next_channel = 0
         self._connection = await connect_robust(
             self.amqp_url,
             client_properties={"connection_name": self.connection_name},
         )
-        self._channel = await self._connection.channel()
-        self._exchange = await self._channel.declare_exchange(
-            self.exchange_name,
-            ExchangeType.TOPIC,
-            durable=True,
+        # each channel has its own frame stream and confirm sequence, so
+        # concurrent publishers on different channels do not queue behind
+        # each other
+        for _ in range(self.channel_pool_size):
+            channel = await self._connection.channel(publisher_confirms=True)
+            exchange = await channel.declare_exchange(
+                self.exchange_name,
+                ExchangeType.TOPIC,
+                durable=True,
+            )
+            self._channels.append(channel)
+            self._exchanges.append(exchange)
+            self._in_flight.append(0)
+        logger.info(
+            f"Connected to RabbitMQ exchange: {self.exchange_name} "
+            f"({self.channel_pool_size} channels)"
         )
-        logger.info(f"Connected to RabbitMQ exchange: {self.exchange_name}")
 
     async def disconnect(self) -> None:
-        if self._channel and not self._channel.is_closed:
-            await self._channel.close()
+        for channel in self._channels:
+            if not channel.is_closed:
+                await channel.close()
         if self._connection and not self._connection.is_closed:
             await self._connection.close()
         self._connection = None
-        self._channel = None
-        self._exchange = None
+        self._channels = []
+        self._exchanges = []
+        self._in_flight = []
+        self._next_channel = 0
         logger.info("Disconnected from RabbitMQ")
 
+    def _select_channel(self) -> int:
+        if self.channel_selection == LEAST_LOADED:
+            return min(range(len(self._exchanges)), key=self._in_flight.__getitem__)
+        index = self._next_channel % len(self._exchanges)
+        self._next_channel = index + 1
+        return index
+
+    async def _publish_message(
+        self, message: Message, routing_key: str, channel_index: int | None = None
+    ) -> Any:
+        index = self._select_channel() if channel_index is None else channel_index
+        self._in_flight[index] += 1
+        try:
+            return await self._exchanges[index].publish(
+                message,
+                routing_key=routing_key,
+                timeout=self.confirm_timeout,
+            )
+        finally:
+            # the pool may have been reset by a disconnect meanwhile
+            if index < len(self._in_flight):
+                self._in_flight[index] -= 1
+
     async def publish(self, event: DomainEvent) -> None:
-        if self._exchange is None:
+        if not self._exchanges:
+            await self.connect()
+
+        message = self._build_message(event)
+
+        await self._publish_message(message, event.event_type.value)
+        logger.debug(
+            f"Published event {event.event_type.value} with id {message.message_id}"
+        )
+
+    async def publish_batch(
+        self, events: list[DomainEvent]
+    ) -> list[BaseException | None]:
+        """Publish all events at once and wait for their confirms together.
+
+        Events of one aggregate go through the same channel, so the broker
+        receives them in the order given. Returns one entry per event, in
+        order: None when the broker acked the message, otherwise the error
+        (nack, return or timeout).
+        """
+        if not events:
+            return []
+        if not self._exchanges:
             await self.connect()
 
-        message_id = str(uuid4())
-        payload = self._serialize_event(event)
+        pool_size = len(self._exchanges)
+        confirmations = await asyncio.gather(
+            *(
+                self._publish_message(
+                    self._build_message(event),
+                    event.event_type.value,
+                    event.aggregate_id.int % pool_size,
+                )
+                for event in events
+            ),
+            return_exceptions=True,
+        )
+
+        results: list[BaseException | None] = []
+        for event, confirmation in zip(events, confirmations):
+            if isinstance(confirmation, BaseException):
+                results.append(confirmation)
+            elif not isinstance(confirmation, Basic.Ack):
+                results.append(
+                    PublishNotConfirmedError(
+                        f"Event {event.event_type.value} was not acked: "
+                        f"{confirmation!r}"
+                    )
+                )
+            else:
+                results.append(None)
+
+        failed = sum(1 for r in results if r is not None)
+        logger.debug(f"Published batch of {len(events)} events, {failed} not confirmed")
+        return results
+
+    def _build_message(self, event: DomainEvent) -> Message:
+        body, content_encoding = encode_body(
+            self._serialize_event(event),
+            self.content_type,
+            self.compression,
+            self.compression_threshold,
+        )
 
-        message = Message(
-            body=json.dumps(payload).encode("utf-8"),
+        return Message(
+            body=body,
             headers={
                 "event_type": event.event_type.value,
                 "aggregate_id": str(event.aggregate_id),
                 "correlation_id": event.correlation_id,
                 "causation_id": event.causation_id,
             },
-            message_id=message_id,
-            content_type="application/json",
+            message_id=event.event_id or str(uuid4()),
+            content_type=self.content_type,
+            content_encoding=content_encoding,
             delivery_mode=DeliveryMode.PERSISTENT,
         )
 
-        await self._exchange.publish(  # type: ignore
-            message,
-            routing_key=event.event_type.value,
-        )
-        logger.debug(f"Published event {event.event_type.value} with id {message_id}")
-
-    async def publish_batch(self, events: list[DomainEvent]) -> None:
-        for event in events:
-            await self.publish(event)
-
     def _serialize_event(self, event: DomainEvent) -> dict[str, Any]:
         return {
             "event_type": event.event_type.value,
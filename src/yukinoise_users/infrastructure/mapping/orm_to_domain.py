@@ -107,6 +107,9 @@ def outbox_orm_to_domain(outbox_orm: OutboxEventORM) -> OutboxEvent:
         status=outbox_orm.status,
         retry_count=outbox_orm.retry_count,
         error=outbox_orm.error,
+        locked_by=outbox_orm.locked_by,
+        locked_until=outbox_orm.locked_until,
+        next_attempt_at=outbox_orm.next_attempt_at,
     )
 
 
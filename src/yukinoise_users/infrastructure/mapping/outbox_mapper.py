@@ -22,4 +22,6 @@ def outbox_to_domain(outbox_event: Any) -> DomainEvent:
         event_type=event_type,
         aggregate_id=aggregate_id,
         payload=outbox_event.payload,
+        # stable across publish retries so consumers can deduplicate
+        event_id=str(outbox_event.id),
     )
@@ -0,0 +1,76 @@
+from typing import Any, Mapping
+
+from yukinoise_users.domain.models import Profile, UserSettings
+from yukinoise_users.domain.value_objects import UserPlaybackQuality
+
+# columns read by the asyncpg fast path, in the order of the domain fields
+PROFILE_COLUMNS = (
+    "user_id",
+    "display_name",
+    "bio",
+    "avatar_url",
+    "banner_url",
+    "location",
+    "social_links",
+    "preferred_genres",
+    "contact_email",
+    "tags",
+    "monthly_listeners",
+    "followers_count",
+    "following_count",
+    "releases_count",
+    "featured_in_releases_count",
+    "verified",
+    "updated_at",
+    "deleted_at",
+)
+
+SETTINGS_COLUMNS = (
+    "user_id",
+    "dark_mode",
+    "language",
+    "playback_quality",
+    "notifications_enabled",
+    "autoplay_enabled",
+    "data_consent",
+    "privacy_settings",
+    "updated_at",
+)
+
+
+def profile_record_to_domain(record: Mapping[str, Any]) -> Profile:
+    return Profile(
+        user_id=record["user_id"],
+        display_name=record["display_name"],
+        bio=record["bio"],
+        avatar_url=record["avatar_url"],
+        banner_url=record["banner_url"],
+        location=record["location"],
+        social_links=record["social_links"],
+        preferred_genres=record["preferred_genres"],
+        contact_email=record["contact_email"],
+        tags=record["tags"],
+        monthly_listeners=record["monthly_listeners"],
+        followers_count=record["followers_count"],
+        following_count=record["following_count"],
+        releases_count=record["releases_count"],
+        featured_in_releases_count=record["featured_in_releases_count"],
+        verified=record["verified"],
+        updated_at=record["updated_at"],
+        deleted_at=record["deleted_at"],
+    )
+
+
+def settings_record_to_domain(record: Mapping[str, Any]) -> UserSettings:
+    return UserSettings(
+        user_id=record["user_id"],
+        dark_mode=record["dark_mode"],
+        language=record["language"],
+        # the enum column stores member names, as written by SQLAlchemy
+        playback_quality=UserPlaybackQuality[record["playback_quality"]],
+        notifications_enabled=record["notifications_enabled"],
+        autoplay_enabled=record["autoplay_enabled"],
+        data_consent=record["data_consent"],
+        privacy_settings=record["privacy_settings"],
+        updated_at=record["updated_at"],
+    )
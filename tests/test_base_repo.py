@@ -0,0 +1,26 @@
+import random
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from yukinoise_users.infrastructure.database.repositories.users_repo import (
+    UsersRepository,
+)
+
+
+async def test_get_filtered_by_none_matches_null_columns(session: AsyncSession) -> None:
+    repo = UsersRepository(session)
+    # a login time no other user has, to keep the filter to these two
+    marker = random.randrange(1, 2**31)
+    active = await repo.create_from_keycloak(uuid4())
+    deleted = await repo.create_from_keycloak(uuid4())
+    for user in (active, deleted):
+        await repo.update(user.id, {"last_login_at": marker})
+    await repo.soft_delete(deleted.id, 1_700_000_000)
+
+    found = await repo.get_filtered_by(last_login_at=marker, deleted_at=None)
+    assert [user.id for user in found] == [active.id]
+
+    # same filter names with a value instead of None, built as another statement
+    found = await repo.get_filtered_by(last_login_at=marker, deleted_at=1_700_000_000)
+    assert [user.id for user in found] == [deleted.id]
@@ -0,0 +1,88 @@
+from datetime import datetime, timezone
+from enum import Enum
+from uuid import uuid4
+
+import pytest
+
+from yukinoise_users.infrastructure.events import codecs
+from yukinoise_users.infrastructure.events.codecs import (
+    GZIP_ENCODING,
+    MSGPACK_CONTENT_TYPE,
+    ZSTD_ENCODING,
+    JsonCodec,
+    UnsupportedCodecError,
+    decode_body,
+    encode_body,
+)
+
+
+class Color(Enum):
+    RED = "red"
+
+
+def _payload() -> dict[str, object]:
+    return {
+        "event_type": "user.updated",
+        "aggregate_id": uuid4(),
+        "payload": {
+            "display_name": "ユキ",
+            "at": datetime(2026, 1, 20, 8, 0, 0, 123456, tzinfo=timezone.utc),
+            "color": Color.RED,
+            "tags": ["live", None, 1.5, True],
+        },
+    }
+
+
+def test_stdlib_json_matches_orjson_byte_for_byte(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    pytest.importorskip("orjson")
+    payload = _payload()
+    fast = JsonCodec().encode(payload)
+
+    monkeypatch.setattr(codecs, "orjson", None)
+    slow = JsonCodec().encode(payload)
+
+    assert slow == fast
+    assert JsonCodec().decode(slow) == JsonCodec().decode(fast)
+
+
+@pytest.mark.parametrize("compression", [GZIP_ENCODING, ZSTD_ENCODING])
+def test_bodies_are_compressed_from_the_threshold_on(compression: str) -> None:
+    if compression == ZSTD_ENCODING:
+        pytest.importorskip("zstandard")
+    payload = {"bio": "x" * 64}
+    size = len(JsonCodec().encode(payload))
+
+    body, encoding = encode_body(
+        payload, compression=compression, compression_threshold=size + 1
+    )
+    assert encoding is None
+    assert decode_body(body, None, encoding) == payload
+
+    body, encoding = encode_body(
+        payload, compression=compression, compression_threshold=size
+    )
+    assert encoding == compression
+    assert body != JsonCodec().encode(payload)
+    assert decode_body(body, "application/json", encoding) == payload
+
+
+def test_msgpack_round_trips() -> None:
+    pytest.importorskip("msgpack")
+    payload = {"event_type": "user.updated", "payload": {"tags": ["live"]}}
+
+    body, _ = encode_body(payload, MSGPACK_CONTENT_TYPE)
+
+    assert decode_body(body, MSGPACK_CONTENT_TYPE, None) == payload
+
+
+@pytest.mark.parametrize(
+    "content_type, content_encoding",
+    [("application/xml", None), ("application/json", "br")],
+)
+def test_unknown_formats_are_rejected(
+    content_type: str, content_encoding: str | None
+) -> None:
+    with pytest.raises(UnsupportedCodecError):
+        decode_body(b"{}", content_type, content_encoding)
@@ -0,0 +1,36 @@
+import pytest
+
+from yukinoise_users.infrastructure.database.connection import InstrumentedAsyncPool
+
+
+class _Connection:
+    def rollback(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+def _refuse() -> _Connection:
+    raise ConnectionRefusedError("database is down")
+
+
+def test_pool_counts_only_successful_checkouts() -> None:
+    pool = InstrumentedAsyncPool(_Connection, pool_size=1, max_overflow=0)
+
+    connection = pool.connect()
+    connection.close()
+
+    assert pool.checkouts == 1
+    assert pool.waiting == 0
+
+
+def test_pool_does_not_count_failed_checkouts() -> None:
+    pool = InstrumentedAsyncPool(_refuse, pool_size=1, max_overflow=0)
+
+    with pytest.raises(ConnectionRefusedError):
+        pool.connect()
+
+    assert pool.checkouts == 0
+    assert pool.waiting == 0
+    assert pool.wait_seconds_total == 0.0
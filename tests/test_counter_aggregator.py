@@ -0,0 +1,102 @@
+"""CounterDeltaAggregator against an in-memory consumer and unit of work."""
+
+from typing import Any
+from uuid import UUID, uuid4
+
+from yukinoise_users.domain.events import IncomingEvent
+from yukinoise_users.infrastructure.events.counter_aggregator import (
+    CounterDeltaAggregator,
+)
+
+
+class FakeConsumer:
+    def __init__(self) -> None:
+        self.acked: list[str] = []
+        self.nacked: list[tuple[str, bool]] = []
+
+    async def ack_batch(self, event_ids: list[str]) -> None:
+        self.acked.extend(event_ids)
+
+    async def nack(self, event_id: str, requeue: bool = True) -> None:
+        self.nacked.append((event_id, requeue))
+
+
+class FakeProfiles:
+    def __init__(self) -> None:
+        self.applied: list[dict[UUID, dict[str, int]]] = []
+
+    async def apply_counter_deltas(self, deltas: dict[UUID, dict[str, int]]) -> None:
+        self.applied.append(deltas)
+
+
+class FakeUnitOfWork:
+    def __init__(self, profiles: FakeProfiles) -> None:
+        self.profiles = profiles
+
+    async def __aenter__(self) -> "FakeUnitOfWork":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        pass
+
+
+def _event(event_type: str, followed_id: Any, payload: dict[str, Any]) -> IncomingEvent:
+    headers = {"event_type": event_type}
+    if followed_id is not None:
+        headers["aggregate_id"] = str(followed_id)
+    return IncomingEvent(
+        event_id=str(uuid4()),
+        event_type=event_type,
+        payload=payload,
+        routing_key=event_type,
+        headers=headers,
+    )
+
+
+async def test_deltas_come_from_the_aggregate_and_follower_ids() -> None:
+    consumer, profiles = FakeConsumer(), FakeProfiles()
+    aggregator = CounterDeltaAggregator(
+        consumer,  # type: ignore[arg-type]
+        lambda: FakeUnitOfWork(profiles),  # type: ignore[arg-type,return-value]
+    )
+    artist, fan, other_fan = uuid4(), uuid4(), uuid4()
+    events = [
+        _event("user.followed", artist, {"follower_id": str(fan)}),
+        _event("user.followed", artist, {"follower_id": str(other_fan)}),
+        _event("user.unfollowed", artist, {"follower_id": str(fan)}),
+    ]
+
+    await aggregator.flush(events)
+
+    assert profiles.applied == [
+        {
+            artist: {"followers_count": 1},
+            other_fan: {"following_count": 1},
+        }
+    ]
+    assert consumer.acked == [event.event_id for event in events]
+    assert consumer.nacked == []
+
+
+async def test_malformed_events_are_dead_lettered_not_acked() -> None:
+    consumer, profiles = FakeConsumer(), FakeProfiles()
+    aggregator = CounterDeltaAggregator(
+        consumer,  # type: ignore[arg-type]
+        lambda: FakeUnitOfWork(profiles),  # type: ignore[arg-type,return-value]
+    )
+    artist, fan = uuid4(), uuid4()
+    valid = _event("user.followed", artist, {"follower_id": str(fan)})
+    malformed = [
+        # the follower only under the old, never emitted key
+        _event("user.followed", artist, {"user_id": str(fan)}),
+        _event("user.followed", None, {"follower_id": str(fan)}),
+        _event("user.followed", "not-a-uuid", {"follower_id": str(fan)}),
+    ]
+
+    await aggregator.flush([valid, *malformed])
+
+    assert profiles.applied == [
+        {artist: {"followers_count": 1}, fan: {"following_count": 1}}
+    ]
+    assert consumer.acked == [valid.event_id]
+    assert consumer.nacked == [(event.event_id, False) for event in malformed]
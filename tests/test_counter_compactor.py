@@ -0,0 +1,45 @@
+from yukinoise_users.infrastructure.database.counter_compactor import (
+    CounterShardCompactor,
+)
+
+
+class FakeProfiles:
+    def __init__(self, backlog: int) -> None:
+        self.backlog = backlog
+        self.limits: list[int] = []
+
+    async def compact_counter_shards(self, limit: int = 1000) -> int:
+        self.limits.append(limit)
+        compacted = min(limit, self.backlog)
+        self.backlog -= compacted
+        return compacted
+
+
+class FakeUnitOfWork:
+    def __init__(self, profiles: FakeProfiles) -> None:
+        self.profiles = profiles
+        self.transactions = 0
+
+    async def __aenter__(self) -> "FakeUnitOfWork":
+        self.transactions += 1
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        pass
+
+
+async def test_compact_drains_the_backlog_one_transaction_per_batch() -> None:
+    profiles = FakeProfiles(backlog=25)
+    uow = FakeUnitOfWork(profiles)
+    compactor = CounterShardCompactor(
+        lambda: uow, batch_size=10  # type: ignore[arg-type,return-value]
+    )
+
+    assert await compactor.compact() == 25
+    assert profiles.limits == [10, 10, 10]
+    assert uow.transactions == 3
+
+    # a full last batch takes one more, empty, round to notice
+    profiles.backlog = 20
+    assert await compactor.compact() == 20
+    assert uow.transactions == 6
@@ -0,0 +1,148 @@
+"""DeadLetterReplayer against an in-memory dead-letter queue."""
+
+import json
+from typing import Any
+
+from aio_pika import Message
+
+from yukinoise_users.infrastructure.events.dlx_replay import DeadLetterReplayer
+
+
+class FakeMessage:
+    def __init__(self, position: int, event_type: str, queue: str) -> None:
+        self.position = position
+        self.message_id = f"event-{position}"
+        self.headers: dict[str, Any] = {
+            "x-retry-count": 3,
+            "x-death": [
+                {"queue": queue, "routing-keys": [event_type], "count": 1},
+            ],
+        }
+        self.body = json.dumps({"event_type": event_type}).encode()
+        self.content_type = "application/json"
+        self.content_encoding = None
+        self.correlation_id = None
+        self.timestamp = None
+        self.type = None
+        self.dlq: "FakeQueue | None" = None
+
+    async def ack(self) -> None:
+        assert self.dlq is not None
+        self.dlq.unacked.remove(self)
+
+    async def nack(self, requeue: bool = True) -> None:
+        assert self.dlq is not None and requeue
+        self.dlq.unacked.remove(self)
+        # like the broker, back in its old place rather than at the tail
+        self.dlq.ready.append(self)
+        self.dlq.ready.sort(key=lambda message: message.position)
+
+
+class FakeQueue:
+    def __init__(self, messages: list[FakeMessage]) -> None:
+        self.ready = list(messages)
+        self.unacked: list[FakeMessage] = []
+        for message in messages:
+            message.dlq = self
+
+    async def get(self, no_ack: bool = False, fail: bool = True) -> FakeMessage | None:
+        if not self.ready:
+            return None
+        message = self.ready.pop(0)
+        self.unacked.append(message)
+        return message
+
+
+class FakeExchange:
+    def __init__(self, failing: set[str]) -> None:
+        self.failing = failing
+        self.published: list[tuple[str, Message]] = []
+
+    async def publish(self, message: Message, routing_key: str) -> None:
+        if message.message_id in self.failing:
+            raise RuntimeError("nacked by the broker")
+        self.published.append((routing_key, message))
+
+
+class FakeChannel:
+    def __init__(self, failing: set[str] | None = None) -> None:
+        self.default_exchange = FakeExchange(failing or set())
+
+
+def _dead_letters() -> list[FakeMessage]:
+    event_types = ["user.followed", "user.updated", "user.followed", "user.updated"]
+    return [
+        FakeMessage(position, event_type, f"{event_type}-queue")
+        for position, event_type in enumerate(event_types, start=1)
+    ]
+
+
+async def _replay(
+    replayer: DeadLetterReplayer,
+    dlq: FakeQueue,
+    channel: FakeChannel,
+    dry_run: bool = False,
+) -> Any:
+    return await replayer._replay(
+        channel,  # type: ignore[arg-type]
+        dlq,  # type: ignore[arg-type]
+        len(dlq.ready),
+        {"user.followed"},
+        None,
+        None,
+        dry_run,
+    )
+
+
+async def test_skipped_messages_are_requeued_in_place_with_their_headers() -> None:
+    messages = _dead_letters()
+    dlq, channel = FakeQueue(messages), FakeChannel()
+    replayer = DeadLetterReplayer(
+        "amqp://localhost/", batch_size=3, rate_per_second=1e6
+    )
+
+    stats = await _replay(replayer, dlq, channel)
+
+    assert (stats.scanned, stats.replayed, stats.skipped, stats.failed) == (4, 2, 2, 0)
+    published = channel.default_exchange.published
+    assert [(queue, m.message_id) for queue, m in published] == [
+        ("user.followed-queue", "event-1"),
+        ("user.followed-queue", "event-3"),
+    ]
+    assert "x-retry-count" not in published[0][1].headers
+    assert published[0][1].headers["x-original-routing-key"] == "user.followed"
+    # skips were never republished, so the broker's x-death is untouched
+    assert [m.message_id for m in dlq.ready] == ["event-2", "event-4"]
+    assert dlq.ready[0].headers["x-death"][0]["queue"] == "user.updated-queue"
+    assert dlq.unacked == []
+
+
+async def test_unconfirmed_publishes_are_counted_and_requeued() -> None:
+    dlq, channel = FakeQueue(_dead_letters()), FakeChannel(failing={"event-1"})
+    replayer = DeadLetterReplayer(
+        "amqp://localhost/", batch_size=1, rate_per_second=1e6
+    )
+
+    stats = await _replay(replayer, dlq, channel)
+
+    assert (stats.scanned, stats.replayed, stats.skipped, stats.failed) == (4, 1, 2, 1)
+    assert [m.message_id for _, m in channel.default_exchange.published] == ["event-3"]
+    assert [m.message_id for m in dlq.ready] == ["event-1", "event-2", "event-4"]
+    assert dlq.unacked == []
+
+
+async def test_dry_run_stops_at_max_held_and_leaves_the_queue_as_it_was() -> None:
+    dlq, channel = FakeQueue(_dead_letters()), FakeChannel()
+    replayer = DeadLetterReplayer("amqp://localhost/", batch_size=3, max_held=2)
+
+    stats = await _replay(replayer, dlq, channel, dry_run=True)
+
+    assert (stats.scanned, stats.replayed, stats.skipped) == (2, 1, 1)
+    assert channel.default_exchange.published == []
+    assert [m.message_id for m in dlq.ready] == [
+        "event-1",
+        "event-2",
+        "event-3",
+        "event-4",
+    ]
+    assert dlq.unacked == []
@@ -0,0 +1,57 @@
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from yukinoise_users.infrastructure.database.fast_reads import FastReads
+from yukinoise_users.infrastructure.database.models.user_settings_model import (
+    UserPlaybackQuality,
+)
+from yukinoise_users.infrastructure.database.repositories.profiles_repo import (
+    ProfilesRepository,
+)
+from yukinoise_users.infrastructure.database.repositories.user_settings_repo import (
+    UserSettingsRepository,
+)
+from yukinoise_users.infrastructure.database.repositories.users_repo import (
+    UsersRepository,
+)
+from yukinoise_users.infrastructure.mapping.orm_to_domain import (
+    profile_orm_to_domain,
+    settings_orm_to_domain,
+)
+
+
+async def test_fast_reads_match_the_orm_mapping(session: AsyncSession) -> None:
+    user = await UsersRepository(session).create_from_keycloak(uuid4())
+    profiles = ProfilesRepository(session)
+    settings = UserSettingsRepository(session)
+    display_name = f"fast-reads-{user.id}"
+    await profiles.create(
+        user.id,
+        display_name=display_name,
+        bio="bio",
+        social_links={"site": "https://example.com"},
+        preferred_genres=["ambient", "techno"],
+        tags=["live"],
+        followers_count=7,
+        verified=True,
+    )
+    await settings.create(
+        user.id,
+        language="ja",
+        playback_quality=UserPlaybackQuality.HIGH,
+        privacy_settings={"show_email": False},
+    )
+    fast_reads = FastReads(session)
+
+    profile = profile_orm_to_domain(await profiles.get_by_user_id(user.id))
+    assert profile is not None
+    assert await fast_reads.get_profile_by_user_id(user.id) == profile
+    assert await fast_reads.get_profile_by_display_name(display_name) == profile
+
+    user_settings = settings_orm_to_domain(await settings.get_by_user_id(user.id))
+    assert user_settings is not None
+    assert await fast_reads.get_settings_by_user_id(user.id) == user_settings
+
+    assert await fast_reads.get_profile_by_user_id(uuid4()) is None
+    assert await fast_reads.get_settings_by_user_id(uuid4()) is None
@@ -0,0 +1,117 @@
+"""InboxDeduplicator against an in-memory processed events table."""
+
+from uuid import uuid4
+
+from yukinoise_users.domain.events import IncomingEvent
+from yukinoise_users.domain.repositories import UnitOfWork
+from yukinoise_users.infrastructure.events.inbox import InboxDeduplicator
+
+
+class FakeInbox:
+    def __init__(self) -> None:
+        self.committed: set[tuple[str, str]] = set()
+        self.pending: set[tuple[str, str]] = set()
+        self.lookups = 0
+
+    async def mark_processed(
+        self, consumer: str, event_id: str, event_type: str
+    ) -> bool:
+        self.lookups += 1
+        key = (consumer, event_id)
+        if key in self.committed or key in self.pending:
+            return False
+        self.pending.add(key)
+        return True
+
+
+class FakeUnitOfWork:
+    def __init__(self, inbox: FakeInbox) -> None:
+        self.inbox = inbox
+
+    async def __aenter__(self) -> "FakeUnitOfWork":
+        return self
+
+    async def __aexit__(self, exc_type: object, *exc_info: object) -> None:
+        if exc_type is None:
+            self.inbox.committed |= self.inbox.pending
+        self.inbox.pending.clear()
+
+
+def _event(event_id: str | None = None) -> IncomingEvent:
+    return IncomingEvent(
+        event_id=event_id or str(uuid4()),
+        event_type="user.updated",
+        payload={},
+        routing_key="user.updated",
+        has_stable_id=event_id is not None,
+    )
+
+
+class Handler:
+    def __init__(self, result: bool = True) -> None:
+        self.result = result
+        self.handled: list[str] = []
+
+    async def __call__(self, event: IncomingEvent, uow: UnitOfWork) -> bool:
+        self.handled.append(event.event_id)
+        return self.result
+
+
+def _inbox(cache_size: int = 10_000) -> tuple[InboxDeduplicator, FakeInbox]:
+    inbox = FakeInbox()
+    deduplicator = InboxDeduplicator(
+        lambda: FakeUnitOfWork(inbox),  # type: ignore[arg-type,return-value]
+        "search-indexer",
+        cache_size=cache_size,
+    )
+    return deduplicator, inbox
+
+
+async def test_recent_duplicates_are_skipped_without_a_lookup() -> None:
+    deduplicator, inbox = _inbox()
+    handler = Handler()
+
+    assert await deduplicator.handle(_event("a"), handler)
+    assert await deduplicator.handle(_event("a"), handler)
+
+    assert handler.handled == ["a"]
+    assert inbox.lookups == 1
+
+
+async def test_the_cache_evicts_the_least_recently_seen_id() -> None:
+    deduplicator, inbox = _inbox(cache_size=2)
+    handler = Handler()
+    for event_id in ["a", "b", "a", "c"]:
+        await deduplicator.handle(_event(event_id), handler)
+    assert inbox.lookups == 3
+
+    # "a" was seen again before "c" came in, so "b" went
+    await deduplicator.handle(_event("a"), handler)
+    assert inbox.lookups == 3
+    await deduplicator.handle(_event("b"), handler)
+    assert inbox.lookups == 4
+    assert handler.handled == ["a", "b", "c"]
+
+
+async def test_events_without_a_stable_id_bypass_deduplication() -> None:
+    deduplicator, inbox = _inbox()
+    handler = Handler()
+    event = _event()
+
+    assert await deduplicator.handle(event, handler)
+    assert await deduplicator.handle(event, handler)
+
+    assert handler.handled == [event.event_id, event.event_id]
+    assert inbox.lookups == 0
+
+
+async def test_a_declined_event_is_not_recorded() -> None:
+    deduplicator, inbox = _inbox()
+
+    assert not await deduplicator.handle(_event("a"), Handler(result=False))
+    assert inbox.committed == set()
+
+    handler = Handler()
+    assert await deduplicator.handle(_event("a"), handler)
+    assert handler.handled == ["a"]
+    assert inbox.committed == {("search-indexer", "a")}
@@ -0,0 +1,97 @@
+import base64
+import json
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from yukinoise_users.infrastructure.database.models.profiles_model import ProfileORM
+from yukinoise_users.infrastructure.database.repositories.keyset import Keyset
+from yukinoise_users.infrastructure.database.repositories.profiles_repo import (
+    ProfilesRepository,
+)
+from yukinoise_users.infrastructure.database.repositories.users_repo import (
+    UsersRepository,
+)
+
+
+def _keyset(name: str = "profiles_top_by_followers") -> Keyset:
+    return Keyset(
+        name,
+        select(ProfileORM),
+        [ProfileORM.followers_count, ProfileORM.user_id],
+        lambda p: [p.followers_count, p.user_id],
+    )
+
+
+def test_next_page_compares_the_whole_key_as_a_row() -> None:
+    sql = str(_keyset().next_page.compile(dialect=postgresql.dialect()))
+
+    assert "(users.profiles.followers_count, users.profiles.user_id) < (" in sql
+    assert (
+        "ORDER BY users.profiles.followers_count DESC, users.profiles.user_id DESC"
+        in sql
+    )
+
+
+def test_cursor_round_trips_key_values() -> None:
+    keyset = _keyset()
+    user_id = uuid4()
+
+    assert keyset.decode(keyset.encode([42, user_id])) == [42, user_id]
+
+
+def test_cursors_are_unpadded_url_safe_tokens() -> None:
+    cursor = _keyset().encode([2_000_000_007, uuid4()])
+
+    assert cursor.isascii()
+    assert not set(cursor) & set("=+/")
+
+
+def _raw_cursor(value: object) -> str:
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode()
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not a cursor",
+        _keyset("other").encode([1, uuid4()]),
+        _keyset().encode([1]),
+        _keyset().encode(["many", uuid4()]),
+        _keyset().encode([1, "not-a-uuid"]),
+        _raw_cursor(42),
+        _raw_cursor([]),
+    ],
+)
+def test_decode_rejects_foreign_cursors(cursor: str) -> None:
+    with pytest.raises(ValueError):
+        _keyset().decode(cursor)
+
+
+async def test_pages_split_ties_without_skipping_or_repeating(
+    session: AsyncSession,
+) -> None:
+    users = UsersRepository(session)
+    profiles = ProfilesRepository(session)
+    # far above any other profile in the database, so these lead the listing
+    counts = [2_000_000_007, 2_000_000_007, 2_000_000_007, 2_000_000_005, 2_000_000_005]
+    expected = []
+    for followers_count in counts:
+        user = await users.create_from_keycloak(uuid4())
+        await profiles.create(
+            user.id, display_name=f"keyset-{user.id}", followers_count=followers_count
+        )
+        expected.append((followers_count, user.id))
+    expected.sort(reverse=True)
+
+    seen: list[tuple[int, object]] = []
+    page, cursor = await profiles.get_top_by_followers_page(limit=2)
+    seen.extend((p.followers_count, p.user_id) for p in page)
+    while cursor is not None and len(seen) < len(expected):
+        page, cursor = await profiles.get_top_by_followers_page(limit=2, cursor=cursor)
+        seen.extend((p.followers_count, p.user_id) for p in page)
+
+    assert seen[: len(expected)] == expected
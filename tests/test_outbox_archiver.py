@@ -0,0 +1,156 @@
+"""OutboxArchiver against an in-memory outbox, writing to a temporary directory."""
+
+import gzip
+import json
+from pathlib import Path
+from typing import AsyncIterator
+from uuid import uuid4
+
+from yukinoise_users.domain.models import OutboxEvent
+from yukinoise_users.domain.value_objects import OutboxStatus
+from yukinoise_users.infrastructure.database.outbox_archiver import (
+    DAY_SECONDS,
+    INDEX_FILE_NAME,
+    OutboxArchiver,
+)
+
+
+# 2026-01-20T00:00:00Z
+DAY_START = 1_768_867_200
+
+
+class FakeOutbox:
+    def __init__(self, events: list[OutboxEvent]) -> None:
+        self.events = events
+        self.dropped: list[int] = []
+
+    async def get_partition_days_before(self, timestamp: int) -> list[int]:
+        days = {e.created_at - e.created_at % DAY_SECONDS for e in self.events}
+        return sorted(day for day in days - set(self.dropped) if day < timestamp)
+
+    async def has_pending_events_between(self, start: int, end: int) -> bool:
+        return any(
+            start <= e.created_at < end and e.status == OutboxStatus.PENDING
+            for e in self.events
+        )
+
+    async def stream_events_between(
+        self, start: int, end: int, batch_size: int
+    ) -> AsyncIterator[OutboxEvent]:
+        for event in sorted(self.events, key=lambda e: e.created_at):
+            if start <= event.created_at < end:
+                yield event
+
+    async def drop_partition(self, day_start: int) -> bool:
+        self.dropped.append(day_start)
+        self.events = [
+            e
+            for e in self.events
+            if not day_start <= e.created_at < day_start + DAY_SECONDS
+        ]
+        return True
+
+
+class FakeUnitOfWork:
+    def __init__(self, outbox: FakeOutbox) -> None:
+        self.outbox = outbox
+
+    async def __aenter__(self) -> "FakeUnitOfWork":
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        pass
+
+
+def _event(created_at: int, status: OutboxStatus = OutboxStatus.SENT) -> OutboxEvent:
+    return OutboxEvent(
+        id=uuid4(),
+        event_type="user.updated",
+        created_at=created_at,
+        payload={"user_id": str(uuid4())},
+        status=status,
+    )
+
+
+def _archiver(outbox: FakeOutbox, archive_dir: Path, **kwargs: int) -> OutboxArchiver:
+    return OutboxArchiver(
+        lambda: FakeUnitOfWork(outbox),  # type: ignore[arg-type,return-value]
+        archive_dir,
+        batch_size=2,
+        **kwargs,
+    )
+
+
+def _index(archive_dir: Path) -> list[dict[str, object]]:
+    lines = (archive_dir / INDEX_FILE_NAME).read_text(encoding="utf-8").splitlines()
+    return [json.loads(line) for line in lines]
+
+
+async def test_days_are_archived_to_rotated_segments_and_indexed(
+    tmp_path: Path,
+) -> None:
+    events = [_event(DAY_START + second) for second in range(5)]
+    outbox = FakeOutbox(list(events))
+
+    dropped = await _archiver(
+        outbox, tmp_path, segment_max_events=2
+    ).archive_older_than(DAY_START + DAY_SECONDS + 60)
+
+    assert dropped == 1
+    assert outbox.dropped == [DAY_START]
+    assert _index(tmp_path) == [
+        {
+            "segment": f"outbox-20260120-{n:04d}.jsonl.gz",
+            "day": "20260120",
+            "events": count,
+            "from": DAY_START + 2 * n,
+            "to": DAY_START + 2 * n + count - 1,
+        }
+        for n, count in enumerate([2, 2, 1])
+    ]
+    records = []
+    for entry in _index(tmp_path):
+        with gzip.open(tmp_path / str(entry["segment"]), "rt", encoding="utf-8") as f:
+            records.extend(json.loads(line) for line in f)
+    assert [r["id"] for r in records] == [str(e.id) for e in events]
+    assert records[0] == {
+        "id": str(events[0].id),
+        "event_type": "user.updated",
+        "created_at": DAY_START,
+        "updated_at": None,
+        "status": "sent",
+        "retry_count": 0,
+        "error": None,
+        "payload": events[0].payload,
+    }
+
+
+async def test_days_with_pending_events_are_kept(tmp_path: Path) -> None:
+    outbox = FakeOutbox(
+        [_event(DAY_START), _event(DAY_START + DAY_SECONDS, OutboxStatus.PENDING)]
+    )
+
+    dropped = await _archiver(outbox, tmp_path).archive_older_than(
+        DAY_START + 2 * DAY_SECONDS
+    )
+
+    assert dropped == 1
+    assert outbox.dropped == [DAY_START]
+    assert [entry["day"] for entry in _index(tmp_path)] == ["20260120"]
+
+
+async def test_an_indexed_day_is_dropped_without_archiving_it_again(
+    tmp_path: Path,
+) -> None:
+    (tmp_path / INDEX_FILE_NAME).write_text(
+        json.dumps({"segment": None, "day": "20260120", "events": 0}) + "\n",
+        encoding="utf-8",
+    )
+    outbox = FakeOutbox([_event(DAY_START)])
+
+    assert (
+        await _archiver(outbox, tmp_path).archive_older_than(DAY_START + DAY_SECONDS)
+        == 1
+    )
+    assert len(_index(tmp_path)) == 1
+    assert list(tmp_path.glob("*.jsonl.gz")) == []
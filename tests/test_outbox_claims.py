@@ -0,0 +1,122 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from yukinoise_users.infrastructure.database.repositories.outbox_event_repo import (
+    OutboxEventRepository,
+)
+
+
+async def _create_events(engine: AsyncEngine, count: int) -> list:
+    """Create events and return their (id, created_at) keys."""
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        repo = OutboxEventRepository(session)
+        events = [
+            await repo.create_event("user.created", {"n": n}) for n in range(count)
+        ]
+        await session.commit()
+    return [(event.id, event.created_at) for event in events]
+
+
+async def _status(engine: AsyncEngine, event_id: object) -> tuple:
+    async with engine.connect() as connection:
+        result = await connection.execute(
+            text(
+                "SELECT status::text, locked_by FROM users.outbox_events WHERE id = :id"
+            ),
+            {"id": event_id},
+        )
+        return tuple(result.one())
+
+
+async def test_claim_skips_rows_locked_by_another_claim(
+    engine: AsyncEngine, empty_outbox: None
+) -> None:
+    keys = await _create_events(engine, 3)
+
+    async with AsyncSession(engine) as first, AsyncSession(engine) as second:
+        # the first claim is left uncommitted, so its rows stay locked
+        claimed_first = await OutboxEventRepository(first).claim_pending_events(
+            "worker-a", limit=2
+        )
+        claimed_second = await OutboxEventRepository(second).claim_pending_events(
+            "worker-b", limit=10
+        )
+
+        first_ids = {e.id for e in claimed_first}
+        second_ids = {e.id for e in claimed_second}
+        assert len(first_ids) == 2
+        assert len(second_ids) == 1
+        assert first_ids | second_ids == {event_id for event_id, _ in keys}
+        await first.rollback()
+        await second.rollback()
+
+
+async def test_claim_skips_rows_under_an_active_lease(
+    engine: AsyncEngine, empty_outbox: None
+) -> None:
+    ((event_id, _),) = await _create_events(engine, 1)
+
+    async with AsyncSession(engine) as session:
+        repo = OutboxEventRepository(session)
+        assert len(await repo.claim_pending_events("worker-a", lease_seconds=60)) == 1
+        await session.commit()
+        assert await repo.claim_pending_events("worker-b") == []
+        await session.commit()
+
+    assert await _status(engine, event_id) == ("pending", "worker-a")
+
+
+async def test_expired_lease_cannot_settle_a_reclaimed_event(
+    engine: AsyncEngine, empty_outbox: None
+) -> None:
+    (key,) = await _create_events(engine, 1)
+    event_id, created_at = key
+
+    async with AsyncSession(engine) as session:
+        repo = OutboxEventRepository(session)
+        await repo.claim_pending_events("worker-a", lease_seconds=-1)
+        await session.commit()
+        assert len(await repo.claim_pending_events("worker-b")) == 1
+        await session.commit()
+
+        await repo.mark_events_sent([key], "worker-a")
+        await repo.schedule_retries({key: 30}, "worker-a")
+        await repo.mark_events_failed({key: "lost lease"}, "worker-a")
+        await repo.mark_event_sent(event_id, created_at, "worker-a")
+        await repo.increment_retry_count(event_id, created_at, "worker-a")
+        await repo.mark_event_failed(event_id, created_at, "lost lease", "worker-a")
+        await session.commit()
+        assert await _status(engine, event_id) == ("pending", "worker-b")
+
+        await repo.mark_events_sent([key], "worker-b")
+        await session.commit()
+
+    assert await _status(engine, event_id) == ("sent", None)
+
+
+async def test_batch_transitions_apply_per_event_values(
+    engine: AsyncEngine, empty_outbox: None
+) -> None:
+    retried, failed = await _create_events(engine, 2)
+
+    async with AsyncSession(engine) as session:
+        repo = OutboxEventRepository(session)
+        await repo.claim_pending_events("worker-a")
+        await repo.schedule_retries({retried: 3600}, "worker-a")
+        await repo.mark_events_failed({failed: "broker down"}, "worker-a")
+        await session.commit()
+
+    async with engine.connect() as connection:
+        result = await connection.execute(
+            text(
+                "SELECT id, status::text, locked_by, retry_count, error,"
+                " next_attempt_at - extract(epoch FROM now())::int"
+                " FROM users.outbox_events"
+            )
+        )
+        rows = {row[0]: tuple(row[1:]) for row in result}
+
+    status, locked_by, retry_count, _, delay = rows[retried[0]]
+    assert (status, locked_by, retry_count) == ("pending", None, 1)
+    assert 3500 < delay <= 3600
+    assert rows[failed[0]][:4] == ("failed", None, 0, "broker down")
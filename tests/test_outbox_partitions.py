@@ -0,0 +1,89 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from yukinoise_users.infrastructure.database.repositories.outbox_event_repo import (
+    OutboxEventRepository,
+)
+
+# 2020-01-01 12:00 UTC, a day no partition is created for in advance
+STRAY_CREATED_AT = 1577880000
+STRAY_DAY_END = 1577923200
+STRAY_PARTITION = "outbox_events_p20200101"
+
+
+async def _insert_stray_event(
+    session: AsyncSession, created_at: int = STRAY_CREATED_AT
+) -> None:
+    await session.execute(
+        text(
+            "INSERT INTO users.outbox_events (id, event_type, payload, created_at)"
+            " VALUES (gen_random_uuid(), 'user.created', '{}', :created_at)"
+        ),
+        {"created_at": created_at},
+    )
+
+
+async def _count(session: AsyncSession, table: str) -> int:
+    result = await session.execute(
+        text(f"SELECT count(*) FROM users.{table} WHERE created_at = :created_at"),
+        {"created_at": STRAY_CREATED_AT},
+    )
+    return int(result.scalar_one())
+
+
+async def _partition_exists(
+    session: AsyncSession, partition: str = STRAY_PARTITION
+) -> bool:
+    result = await session.execute(
+        text("SELECT to_regclass(:name) IS NOT NULL"),
+        {"name": f"users.{partition}"},
+    )
+    return bool(result.scalar_one())
+
+
+async def _default_is_attached(session: AsyncSession) -> bool:
+    result = await session.execute(
+        text(
+            "SELECT relispartition FROM pg_class"
+            " WHERE oid = 'users.outbox_events_default'::regclass"
+        )
+    )
+    return bool(result.scalar_one())
+
+
+async def test_ensure_partitions_moves_rows_out_of_the_default_partition(
+    session: AsyncSession,
+) -> None:
+    repo = OutboxEventRepository(session)
+    await repo.ensure_partitions(0)
+    await _insert_stray_event(session)
+    # a second stray day, moved in the same call
+    await _insert_stray_event(session, STRAY_DAY_END)
+    assert await _count(session, "outbox_events_default") == 1
+
+    assert await repo.ensure_partitions(0) >= 2
+
+    assert await _partition_exists(session)
+    assert await _partition_exists(session, "outbox_events_p20200102")
+    assert await _count(session, STRAY_PARTITION) == 1
+    assert await _count(session, "outbox_events_default") == 0
+    assert await _default_is_attached(session)
+    # later events of that day go straight to its partition
+    await _insert_stray_event(session)
+    assert await _count(session, STRAY_PARTITION) == 2
+
+
+async def test_drop_partitions_keeps_partitions_with_pending_events(
+    session: AsyncSession,
+) -> None:
+    repo = OutboxEventRepository(session)
+    await repo.ensure_partitions(0)
+    await _insert_stray_event(session)
+    await repo.ensure_partitions(0)
+
+    await repo.drop_partitions_older_than(STRAY_DAY_END)
+    assert await _partition_exists(session)
+
+    await session.execute(text(f"UPDATE users.{STRAY_PARTITION} SET status = 'sent'"))
+    await repo.drop_partitions_older_than(STRAY_DAY_END)
+    assert not await _partition_exists(session)
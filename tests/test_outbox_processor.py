@@ -0,0 +1,197 @@
+"""OutboxProcessor against an in-memory outbox and producer."""
+
+import asyncio
+from uuid import UUID, uuid4
+
+import pytest
+
+from yukinoise_users.domain.events import DomainEvent, EventType
+from yukinoise_users.domain.models import OutboxEvent
+from yukinoise_users.infrastructure.events.outbox_processor import OutboxProcessor
+
+
+class FakeOutbox:
+    def __init__(self, events: list[OutboxEvent]) -> None:
+        self.pending = list(events)
+        self.claims: list[int] = []
+        self.sent: list[tuple[UUID, int]] = []
+        self.retries: dict[tuple[UUID, int], int] = {}
+        self.failed: dict[tuple[UUID, int], str] = {}
+
+    async def claim_pending_events(
+        self, worker_id: str, limit: int = 100, lease_seconds: int = 60
+    ) -> list[OutboxEvent]:
+        claimed, self.pending = self.pending[:limit], self.pending[limit:]
+        self.claims.append(len(claimed))
+        return claimed
+
+    async def mark_events_sent(
+        self, events: list[tuple[UUID, int]], worker_id: str
+    ) -> None:
+        self.sent.extend(events)
+
+    async def schedule_retries(
+        self, delays: dict[tuple[UUID, int], int], worker_id: str
+    ) -> None:
+        self.retries.update(delays)
+
+    async def mark_events_failed(
+        self, errors: dict[tuple[UUID, int], str], worker_id: str
+    ) -> None:
+        self.failed.update(errors)
+
+
+class FakeUnitOfWork:
+    def __init__(self, outbox: FakeOutbox, transactions: list[str]) -> None:
+        self.outbox = outbox
+        self._transactions = transactions
+
+    async def __aenter__(self) -> "FakeUnitOfWork":
+        self._transactions.append("begin")
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self._transactions.append("commit")
+
+
+class FakeProducer:
+    def __init__(self, transactions: list[str]) -> None:
+        self.failing: set[UUID] = set()
+        self.batches: list[list[DomainEvent]] = []
+        self._transactions = transactions
+
+    async def publish_batch(
+        self, events: list[DomainEvent]
+    ) -> list[BaseException | None]:
+        self._transactions.append("publish")
+        self.batches.append(events)
+        return [
+            ConnectionError("nacked") if e.aggregate_id in self.failing else None
+            for e in events
+        ]
+
+
+def _event(
+    event_type: EventType = EventType.USER_UPDATED,
+    user_id: UUID | None = None,
+    created_at: int = 1_768_867_200,
+    retry_count: int = 0,
+) -> OutboxEvent:
+    return OutboxEvent(
+        id=uuid4(),
+        event_type=event_type.value,
+        created_at=created_at,
+        payload={"user_id": str(user_id or uuid4())},
+        retry_count=retry_count,
+    )
+
+
+def _processor(
+    events: list[OutboxEvent], **kwargs: object
+) -> tuple[OutboxProcessor, FakeOutbox, FakeProducer, list[str]]:
+    transactions: list[str] = []
+    outbox, producer = FakeOutbox(events), FakeProducer(transactions)
+    processor = OutboxProcessor(
+        lambda: FakeUnitOfWork(outbox, transactions),  # type: ignore[arg-type,return-value]
+        producer,  # type: ignore[arg-type]
+        worker_id="worker-1",
+        **kwargs,  # type: ignore[arg-type]
+    )
+    return processor, outbox, producer, transactions
+
+
+async def test_drain_keeps_claiming_while_batches_come_back_full() -> None:
+    events = [_event() for _ in range(5)]
+    processor, outbox, _, _ = _processor(events, batch_size=2)
+    processor._running = True
+
+    assert await processor._drain() == 5
+    assert outbox.claims == [2, 2, 1]
+    assert outbox.sent == [(e.id, e.created_at) for e in events]
+
+
+async def test_a_notification_wakes_the_processor_before_the_poll_interval() -> None:
+    processor, _, _, _ = _processor([])
+
+    waiting = asyncio.create_task(processor._wait_for_wakeup(60))
+    await asyncio.sleep(0)
+    processor._on_notify(None, 1, "users_outbox_events", "")
+
+    await asyncio.wait_for(waiting, 1)
+
+
+@pytest.mark.parametrize(
+    "retry_count, low, high", [(0, 1, 1), (1, 1, 2), (3, 4, 8), (10, 150, 300)]
+)
+def test_backoff_is_exponential_with_equal_jitter_and_capped(
+    retry_count: int, low: int, high: int
+) -> None:
+    processor, _, _, _ = _processor([])
+
+    delays = {processor._backoff_seconds(retry_count) for _ in range(200)}
+
+    assert low <= min(delays) and max(delays) <= high
+
+
+async def test_failures_are_retried_until_max_retries_then_failed() -> None:
+    retried, exhausted = _event(retry_count=1), _event(retry_count=4)
+    processor, outbox, producer, _ = _processor([retried, exhausted], max_retries=5)
+    producer.failing = {
+        UUID(retried.payload["user_id"]),
+        UUID(exhausted.payload["user_id"]),
+    }
+
+    assert await processor.process_pending_events() == 0
+
+    assert list(outbox.retries) == [(retried.id, retried.created_at)]
+    assert 1 <= outbox.retries[(retried.id, retried.created_at)] <= 2
+    assert outbox.failed == {(exhausted.id, exhausted.created_at): "nacked"}
+    assert outbox.sent == []
+
+
+async def test_coalescing_publishes_the_newest_event_per_aggregate() -> None:
+    user_id, other_id = uuid4(), uuid4()
+    older = _event(EventType.PROFILE_UPDATED, user_id, created_at=1)
+    other = _event(EventType.PROFILE_UPDATED, other_id, created_at=2)
+    created = _event(EventType.USER_CREATED, user_id, created_at=3)
+    newest = _event(EventType.PROFILE_UPDATED, user_id, created_at=4)
+    events = [older, other, created, newest]
+    processor, outbox, producer, _ = _processor(
+        events, coalesce_event_types=frozenset({EventType.PROFILE_UPDATED})
+    )
+
+    assert await processor.process_pending_events() == 4
+
+    # other event types of the same aggregate are left alone
+    assert [e.event_id for e in producer.batches[0]] == [
+        str(other.id),
+        str(created.id),
+        str(newest.id),
+    ]
+    assert sorted(outbox.sent) == sorted((e.id, e.created_at) for e in events)
+
+
+async def test_superseded_events_share_the_failure_of_their_replacement() -> None:
+    user_id = uuid4()
+    older = _event(EventType.PROFILE_UPDATED, user_id, created_at=1)
+    newest = _event(EventType.PROFILE_UPDATED, user_id, created_at=2)
+    processor, outbox, producer, _ = _processor(
+        [older, newest], coalesce_event_types=frozenset({EventType.PROFILE_UPDATED})
+    )
+    producer.failing = {user_id}
+
+    assert await processor.process_pending_events() == 0
+
+    assert [len(batch) for batch in producer.batches] == [1]
+    assert set(outbox.retries) == {
+        (older.id, older.created_at),
+        (newest.id, newest.created_at),
+    }
+
+
+async def test_no_transaction_is_open_while_publishing() -> None:
+    processor, _, _, transactions = _processor([_event(), _event()])
+
+    await processor.process_pending_events()
+
+    assert transactions == ["begin", "commit", "publish", "begin", "commit"]
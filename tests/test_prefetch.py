@@ -0,0 +1,64 @@
+import pytest
+
+from yukinoise_users.infrastructure.events import prefetch
+from yukinoise_users.infrastructure.events.prefetch import PrefetchTuner
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(prefetch.time, "monotonic", clock)
+    return clock
+
+
+def _handle(tuner: PrefetchTuner, count: int, latency: float, concurrency: int) -> None:
+    for _ in range(count // concurrency):
+        for _ in range(concurrency):
+            tuner.handler_started()
+        for _ in range(concurrency):
+            tuner.handler_finished(latency)
+
+
+def test_prefetch_follows_throughput_times_latency(clock: Clock) -> None:
+    tuner = PrefetchTuner(headroom_seconds=0.05, interval_seconds=5.0)
+    # 20 events a second, 0.2s each
+    _handle(tuner, 100, 0.2, concurrency=4)
+
+    assert tuner.recommend(20) is None
+    clock.now += 5.0
+    assert tuner.recommend(20) == 5
+    # the window starts over
+    assert tuner.recommend(5) is None
+
+
+def test_prefetch_doubles_while_every_message_is_in_a_handler(clock: Clock) -> None:
+    tuner = PrefetchTuner(max_prefetch=12)
+    _handle(tuner, 100, 0.2, concurrency=8)
+    clock.now += 5.0
+
+    assert tuner.recommend(8) == 12
+
+
+def test_small_changes_are_ignored(clock: Clock) -> None:
+    tuner = PrefetchTuner(tolerance=0.2)
+    # asks for 6 on a prefetch of 7
+    _handle(tuner, 100, 0.25, concurrency=4)
+    clock.now += 5.0
+
+    assert tuner.recommend(7) is None
+
+
+def test_limits_are_validated_and_applied() -> None:
+    with pytest.raises(ValueError):
+        PrefetchTuner(min_prefetch=10, max_prefetch=5)
+    tuner = PrefetchTuner(min_prefetch=2, max_prefetch=50)
+
+    assert [tuner.clamp(n) for n in (0, 20, 500)] == [2, 20, 50]
@@ -0,0 +1,19 @@
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from yukinoise_users.infrastructure.database.repositories.processed_events_repo import (
+    ProcessedEventsRepository,
+)
+
+
+async def test_events_are_deduplicated_per_consumer(session: AsyncSession) -> None:
+    repo = ProcessedEventsRepository(session)
+    event_id = str(uuid4())
+
+    assert await repo.mark_processed("search-indexer", event_id, "user.created")
+    assert not await repo.mark_processed("search-indexer", event_id, "user.created")
+    assert await repo.mark_processed("notifier", event_id, "user.created")
+
+    assert await repo.exists("notifier", event_id)
+    assert not await repo.exists("mailer", event_id)
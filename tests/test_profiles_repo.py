@@ -0,0 +1,63 @@
+from uuid import uuid4
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from yukinoise_users.infrastructure.database.repositories.profiles_repo import (
+    ProfilesRepository,
+)
+from yukinoise_users.infrastructure.database.repositories.users_repo import (
+    UsersRepository,
+)
+
+
+async def test_genre_and_tag_lookups_match_any_overlap(session: AsyncSession) -> None:
+    users = UsersRepository(session)
+    profiles = ProfilesRepository(session)
+    # values no other profile carries, to keep the lookups to these profiles
+    genre, tag = f"genre-{uuid4()}", f"tag-{uuid4()}"
+    tagged = await users.create_from_keycloak(uuid4())
+    await profiles.create(
+        tagged.id,
+        display_name=f"tagged-{tagged.id}",
+        preferred_genres=["ambient", genre],
+        tags=[tag],
+    )
+    deleted = await users.create_from_keycloak(uuid4())
+    await profiles.create(
+        deleted.id,
+        display_name=f"deleted-{deleted.id}",
+        preferred_genres=[genre],
+        tags=[tag],
+    )
+    await profiles.soft_delete(deleted.id, 1_700_000_000)
+
+    found = await profiles.get_by_genres([genre, f"genre-{uuid4()}"])
+    assert [p.user_id for p in found] == [tagged.id]
+    found = await profiles.get_by_tags([tag])
+    assert [p.user_id for p in found] == [tagged.id]
+    assert await profiles.get_by_tags([f"tag-{uuid4()}"]) == []
+
+
+async def test_sharded_counters_are_exact_before_and_after_compaction(
+    session: AsyncSession,
+) -> None:
+    user = await UsersRepository(session).create_from_keycloak(uuid4())
+    profiles = ProfilesRepository(session, counter_shards=4)
+    await profiles.create(user.id, display_name=f"sharded-{user.id}")
+
+    for _ in range(5):
+        await profiles.increment_followers(user.id)
+    await profiles.apply_counter_deltas({user.id: {"following_count": 2}})
+    await profiles.decrement_followers(user.id)
+
+    profile = await profiles.get_by_user_id(user.id)
+    assert profile is not None and profile.followers_count == 0
+    exact = await profiles.get_exact_counters(user.id)
+    assert exact is not None
+    assert (exact["followers_count"], exact["following_count"]) == (4, 2)
+
+    assert await profiles.compact_counter_shards() >= 1
+    assert await profiles.get_exact_counters(user.id) == exact
+    profile = await profiles.get_by_user_id(user.id)
+    assert profile is not None
+    assert (profile.followers_count, profile.following_count) == (4, 2)
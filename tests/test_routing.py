@@ -0,0 +1,62 @@
+from typing import Any
+
+import pytest
+
+from yukinoise_users.infrastructure.database import routing
+from yukinoise_users.infrastructure.database.routing import ReplicaRouter
+
+
+class Clock:
+    def __init__(self) -> None:
+        self.now = 1_000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch: pytest.MonkeyPatch) -> Clock:
+    clock = Clock()
+    monkeypatch.setattr(routing.time, "monotonic", clock)
+    return clock
+
+
+def _router(*replicas: object, **kwargs: Any) -> ReplicaRouter:
+    return ReplicaRouter(list(replicas), **kwargs)  # type: ignore[arg-type]
+
+
+def test_reads_go_round_robin_over_the_replicas() -> None:
+    first, second = object(), object()
+    router = _router(first, second)
+
+    assert [router.replica_for() for _ in range(3)] == [first, second, first]
+    assert _router().replica_for("user-1") is None
+
+
+def test_writes_pin_their_key_to_the_primary_for_a_while(clock: Clock) -> None:
+    replica = object()
+    router = _router(replica, read_your_writes_seconds=5.0)
+
+    router.record_write("user-1")
+
+    assert router.replica_for("user-1") is None
+    assert router.replica_for("user-2") is replica
+    assert router.replica_for() is replica
+    clock.now += 5.0
+    assert router.replica_for("user-1") is replica
+
+
+def test_pins_are_bounded_and_can_be_disabled(clock: Clock) -> None:
+    replica = object()
+    router = _router(replica, max_pinned_keys=2)
+    for key in ["user-1", "user-2", "user-1", "user-3"]:
+        router.record_write(key)
+
+    # rewriting user-1 renewed its pin, so user-2 was the oldest
+    assert router.replica_for("user-2") is replica
+    assert router.replica_for("user-1") is None
+    assert router.replica_for("user-3") is None
+
+    unpinned = _router(replica, read_your_writes_seconds=0)
+    unpinned.record_write("user-1")
+    assert unpinned.replica_for("user-1") is replica
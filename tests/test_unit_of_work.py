@@ -0,0 +1,60 @@
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from yukinoise_users.infrastructure.database.routing import ReplicaRouter
+from yukinoise_users.infrastructure.database.unit_of_work import UnitOfWork
+
+
+def _unit_of_work(engine: AsyncEngine, **kwargs: object) -> UnitOfWork:
+    return UnitOfWork(
+        async_sessionmaker(engine, expire_on_commit=False),
+        router=ReplicaRouter([]),
+        **kwargs,  # type: ignore[arg-type]
+    )
+
+
+async def _events_of(engine: AsyncEngine, marker: str) -> list[tuple[str, int]]:
+    async with engine.connect() as connection:
+        result = await connection.execute(
+            text(
+                "SELECT event_type, (payload->>'n')::int FROM users.outbox_events "
+                "WHERE payload->>'marker' = :marker ORDER BY 2"
+            ),
+            {"marker": marker},
+        )
+        return [tuple(row) for row in result]  # type: ignore[misc]
+
+
+async def test_collected_events_are_inserted_together_at_commit(
+    engine: AsyncEngine, empty_outbox: None
+) -> None:
+    marker = str(uuid4())
+
+    async with _unit_of_work(engine) as uow:
+        uow.collect_event("user.created", {"marker": marker, "n": 1})
+        uow.collect_event("profile.created", {"marker": marker, "n": 2})
+        assert await _events_of(engine, marker) == []
+
+    assert await _events_of(engine, marker) == [
+        ("user.created", 1),
+        ("profile.created", 2),
+    ]
+
+
+async def test_collected_events_are_dropped_on_rollback(
+    engine: AsyncEngine, empty_outbox: None
+) -> None:
+    marker = str(uuid4())
+
+    with pytest.raises(ValueError):
+        async with _unit_of_work(engine) as uow:
+            uow.collect_event("user.created", {"marker": marker, "n": 1})
+            raise ValueError("handler failed")
+
+    assert await _events_of(engine, marker) == []
+    async with _unit_of_work(engine, read_only=True) as uow:
+        with pytest.raises(RuntimeError):
+            uow.collect_event("user.created", {"marker": marker, "n": 1})